@@ -1,9 +1,11 @@
-from app.models import get_embedding
-from app.parser import extract_text_from_pdf
-from sentence_transformers import util
+from config import RESULTS_STORE_ENABLED
+from app.models import get_embedding, embed_documents, cos_sim
+from app.parser import extract_texts_parallel
+from app.results_store import ResultsStore, update_scores, jd_key, model_key
+from app.instrumentation import timed, run_metrics
+from app.reporting import render_in_background, render_top_n, render_distribution
 from pathlib import Path
 import pandas as pd
-import matplotlib.pyplot as plt
 
 # --- Output directory setup ---
 OUTPUT_DIR = Path("output")
@@ -17,17 +19,27 @@ RESUME_DIR = Path("data/resumes")
 THRESHOLD = 0.30  # 30% similarity
 
 
-def batch_bias_audit():
-    jd_text = JD_FILE.read_text(encoding="utf-8")
+def _scores(jd_text):
+    """[(resume path, cosine score)] for every readable resume."""
+    if RESULTS_STORE_ENABLED:
+        # Only new/changed resumes are embedded; stored scores are percentages
+        store = ResultsStore()
+        update_scores(jd_text, RESUME_DIR, store, THRESHOLD)
+        return sorted((Path(path), score / 100) for path, score in store.scores(RESUME_DIR, jd_key(jd_text), model_key()))
+
     jd_embedding = get_embedding(jd_text)
+    extracted = dict(extract_texts_parallel(sorted(RESUME_DIR.glob("*.pdf"))))
+    resume_paths = sorted(path for path, text in extracted.items() if text is not None)
+    resume_embeddings = embed_documents([extracted[path] for path in resume_paths])
+    with timed("score"):
+        return list(zip(resume_paths, cos_sim(jd_embedding, resume_embeddings)[0].tolist()))
 
-    results = []
 
-    for resume_path in RESUME_DIR.glob("*.pdf"):
-        resume_text = extract_text_from_pdf(resume_path)
-        resume_embedding = get_embedding(resume_text)
+def batch_bias_audit():
+    jd_text = JD_FILE.read_text(encoding="utf-8")
+    results = []
 
-        score = util.pytorch_cos_sim(jd_embedding, resume_embedding).item()
+    for resume_path, score in _scores(jd_text):
         score_percent = round(score * 100, 2)
 
         results.append({
@@ -36,23 +48,26 @@ def batch_bias_audit():
             "match": "✅" if score_percent >= THRESHOLD * 100 else "❌"
         })
 
-    df = pd.DataFrame(results).sort_values("score", ascending=False)
-    df.to_csv(OUTPUT_DIR / "real_resume_screening_results.csv", index=False)
+    # --- Charts: top-N bars + score distribution, rendered while the CSV is written ---
+    scores_percent = [row["score"] for row in results]
+    charts = [
+        render_in_background(render_top_n, OUTPUT_DIR / "real_screening_visualization.png", results,
+                             "Real Resume Screening – Score vs JD"),
+        render_in_background(render_distribution, OUTPUT_DIR / "real_screening_distribution.png", scores_percent,
+                             THRESHOLD, "Real Resume Screening"),
+    ]
 
-    # --- Bar plot ---
-    plt.figure(figsize=(12, len(df) * 0.4))
-    plt.barh(df["file"], df["score"], color="skyblue")
-    plt.xlabel("Match Score (%)")
-    plt.title("Real Resume Screening – Score vs JD")
-    plt.gca().invert_yaxis()
-    plt.tight_layout()
-    plt.savefig(OUTPUT_DIR / "real_screening_visualization.png")
-    plt.close()
+    with timed("results_csv"):
+        df = pd.DataFrame(results).sort_values("score", ascending=False)
+        df.to_csv(OUTPUT_DIR / "real_resume_screening_results.csv", index=False)
 
     print("\nBatch Bias Screening Completed")
     print("CSV saved to: output/real_resume_screening_results.csv")
-    print("Chart saved to: output/real_screening_visualization.png")
+    with timed("charts_wait"):
+        for chart in charts:
+            print(f"Chart saved to: {chart.result().as_posix()}")
 
 
 if __name__ == "__main__":
-    batch_bias_audit()
+    with run_metrics("batch_bias_audit"):
+        batch_bias_audit()
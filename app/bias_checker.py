@@ -1,5 +1,7 @@
 import pandas as pd
 import matplotlib.pyplot as plt
+import numpy as np
+import argparse
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -9,9 +11,9 @@ from pathlib import Path
 OUTPUT_DIR = Path("output")
 OUTPUT_DIR.mkdir(exist_ok=True)  # Makes sure the folder exists
 
-from app.models import get_embedding
-from app.parser import extract_text_from_pdf
-from sentence_transformers import util
+from config import EMBEDDING_BATCH_SIZE, BIAS_AUDIT_CHUNK_SIZE
+from app.models import get_embedding, embed_documents, cos_sim
+from app.parser import extract_text_from_pdf, extract_texts_parallel
 from pathlib import Path
 
 # Simulated names from diverse backgrounds
@@ -21,23 +23,88 @@ SIMULATED_NAMES = [
 ]
 
 def inject_name(text, name):
-    lines = text.strip().splitlines()
+    lines = text.strip().splitlines() or [""]
     lines[0] = name  # Replace first line with new name
     return "\n".join(lines)
 
-def simulate_bias_check(jd_path, resume_path):
+def score_name_variants(jd_text, resume_texts, names=SIMULATED_NAMES,
+                        chunk_size=BIAS_AUDIT_CHUNK_SIZE, batch_size=EMBEDDING_BATCH_SIZE):
+    """Score every resume as-is and with each name injected.
+
+    Returns (baseline, scores): baseline is [n_resumes] and scores is [n_resumes, n_names],
+    both as similarity percentages. Variants of chunk_size resumes at a time are encoded
+    together, so the encoder sees large batches while memory stays bounded. Only the
+    original texts go through the embedding cache; the name variants are one-offs.
+    """
+    jd_embedding = get_embedding(jd_text)  # the embedding cache makes repeat audits of a JD free
+    resume_texts = list(resume_texts)
+    baseline = np.empty(len(resume_texts), dtype=np.float64)
+    scores = np.empty((len(resume_texts), len(names)), dtype=np.float64)
+
+    for start in range(0, len(resume_texts), chunk_size):
+        chunk = resume_texts[start:start + chunk_size]
+        variants = [inject_name(text, name) for text in chunk for name in names]
+        originals = embed_documents(chunk, batch_size=batch_size)
+        embeddings = embed_documents(variants, batch_size=batch_size, use_cache=False)
+        baseline[start:start + len(chunk)] = cos_sim(jd_embedding, originals)[0].cpu().numpy() * 100
+        chunk_scores = cos_sim(jd_embedding, embeddings)[0].cpu().numpy()
+        scores[start:start + len(chunk)] = chunk_scores.reshape(len(chunk), len(names)) * 100
+
+    return baseline, scores
+
+def summarize_bias(baseline, scores, names=SIMULATED_NAMES):
+    """Per-name score deltas vs. the unmodified resume, with a paired t-test for each name.
+
+    Returns (summary_df, spread): spread is the per-resume max-min score across names.
+    """
+    from scipy import stats
+
+    deltas = scores - baseline[:, None]
+    n = len(baseline)
+    mean_delta = deltas.mean(axis=0)
+    std_delta = deltas.std(axis=0, ddof=1) if n > 1 else np.full(len(names), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_stat = mean_delta / (std_delta / np.sqrt(n))
+    p_value = 2 * stats.t.sf(np.abs(t_stat), df=max(n - 1, 1)) if n > 1 else np.full(len(names), np.nan)
+
+    summary = pd.DataFrame({
+        "name": names,
+        "mean_score": scores.mean(axis=0).round(2),
+        "mean_delta": mean_delta.round(4),
+        "std_delta": std_delta.round(4),
+        "t_stat": t_stat.round(3),
+        "p_value": p_value,
+        "significant": p_value < 0.05,
+    }).sort_values("mean_delta", ascending=False, ignore_index=True)
+    spread = scores.max(axis=1) - scores.min(axis=1)
+    return summary, spread
+
+def audit_pool(jd_path, resume_dir, names=SIMULATED_NAMES):
+    """Bias audit of every resume in resume_dir; writes summary and per-resume CSVs."""
     jd_text = Path(jd_path).read_text(encoding="utf-8")
-    jd_embedding = get_embedding(jd_text)
+    extracted = [(path, text) for path, text in extract_texts_parallel(sorted(Path(resume_dir).glob("*.pdf")))
+                 if text is not None]
+    if not extracted:
+        raise FileNotFoundError(f"No readable resumes found in {resume_dir}")
 
-    base_resume_text = extract_text_from_pdf(resume_path)
-    results = []
+    baseline, scores = score_name_variants(jd_text, [text for _, text in extracted], names)
+    summary, spread = summarize_bias(baseline, scores, names)
 
-    for name in SIMULATED_NAMES:
-        modified_resume = inject_name(base_resume_text, name)
-        resume_embedding = get_embedding(modified_resume)
-        score = util.pytorch_cos_sim(jd_embedding, resume_embedding).item()
+    per_resume = pd.DataFrame(scores.round(2), columns=names)
+    per_resume.insert(0, "file", [path.name for path, _ in extracted])
+    per_resume.insert(1, "baseline", baseline.round(2))
+    per_resume["spread"] = spread.round(2)
 
-        results.append({"name": name, "score": round(score * 100, 2)})
+    summary.to_csv(OUTPUT_DIR / "bias_audit_summary.csv", index=False)
+    per_resume.to_csv(OUTPUT_DIR / "bias_audit_per_resume.csv", index=False)
+    return summary, per_resume
+
+def simulate_bias_check(jd_path, resume_path):
+    jd_text = Path(jd_path).read_text(encoding="utf-8")
+    base_resume_text = extract_text_from_pdf(resume_path)
+
+    _, scores = score_name_variants(jd_text, [base_resume_text])
+    results = [{"name": name, "score": round(float(score), 2)} for name, score in zip(SIMULATED_NAMES, scores[0])]
 
     return sorted(results, key=lambda x: x["score"], reverse=True)
 
@@ -45,9 +112,21 @@ def simulate_bias_check(jd_path, resume_path):
 # Everything same till...
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulated-name bias check.")
+    parser.add_argument("--pool", metavar="RESUME_DIR", help="audit every resume in this folder instead of one sample")
+    args = parser.parse_args()
+
     jd_file = "data/job_descriptions/sample_jd.txt"
     resume_file = Path("data/resumes/sample_resume.pdf")
 
+    if args.pool:
+        print(f"Running bias audit over {args.pool}...\n")
+        summary, per_resume = audit_pool(jd_file, args.pool)
+        print(summary.to_string(index=False))
+        print(f"\nMean per-resume spread across names: {per_resume['spread'].mean():.2f} points")
+        print("\nResults saved to 'output/bias_audit_summary.csv' and 'output/bias_audit_per_resume.csv'")
+        sys.exit(0)
+
     print("Running Bias Checker...\n")
     results = simulate_bias_check(jd_file, resume_file)
 
@@ -0,0 +1,365 @@
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from config import BM25_INDEX_PATH, BM25_K1, BM25_B, BM25_PREFILTER_K, HYBRID_FUSION, HYBRID_ALPHA, SHORTLIST_TOP_N
+from app.skills import TOKEN_RE
+from app.instrumentation import timed, count
+from app.resume_index import _top_k
+
+# Lexical first stage for large pools: an on-disk inverted index with BM25 scoring.
+# Each term's posting list is one SQLite row holding varint-encoded (doc-id delta,
+# term frequency) pairs. Doc ids only grow, so adding resumes appends to the end of
+# the lists; deleted resumes are dropped from the docs table and their stale postings
+# are skipped at query time until compact() rewrites the lists. A query only decodes
+# the posting lists of its own terms, so its cost follows the candidate set rather
+# than the corpus size.
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the this to we were will with "
+    "you your experience looking must strong working work years using".split()
+)
+COMPACT_STALE_RATIO = 0.25  # compact once deleted docs are this share of all docs
+RRF_K = 60  # reciprocal rank fusion constant
+
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def encode_varints(values):
+    """LEB128 varints (7 bits per byte, high bit = more bytes follow), vectorized."""
+    values = np.asarray(values, dtype=np.uint64)
+    nbytes = np.ones(values.size, dtype=np.int64)
+    for k in range(1, 10):
+        nbytes += values >= np.uint64(1 << (7 * k))
+    offsets = np.cumsum(nbytes) - nbytes
+    out = np.empty(int(nbytes.sum()), dtype=np.uint8)
+    for k in range(int(nbytes.max(initial=0))):
+        rows = nbytes > k
+        byte = (values[rows] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        byte |= np.where(nbytes[rows] > k + 1, 0x80, 0).astype(np.uint64)
+        out[offsets[rows] + k] = byte
+    return out.tobytes()
+
+
+def decode_varints(data):
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if not raw.size:
+        return np.empty(0, dtype=np.uint64)
+    last = (raw & 0x80) == 0
+    starts = np.flatnonzero(np.concatenate(([True], last[:-1])))
+    group = np.concatenate(([0], np.cumsum(last[:-1])))
+    shifts = ((np.arange(raw.size) - starts[group]) * 7).astype(np.uint64)
+    return np.add.reduceat((raw & 0x7F).astype(np.uint64) << shifts, starts)
+
+
+class BM25Index:
+    """Incremental BM25 inverted index over resume texts, stored in one SQLite file.
+
+    Documents are identified by name (build_bm25_index uses the PDF path). Only the
+    doc lengths (4 bytes per resume) are held in memory; postings stay on disk.
+    """
+
+    def __init__(self, db_path=BM25_INDEX_PATH, k1=BM25_K1, b=BM25_B):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.k1, self.b = k1, b
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            "doc_id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE, length INTEGER, size INTEGER, mtime_ns INTEGER)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS postings (term TEXT PRIMARY KEY, last_doc INTEGER, data BLOB)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+        self._db.commit()
+
+        # Doc length by doc id (0 = deleted), so BM25 needs no per-candidate SQL lookups. Sized
+        # by the highest id ever given out: deleted docs keep postings until compaction
+        max_id = max(
+            self._db.execute("SELECT COALESCE(MAX(doc_id), 0) FROM docs").fetchone()[0],
+            self._db.execute("SELECT COALESCE(MAX(last_doc), 0) FROM postings").fetchone()[0],
+        )
+        self._lengths = np.zeros(max_id + 1, dtype=np.float32)
+        for doc_id, length in self._db.execute("SELECT doc_id, length FROM docs"):
+            self._lengths[doc_id] = length
+        self._stale = dict(self._db.execute("SELECT key, value FROM meta")).get("stale_docs", 0)
+
+    def __len__(self):
+        return int(np.count_nonzero(self._lengths))
+
+    def __contains__(self, name):
+        return self._doc_id(name) is not None
+
+    def _doc_id(self, name):
+        row = self._db.execute("SELECT doc_id FROM docs WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def fingerprints(self):
+        """{name: (size, mtime_ns)} of every indexed document."""
+        return {name: (size, mtime_ns) for name, size, mtime_ns in self._db.execute("SELECT name, size, mtime_ns FROM docs")}
+
+    # --- incremental updates ---
+
+    def add(self, documents):
+        """Index (name, text) or (name, text, size, mtime_ns) documents; a known name is replaced."""
+        # Last one wins for a name given twice
+        documents = list({doc[0]: tuple(doc) + (None,) * (4 - len(doc)) for doc in documents}.values())
+        if not documents:
+            return
+        with self._lock:
+            self._delete([doc[0] for doc in documents])
+            postings = {}  # term -> [doc_id, tf, doc_id, tf, ...] for this batch
+            lengths = []
+            for name, text, size, mtime_ns in documents:
+                tokens = tokenize(text)
+                doc_id = self._db.execute(
+                    "INSERT INTO docs (name, length, size, mtime_ns) VALUES (?, ?, ?, ?)",
+                    (name, max(len(tokens), 1), size, mtime_ns),
+                ).lastrowid
+                lengths.append((doc_id, max(len(tokens), 1)))
+                for term, tf in Counter(tokens).items():
+                    postings.setdefault(term, []).extend((doc_id, tf))
+            self._append_postings(postings)
+            self._db.commit()
+
+            self._lengths = np.concatenate([self._lengths, np.zeros(lengths[-1][0] + 1 - len(self._lengths), dtype=np.float32)])
+            for doc_id, length in lengths:
+                self._lengths[doc_id] = length
+        count("bm25_docs_indexed", len(documents))
+        self._maybe_compact()  # replaced documents leave stale postings too
+
+    def _append_postings(self, postings):
+        terms = list(postings)
+        existing = {}
+        for start in range(0, len(terms), 500):  # stay under SQLite's bound-parameter limit
+            chunk = terms[start:start + 500]
+            existing.update((term, (last_doc, data)) for term, last_doc, data in self._db.execute(
+                f"SELECT term, last_doc, data FROM postings WHERE term IN ({','.join('?' * len(chunk))})", chunk
+            ))
+        rows = []
+        for term, pairs in postings.items():
+            last_doc, data = existing.get(term, (0, b""))
+            pairs = np.array(pairs, dtype=np.int64)
+            doc_ids = pairs[0::2].copy()
+            pairs[0::2] = np.diff(doc_ids, prepend=last_doc)  # doc ids -> gaps
+            rows.append((term, int(doc_ids[-1]), bytes(data) + encode_varints(pairs)))
+        self._db.executemany("INSERT OR REPLACE INTO postings (term, last_doc, data) VALUES (?, ?, ?)", rows)
+
+    def _delete(self, names):
+        deleted = 0
+        for name in names:
+            doc_id = self._doc_id(name)
+            if doc_id is not None:
+                self._db.execute("DELETE FROM docs WHERE doc_id = ?", (doc_id,))
+                self._lengths[doc_id] = 0
+                deleted += 1
+        if deleted:
+            self._stale += deleted
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('stale_docs', ?)", (self._stale,))
+        return deleted
+
+    def remove(self, names):
+        """Drop documents; their postings are skipped until the next compaction."""
+        with self._lock:
+            self._delete(names)
+            self._db.commit()
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        if self._stale > COMPACT_STALE_RATIO * max(len(self) + self._stale, 1):
+            self.compact()
+
+    def compact(self):
+        """Rewrite every posting list without deleted documents."""
+        with self._lock:
+            rows = []
+            for term, data in self._db.execute("SELECT term, data FROM postings").fetchall():
+                doc_ids, tfs = self._decode(data)
+                live = self._lengths[doc_ids] > 0
+                if not live.any():
+                    self._db.execute("DELETE FROM postings WHERE term = ?", (term,))
+                    continue
+                doc_ids, tfs = doc_ids[live], tfs[live]
+                pairs = np.empty(2 * len(doc_ids), dtype=np.int64)
+                pairs[0::2] = np.diff(doc_ids, prepend=0)
+                pairs[1::2] = tfs
+                rows.append((term, int(doc_ids[-1]), encode_varints(pairs)))
+            self._db.executemany("INSERT OR REPLACE INTO postings (term, last_doc, data) VALUES (?, ?, ?)", rows)
+            self._stale = 0
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('stale_docs', 0)")
+            self._db.commit()
+            self._db.execute("VACUUM")
+
+    # --- search ---
+
+    @staticmethod
+    def _decode(data):
+        pairs = decode_varints(data).astype(np.int64)
+        return np.cumsum(pairs[0::2]), pairs[1::2]
+
+    def scores(self, query_text):
+        """(doc_ids, BM25 scores) of every live document sharing a term with the query."""
+        terms = list(dict.fromkeys(tokenize(query_text)))
+        live_docs = len(self)
+        if not terms or not live_docs:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        with self._lock:
+            lists = self._db.execute(
+                f"SELECT data FROM postings WHERE term IN ({','.join('?' * len(terms))})", terms
+            ).fetchall()
+        avg_length = self._lengths.sum() / live_docs
+
+        all_ids, all_scores = [], []
+        for (data,) in lists:
+            doc_ids, tfs = self._decode(data)
+            lengths = self._lengths[doc_ids]
+            live = lengths > 0
+            doc_ids, tfs, lengths = doc_ids[live], tfs[live].astype(np.float32), lengths[live]
+            if not doc_ids.size:
+                continue
+            idf = np.log(1 + (live_docs - doc_ids.size + 0.5) / (doc_ids.size + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * lengths / avg_length)
+            all_ids.append(doc_ids)
+            all_scores.append(idf * tfs * (self.k1 + 1) / (tfs + norm))
+        if not all_ids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        # Sum per document over the candidates only (never a corpus-sized array)
+        doc_ids, inverse = np.unique(np.concatenate(all_ids), return_inverse=True)
+        return doc_ids, np.bincount(inverse, weights=np.concatenate(all_scores)).astype(np.float32)
+
+    def search(self, query_text, k=BM25_PREFILTER_K):
+        """Return [(name, bm25_score), ...] for the k best documents."""
+        with timed("bm25_search"):
+            doc_ids, scores = self.scores(query_text)
+            if not doc_ids.size or k <= 0:
+                return []
+            best = _top_k(scores, min(k, doc_ids.size))
+            names = {}
+            best_ids = doc_ids[best].tolist()
+            for start in range(0, len(best_ids), 500):
+                chunk = best_ids[start:start + 500]
+                names.update(self._db.execute(
+                    f"SELECT doc_id, name FROM docs WHERE doc_id IN ({','.join('?' * len(chunk))})", chunk
+                ))
+        count("bm25_candidates", int(doc_ids.size))
+        return [(names[doc_id], float(score)) for doc_id, score in zip(best_ids, scores[best])]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def build_bm25_index(resume_dir, index=None):
+    """Bring the index in line with resume_dir: new/changed PDFs are (re)indexed, vanished ones removed."""
+    from app.parser import extract_texts_parallel
+
+    index = BM25Index() if index is None else index  # an empty index is falsy (__len__)
+    known = index.fingerprints()
+    paths = {str(path.resolve()): path for path in Path(resume_dir).glob("*.pdf")}
+    stats = {name: (path.stat().st_size, path.stat().st_mtime_ns) for name, path in paths.items()}
+    changed = [paths[name] for name in sorted(paths) if known.get(name) != stats[name]]
+    gone = [name for name in known if name not in paths and Path(name).parent == Path(resume_dir).resolve()]
+
+    if gone:
+        index.remove(gone)
+    documents = []
+    for path, text in extract_texts_parallel(changed):
+        if text is not None:
+            name = str(path.resolve())
+            documents.append((name, text, *stats[name]))
+    index.add(documents)
+    return index
+
+
+def fuse(lexical, dense, method=HYBRID_FUSION, alpha=HYBRID_ALPHA):
+    """Combine {name: bm25} and {name: cosine} into {name: fused score}.
+
+    "rrf" sums 1 / (RRF_K + rank) over both rankings; "linear" is
+    alpha * cosine + (1 - alpha) * BM25 scaled to [0, 1] by the best candidate.
+    """
+    if method == "rrf":
+        fused = dict.fromkeys(dense, 0.0)
+        for ranking in (lexical, dense):
+            for rank, name in enumerate(sorted(ranking, key=ranking.get, reverse=True), start=1):
+                if name in fused:
+                    fused[name] += 1 / (RRF_K + rank)
+        return fused
+    if method == "linear":
+        top = max(lexical.values(), default=0) or 1
+        return {name: alpha * score + (1 - alpha) * lexical.get(name, 0) / top for name, score in dense.items()}
+    raise ValueError(f"Unsupported fusion method: {method}")
+
+
+def hybrid_search(jd_text, index, k=SHORTLIST_TOP_N, prefilter_k=BM25_PREFILTER_K, fusion=HYBRID_FUSION):
+    """BM25 narrows the pool to prefilter_k resumes; only those are embedded and cosine-scored.
+
+    Returns rows {"file", "score" (cosine %), "bm25", "fused"} sorted by the fused score
+    (fusion=None ranks the candidates by cosine alone).
+    """
+    from app.models import get_embedding, embed_documents, cos_sim
+    from app.parser import extract_texts_parallel
+
+    lexical = dict(index.search(jd_text, prefilter_k))
+    extracted = [(name, text) for name, text in extract_texts_parallel([Path(name) for name in lexical]) if text]
+    if not extracted:
+        return []
+    names = [str(name) for name, _ in extracted]
+    with timed("embed_batch"):
+        embeddings = embed_documents([text for _, text in extracted])
+    with timed("score_batch"):
+        dense = dict(zip(names, cos_sim(get_embedding(jd_text), embeddings)[0].tolist()))
+    ranking = fuse(lexical, dense, fusion) if fusion else dense
+
+    best = sorted(ranking, key=ranking.get, reverse=True)[:k]
+    return [
+        {"file": Path(name).name, "score": round(dense[name] * 100, 2),
+         "bm25": round(lexical[name], 3), "fused": round(ranking[name], 5)}
+        for name in best
+    ]
+
+
+def run_hybrid_screening(jd_text, resume_dir, csv_path, threshold=0.30, top_n=SHORTLIST_TOP_N,
+                         prefilter_k=BM25_PREFILTER_K, on_row=None, index=None):
+    """Screening with the BM25 prefilter: only the prefilter_k best lexical matches are embedded.
+
+    csv_path lists those candidates, best fused score first, with their cosine score (%),
+    BM25 score and shortlist mark; resumes outside the prefilter are not scored. Returns
+    the top_n rows.
+    """
+    import csv
+    from app.pipeline import CSV_FIELDS
+
+    index = build_bm25_index(resume_dir, index)
+    rows = hybrid_search(jd_text, index, k=prefilter_k, prefilter_k=prefilter_k)
+    with timed("results_csv"), open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS + ["bm25", "fused"])
+        writer.writeheader()
+        for row in rows:
+            row["shortlisted"] = "✅" if row["score"] >= threshold * 100 else "❌"
+            writer.writerow(row)
+            if on_row:
+                on_row(row)
+    print(f"🔎 BM25 prefilter: {len(rows)} of {len(index)} resumes embedded")
+    return rows[:top_n]
+
+
+if __name__ == "__main__":
+    from time import time
+
+    jd_text = Path("data/job_descriptions/sample_jd.txt").read_text(encoding="utf-8")
+    start = time()
+    index = build_bm25_index("data/resumes")
+    print(f"Indexed {len(index)} resumes in {round(time() - start, 2)} s")
+
+    start = time()
+    candidates = index.search(jd_text, k=BM25_PREFILTER_K)
+    print(f"BM25: {len(candidates)} candidates in {round((time() - start) * 1000, 2)} ms")
+
+    for row in hybrid_search(jd_text, index, k=10):
+        print(f"{row['file']:25} — Score: {row['score']}% — BM25: {row['bm25']} — Fused: {row['fused']}")
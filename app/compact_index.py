@@ -0,0 +1,282 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from config import COMPACT_INDEX_DIR, COMPACT_INDEX_DTYPE, COMPACT_RERANK_FACTOR, RESUME_INDEX_PATH
+from app.resume_index import ResumeIndex, _to_numpy, normalize, _top_k
+
+# Disk-backed resume index for pools too large to hold as fp32 in RAM. A directory holds:
+#   meta.json    dim, compact dtype, row count and file capacity
+#   ids.json     resume ids in row order, as of the last flush()
+#   ids.log      append-only [row, id] assignments since then (replayed on open)
+#   codes.dat    normalized vectors as float16, or int8 codes (memmap, scanned per search)
+#   scales.dat   one float32 scale per row (int8 only): vector ~= codes * scale
+#   vectors.dat  the normalized fp32 vectors (memmap, only candidate rows are read)
+# A search scans the compact codes chunk by chunk, keeps k * rerank_factor candidates
+# and re-scores those from the fp32 rows, so the returned top-k and scores match the
+# exact ResumeIndex while the hot data is 2x (float16) or ~4x (int8) smaller.
+
+SCAN_CHUNK_SIZE = 65_536  # rows dequantized per matmul during the coarse scan
+DTYPES = ("float16", "int8")
+LOG_COMPACT_MIN = 1024  # id log entries allowed before flush() folds them into ids.json
+
+
+def quantize(vectors, dtype):
+    """(codes, scales) for [n, dim] float32 vectors; scales is None for float16."""
+    if dtype == "float16":
+        return vectors.astype(np.float16), None
+    # Symmetric per-vector int8: the largest component maps to +/-127
+    scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class CompactResumeIndex:
+    """Resume vectors as memory-mapped float16/int8 codes with an exact fp32 re-rank.
+
+    Writes go straight to the files in `directory`; opening the same directory again
+    picks the index up where it was left. dtype defaults to the stored one, else
+    COMPACT_INDEX_DTYPE; asking for a different dtype than the stored one raises.
+    """
+
+    def __init__(self, directory=COMPACT_INDEX_DIR, dtype=None, rerank_factor=COMPACT_RERANK_FACTOR):
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.rerank_factor = rerank_factor
+        self.dim = None
+        self.ids = []
+        self._positions = {}
+        self._capacity = 0
+        self._log_size = 0
+        self._codes = self._scales = self._vectors = None
+
+        meta_file = self.dir / "meta.json"
+        if meta_file.exists():
+            meta = json.loads(meta_file.read_text(encoding="utf-8"))
+            if dtype is not None and dtype != meta["dtype"]:
+                raise ValueError(f"{self.dir} holds a {meta['dtype']} index, not {dtype}; "
+                                 f"rebuild it with CompactResumeIndex.from_index to change the dtype")
+            self.dtype = meta["dtype"]
+            self.dim = meta["dim"]
+            self._capacity = meta["capacity"]
+            self.ids = self._load_ids()[:meta["count"]]
+            self._positions = {resume_id: row for row, resume_id in enumerate(self.ids)}
+            if self.dim is not None:
+                self._open("r+")
+        else:
+            dtype = dtype or COMPACT_INDEX_DTYPE
+            if dtype not in DTYPES:
+                raise ValueError(f"Unsupported compact dtype {dtype!r} (choose from {DTYPES})")
+            self.dtype = dtype
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, resume_id):
+        return resume_id in self._positions
+
+    @property
+    def nbytes_per_vector(self):
+        """Bytes scanned per resume in the coarse pass (fp32 would be 4 * dim)."""
+        if self.dim is None:
+            return 0
+        return self.dim * np.dtype(self.dtype).itemsize + (4 if self.dtype == "int8" else 0)
+
+    # --- storage helpers ---
+
+    def _files(self):
+        files = [("codes.dat", self.dtype, (self._capacity, self.dim)),
+                 ("vectors.dat", np.float32, (self._capacity, self.dim))]
+        if self.dtype == "int8":
+            files.append(("scales.dat", np.float32, (self._capacity,)))
+        return files
+
+    def _open(self, mode):
+        arrays = {name: np.memmap(self.dir / name, dtype=dtype, mode=mode, shape=shape)
+                  for name, dtype, shape in self._files()}
+        self._codes = arrays["codes.dat"]
+        self._vectors = arrays["vectors.dat"]
+        self._scales = arrays.get("scales.dat")
+
+    def _grow(self, needed):
+        # Extend the files in place (geometric growth keeps appends amortized O(1))
+        self._flush_arrays()
+        self._codes = self._scales = self._vectors = None
+        self._capacity = max(needed, 2 * self._capacity, 1024)
+        for name, dtype, shape in self._files():
+            path = self.dir / name
+            path.touch()
+            os.truncate(path, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        self._open("r+")
+
+    def _flush_arrays(self):
+        for array in (self._codes, self._scales, self._vectors):
+            if array is not None:
+                array.flush()
+
+    def _load_ids(self):
+        ids_file, log_file = self.dir / "ids.json", self.dir / "ids.log"
+        ids = json.loads(ids_file.read_text(encoding="utf-8")) if ids_file.exists() else []
+        if log_file.exists():
+            # Only newline-terminated entries: a torn last write is past the stored count anyway
+            entries = log_file.read_text(encoding="utf-8").split("\n")[:-1]
+            for row, resume_id in map(json.loads, entries):
+                if row < len(ids):
+                    ids[row] = resume_id
+                else:
+                    ids.append(resume_id)
+            self._log_size = len(entries)
+        return ids
+
+    def _write_meta(self):
+        meta = {"dim": self.dim, "dtype": self.dtype, "count": len(self.ids), "capacity": self._capacity}
+        tmp = self.dir / "meta.json.tmp"
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, self.dir / "meta.json")
+
+    def _commit(self, rows):
+        # Persist one update: append the changed row ids to the log (O(changes), not O(n)),
+        # folding the log into ids.json once it outgrows the index
+        self._flush_arrays()
+        if self._log_size + len(rows) > max(len(self.ids), LOG_COMPACT_MIN):
+            self.flush()
+            return
+        if rows:
+            with open(self.dir / "ids.log", "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps([row, self.ids[row]]) + "\n" for row in rows))
+            self._log_size += len(rows)
+        self._write_meta()
+
+    def _write_rows(self, rows, vectors):
+        codes, scales = quantize(vectors, self.dtype)
+        self._codes[rows] = codes
+        self._vectors[rows] = vectors
+        if scales is not None:
+            self._scales[rows] = scales
+
+    def flush(self):
+        """Persist vectors and metadata, and compact the id log into ids.json."""
+        self._flush_arrays()
+        tmp = self.dir / "ids.json.tmp"
+        tmp.write_text(json.dumps(self.ids), encoding="utf-8")
+        os.replace(tmp, self.dir / "ids.json")
+        (self.dir / "ids.log").unlink(missing_ok=True)
+        self._log_size = 0
+        self._write_meta()
+
+    # --- incremental updates ---
+
+    def add(self, ids, embeddings):
+        """Add (or overwrite) resumes; embeddings is [len(ids), dim]."""
+        ids = list(ids)
+        if not ids:
+            return
+        vectors = normalize(_to_numpy(embeddings).reshape(len(ids), -1))
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dim embeddings, got {vectors.shape[1]}")
+
+        rows, new_rows = [], []
+        for resume_id in ids:
+            if resume_id not in self._positions:
+                self._positions[resume_id] = len(self.ids)
+                new_rows.append(len(self.ids))
+                self.ids.append(resume_id)
+            rows.append(self._positions[resume_id])
+        if len(self.ids) > self._capacity:
+            self._grow(len(self.ids))
+
+        # Duplicate ids in one call: the last vector wins, as with ResumeIndex
+        self._write_rows(np.array(rows), vectors)
+        self._commit(new_rows)
+
+    def remove(self, ids):
+        """Drop resumes; the last rows move into the freed slots. Unknown ids are ignored."""
+        moved, removed = [], False
+        for resume_id in ids:
+            row = self._positions.pop(resume_id, None)
+            if row is None:
+                continue
+            removed = True
+            last_id = self.ids.pop()
+            if last_id != resume_id:
+                last = len(self.ids)
+                self._codes[row] = self._codes[last]
+                self._vectors[row] = self._vectors[last]
+                if self._scales is not None:
+                    self._scales[row] = self._scales[last]
+                self.ids[row] = last_id
+                self._positions[last_id] = row
+                moved.append(row)
+        if removed:
+            self._commit([row for row in moved if row < len(self.ids)])
+
+    # --- search ---
+
+    def coarse_scores(self, query):
+        """Approximate cosine scores of every resume, from the compact codes only."""
+        size = len(self.ids)
+        scores = np.empty(size, dtype=np.float32)
+        for start in range(0, size, SCAN_CHUNK_SIZE):
+            stop = min(start + SCAN_CHUNK_SIZE, size)
+            chunk_scores = self._codes[start:stop].astype(np.float32) @ query
+            if self._scales is not None:
+                chunk_scores *= self._scales[start:stop]
+            scores[start:stop] = chunk_scores
+        return scores
+
+    def search(self, query_embedding, k=10, rerank=None):
+        """Return [(resume_id, cosine_score), ...] for the k best resumes.
+
+        rerank is how many coarse candidates get exact fp32 scores (default k * rerank_factor).
+        """
+        if not self.ids or k <= 0:
+            return []
+        query = normalize(_to_numpy(query_embedding).reshape(-1))
+        k = min(k, len(self.ids))
+        rerank = min(max(rerank or k * self.rerank_factor, k), len(self.ids))
+
+        candidates = np.sort(_top_k(self.coarse_scores(query), rerank))  # sorted rows read the memmap in order
+        exact = self._vectors[candidates] @ query
+        best = _top_k(exact, k)
+        return [(self.ids[candidates[i]], float(exact[i])) for i in best]
+
+    def query(self, jd_text, k=10, rerank=None):
+        """Embed a job description and return its k best matching resumes."""
+        from app.models import get_embedding
+
+        return self.search(get_embedding(jd_text), k=k, rerank=rerank)
+
+    @classmethod
+    def from_index(cls, index, directory=COMPACT_INDEX_DIR, dtype=COMPACT_INDEX_DTYPE,
+                   rerank_factor=COMPACT_RERANK_FACTOR, chunk_size=SCAN_CHUNK_SIZE):
+        """Convert a ResumeIndex into a compact index in `directory` (replacing what is there)."""
+        for name in ("meta.json", "ids.json", "ids.log", "codes.dat", "scales.dat", "vectors.dat"):
+            (Path(directory) / name).unlink(missing_ok=True)
+        compact = cls(directory, dtype, rerank_factor)
+        for start in range(0, len(index), chunk_size):
+            compact.add(index.ids[start:start + chunk_size], index.vectors[start:start + chunk_size])
+        return compact
+
+
+if __name__ == "__main__":
+    from time import time
+
+    jd_text = Path("data/job_descriptions/sample_jd.txt").read_text(encoding="utf-8")
+    index = ResumeIndex.load(RESUME_INDEX_PATH)
+    compact = CompactResumeIndex.from_index(index)
+    print(f"{len(compact)} resumes: {compact.nbytes_per_vector} bytes/resume scanned "
+          f"({compact.dtype}) vs {index.dim * 4} as fp32")
+
+    from app.models import get_embedding
+
+    jd_embedding = get_embedding(jd_text)
+    start = time()
+    matches = compact.search(jd_embedding, k=10)
+    print(f"Top {len(matches)} ({round((time() - start) * 1000, 2)} ms), "
+          f"same as exact search: {[m[0] for m in matches] == [m[0] for m in index.search(jd_embedding, k=10)]}")
+    for resume_id, score in matches:
+        print(f"{resume_id:25} — Score: {round(score * 100, 2)}%")
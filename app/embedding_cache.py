@@ -0,0 +1,199 @@
+import hashlib
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+
+def text_key(text):
+    """Content address of a text: identical resumes/JDs share one cache entry."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """On-disk embedding store keyed by text hash, one namespace per (provider, model).
+
+    Vectors live in a fixed-capacity memory-mapped array (float32 or float16) and a
+    small SQLite index maps keys to slots. When the store is full, the least recently
+    used entries are evicted and their slots reused, so disk usage stays bounded by
+    max_entries * dim * itemsize.
+    """
+
+    def __init__(self, cache_dir, provider, model_name, max_entries=200_000, dtype="float32"):
+        namespace = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{provider}-{model_name}")
+        self.dir = Path(cache_dir) / namespace
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.dtype = np.dtype(dtype)
+        self._vectors = None
+        self._lock = threading.Lock()
+
+        # Transactions are explicit (BEGIN IMMEDIATE): the index may be shared by several
+        # processes (CLI next to Streamlit, worker pools), and SQLite's write lock is what
+        # keeps two of them from claiming the same slot
+        self._db = sqlite3.connect(
+            self.dir / "index.sqlite", check_same_thread=False, isolation_level=None, timeout=30
+        )
+        with self._transaction():
+            self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, slot INTEGER UNIQUE, last_used INTEGER)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+
+            meta = self._meta()
+            if meta and (meta.get("dtype") != self.dtype.name or int(meta.get("capacity", 0)) != max_entries):
+                # Layout changed (config edit): start over rather than misread the vector file
+                self._reset()
+            else:
+                self._sync_vectors()
+
+    # --- storage helpers ---
+
+    @contextmanager
+    def _transaction(self):
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def _meta(self):
+        return dict(self._db.execute("SELECT key, value FROM meta"))
+
+    def _reset(self):
+        self._db.execute("DELETE FROM meta")
+        self._db.execute("DELETE FROM entries")
+        (self.dir / "vectors.dat").unlink(missing_ok=True)
+        self._vectors = None
+
+    def _open_vectors(self, dim, mode):
+        self._vectors = np.memmap(
+            self.dir / "vectors.dat", dtype=self.dtype, mode=mode, shape=(self.max_entries, dim)
+        )
+
+    def _sync_vectors(self):
+        # Another process may have created the vector file since this one opened the cache
+        if self._vectors is None:
+            dim = self._meta().get("dim")
+            if dim is not None:
+                self._open_vectors(int(dim), mode="r+")
+
+    def _init_vectors(self, dim):
+        self._open_vectors(dim, mode="w+")
+        self._db.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [("dim", str(dim)), ("dtype", self.dtype.name), ("capacity", str(self.max_entries))],
+        )
+
+    def _lookup(self, keys):
+        found = {}
+        for start in range(0, len(keys), 500):  # stay under SQLite's bound-parameter limit
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(self._db.execute(
+                f"SELECT key, slot FROM entries WHERE key IN ({placeholders})", chunk
+            ))
+        return found
+
+    def _allocate_slots(self, count, keep=()):
+        # Slots are handed out from a high-water mark until the file is full, then taken
+        # from the least recently used entries; callers hold the write transaction
+        meta = self._meta()
+        if "next_slot" in meta:
+            next_slot = int(meta["next_slot"])
+        else:  # cache written before the high-water mark was recorded
+            next_slot = self._db.execute("SELECT COALESCE(MAX(slot) + 1, 0) FROM entries").fetchone()[0]
+        fresh = min(count, self.max_entries - next_slot)
+        free = list(range(next_slot, next_slot + fresh))
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('next_slot', ?)", (str(next_slot + fresh),)
+        )
+        if len(free) < count:
+            keep = set(keep)
+            evicted = [
+                (key, slot)
+                for key, slot in self._db.execute(
+                    "SELECT key, slot FROM entries ORDER BY last_used LIMIT ?",
+                    (count - len(free) + len(keep),),
+                )
+                if key not in keep
+            ][:count - len(free)]
+            self._db.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in evicted])
+            free.extend(slot for _, slot in evicted)
+        return free
+
+    def _tick(self):
+        # Logical clock for LRU ordering, shared through the index by every process using it
+        # (wall-clock time can tie within one batch)
+        return self._db.execute("SELECT COALESCE(MAX(last_used), 0) + 1 FROM entries").fetchone()[0]
+
+    # --- public API ---
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get_many(self, keys):
+        """Return {key: float32 vector} for the keys present in the cache."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        with self._lock, self._transaction():
+            self._sync_vectors()
+            if self._vectors is None:
+                return {}
+            found = self._lookup(keys)
+            if not found:
+                return {}
+
+            now = self._tick()
+            self._db.executemany(
+                "UPDATE entries SET last_used = ? WHERE key = ?", [(now, key) for key in found]
+            )
+            # Copies, not memmap views: a later eviction may reuse these slots
+            return {key: np.array(self._vectors[slot], dtype=np.float32) for key, slot in found.items()}
+
+    def put_many(self, keys, vectors):
+        """Store vectors (array-like [n, dim]) under keys, evicting LRU entries if needed."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        entries = dict(zip(keys, vectors))  # last write wins for duplicate keys
+        if not entries:
+            return
+
+        with self._lock, self._transaction():
+            self._sync_vectors()
+            if self._vectors is None:
+                self._init_vectors(vectors.shape[1])
+
+            now = self._tick()
+            existing = self._lookup(list(entries))
+            new_keys = [key for key in entries if key not in existing]
+            # Never store more than the cache can hold in one go
+            room = self.max_entries - len(existing)
+            new_keys = new_keys[len(new_keys) - room:] if room > 0 else []
+            slots = dict(existing)
+            slots.update(zip(new_keys, self._allocate_slots(len(new_keys), keep=existing)))
+
+            for key, slot in slots.items():
+                self._vectors[slot] = entries[key]
+            self._vectors.flush()
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entries (key, slot, last_used) VALUES (?, ?, ?)",
+                [(key, slot, now) for key, slot in slots.items()],
+            )
+
+    def clear(self):
+        with self._lock, self._transaction():
+            self._reset()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+            self._vectors = None
@@ -1,9 +1,10 @@
-from app.models import get_embedding
-from app.parser import extract_text_from_pdf
-from sentence_transformers import util
+from config import EVAL_BOOTSTRAP_SAMPLES, EVAL_BOOTSTRAP_WORKERS, EVAL_CONFIDENCE
+from app.results_store import ResultsStore, update_scores, jd_key, model_key
+from app.reporting import render_in_background, render_top_n, render_distribution
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from sklearn.metrics import classification_report, confusion_matrix
 import json
 
@@ -15,8 +16,11 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 JD_FILE = Path("data/job_descriptions/sample_jd.txt")
 RESUME_DIR = Path("data/resumes_test")
 GROUND_TRUTH_FILE = OUTPUT_DIR / "ground_truth_labels.json"
+SWEEP_CSV = OUTPUT_DIR / "threshold_sweep.csv"
 THRESHOLD = 0.30  # 30% similarity threshold
 
+BOOTSTRAP_CHUNK = 50  # resamples per worker task (fixed, so results don't depend on the worker count)
+
 def load_ground_truth():
     if GROUND_TRUTH_FILE.exists():
         with open(GROUND_TRUTH_FILE, "r") as f:
@@ -24,63 +28,180 @@ def load_ground_truth():
     else:
         raise FileNotFoundError("Ground truth labels not found. Please run label_resume.py first.")
 
-def evaluate_resumes():
-    jd_text = JD_FILE.read_text(encoding="utf-8")
-    jd_embedding = get_embedding(jd_text)
+# --- Metrics engine ---
+# Every threshold is evaluated in one pass: sort the scores once (best first), then the
+# true/false positives at each distinct score are cumulative sums of the labels. A sample
+# is predicted relevant when its score is >= the threshold.
+
+def _sort(y_true, scores):
+    scores = np.asarray(scores, dtype=np.float64)
+    order = np.argsort(-scores, kind="stable")
+    return np.asarray(y_true, dtype=bool)[order], scores[order]
+
+def _divide(num, den, empty):
+    return np.divide(num, den, out=np.full(np.shape(num), empty, dtype=np.float64), where=den > 0)
+
+def _sweep_sorted(y_sorted, s_sorted, weights=None):
+    # weights are per-sample counts (bootstrap resamples); None counts every sample once
+    positives = y_sorted if weights is None else weights * y_sorted
+    negatives = ~y_sorted if weights is None else weights * ~y_sorted
+    last = np.r_[np.flatnonzero(np.diff(s_sorted)), s_sorted.size - 1]  # last sample of each distinct score
+    tp = np.cumsum(positives, dtype=np.float64)[last]
+    fp = np.cumsum(negatives, dtype=np.float64)[last]
+    n_pos, n_neg = (tp[-1], fp[-1]) if last.size else (0.0, 0.0)
+    fn = n_pos - tp
+    return {
+        "threshold": s_sorted[last],
+        "tp": tp,
+        "fp": fp,
+        "fn": fn,
+        "tn": n_neg - fp,
+        "precision": _divide(tp, tp + fp, 1.0),
+        "recall": _divide(tp, np.full_like(tp, n_pos), np.nan),  # NaN when a (resampled) set has one class
+        "f1": _divide(2 * tp, 2 * tp + fp + fn, np.nan),
+        "fpr": _divide(fp, np.full_like(fp, n_neg), np.nan),
+    }
+
+def threshold_sweep(y_true, scores):
+    """Confusion counts, precision, recall (= TPR), F1 and FPR at every distinct score, highest threshold first."""
+    return _sweep_sorted(*_sort(y_true, scores))
+
+def roc_auc(sweep):
+    """Area under the ROC curve (trapezoidal, from (0, 0))."""
+    fpr, tpr = np.r_[0.0, sweep["fpr"]], np.r_[0.0, sweep["recall"]]
+    return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+
+def average_precision(sweep):
+    """Area under the PR curve as a step function: sum of precision x recall gained."""
+    return float(np.sum(np.diff(np.r_[0.0, sweep["recall"]]) * sweep["precision"]))
+
+def optimal_threshold(sweep, metric="f1"):
+    """Threshold maximizing `metric` ("f1" or "youden" = TPR - FPR); ties go to the highest threshold."""
+    if metric == "youden":
+        values = sweep["recall"] - sweep["fpr"]
+    elif metric in sweep:
+        values = sweep[metric]
+    else:
+        raise ValueError(f"Unknown threshold metric: {metric}")
+    best = int(np.argmax(values))
+    return float(sweep["threshold"][best]), float(values[best])
+
+def metrics_at(sweep, threshold):
+    """Precision, recall, F1 and FPR when predicting relevant at score >= threshold."""
+    # The sweep is ordered by descending threshold; the row to use is the lowest threshold still >= it
+    i = np.searchsorted(-sweep["threshold"], -threshold, side="right") - 1
+    if i < 0:  # above every score: nothing is predicted relevant
+        return {"precision": 1.0, "recall": 0.0, "f1": 0.0, "fpr": 0.0}
+    return {name: float(sweep[name][i]) for name in ("precision", "recall", "f1", "fpr")}
+
+def _summary(sweep, threshold):
+    return {"roc_auc": roc_auc(sweep), "average_precision": average_precision(sweep), **metrics_at(sweep, threshold)}
 
-    ground_truth = load_ground_truth()
-    y_true, y_pred, results = [], [], []
+def _bootstrap_chunk(y_sorted, s_sorted, threshold, seed, n_samples):
+    # Resampling with replacement = sample counts over the already sorted data, so no re-sort per resample
+    rng = np.random.default_rng(seed)
+    n = y_sorted.size
+    return [
+        _summary(_sweep_sorted(y_sorted, s_sorted, np.bincount(rng.integers(0, n, n), minlength=n)), threshold)
+        for _ in range(n_samples)
+    ]
 
-    for resume_file, true_label in ground_truth.items():
+def bootstrap_ci(y_true, scores, threshold, n_samples=EVAL_BOOTSTRAP_SAMPLES, confidence=EVAL_CONFIDENCE,
+                 max_workers=EVAL_BOOTSTRAP_WORKERS, seed=0):
+    """Percentile bootstrap intervals {metric: (low, high)} for ROC AUC, AP and the metrics at `threshold`.
+
+    Resamples run in chunks across worker processes; max_workers=1 keeps them in-process.
+    """
+    y_sorted, s_sorted = _sort(y_true, scores)
+    sizes = [min(BOOTSTRAP_CHUNK, n_samples - start) for start in range(0, n_samples, BOOTSTRAP_CHUNK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(y_sorted, s_sorted, threshold, chunk_seed, size) for chunk_seed, size in zip(seeds, sizes)]
+
+    if max_workers == 1 or len(args) <= 1:
+        chunks = [_bootstrap_chunk(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            chunks = list(executor.map(_bootstrap_chunk, *zip(*args)))
+
+    samples = pd.DataFrame([row for chunk in chunks for row in chunk])
+    tail = (1 - confidence) / 2 * 100
+    return {name: tuple(np.nanpercentile(samples[name], [tail, 100 - tail])) for name in samples.columns}
+
+# --- Resume evaluation ---
+
+def labeled_scores(ground_truth, jd_text, store=None, score=None):
+    """(files, y_true, scores as 0-1 fractions) for the labeled resumes, scored once and cached.
+
+    Scores live in the results store, so repeated evaluations (e.g. threshold tuning)
+    only embed resumes that are new or changed since the last run.
+    """
+    store = store or ResultsStore()
+    labeled = {}
+    for resume_file in ground_truth:
         resume_path = RESUME_DIR / resume_file
         if not resume_path.exists():
             print(f"⚠️ Warning: File {resume_file} not found, skipping...")
             continue
+        labeled[str(resume_path.resolve())] = resume_file
 
-        resume_text = extract_text_from_pdf(resume_path)
-        resume_embedding = get_embedding(resume_text)
+    update_scores(jd_text, RESUME_DIR, store, THRESHOLD, paths=labeled, score=score)
+    stored = {path: value for path, value in store.scores(RESUME_DIR, jd_key(jd_text), model_key()) if path in labeled}
+    files = [labeled[path] for path in labeled if path in stored]
+    y_true = np.array([ground_truth[resume_file] for resume_file in files], dtype=np.int8)
+    scores = np.array([stored[path] for path in labeled if path in stored], dtype=np.float64) / 100
+    return files, y_true, scores
 
-        similarity_score = util.pytorch_cos_sim(jd_embedding, resume_embedding).item()
-        score_percent = round(similarity_score * 100, 2)
-        predicted_label = 1 if score_percent >= THRESHOLD * 100 else 0
+def evaluate_resumes(store=None, score=None, n_bootstrap=EVAL_BOOTSTRAP_SAMPLES):
+    jd_text = JD_FILE.read_text(encoding="utf-8")
+    files, y_true, scores = labeled_scores(load_ground_truth(), jd_text, store, score)
+    if not files:
+        print(f"⚠️ No labeled resumes found in '{RESUME_DIR.as_posix()}' (or none could be read); nothing to evaluate.")
+        return
+    y_pred = (scores >= THRESHOLD).astype(np.int8)
 
-        results.append({
-            "file": resume_file,
-            "score": score_percent,
-            "match": "✅" if predicted_label else "❌"
-        })
+    results = pd.DataFrame({"file": files, "score": np.round(scores * 100, 2), "match": np.where(y_pred, "✅", "❌")})
+    results = results.sort_values("score", ascending=False)
+    rows = results.to_dict("records")
 
-        y_true.append(true_label)
-        y_pred.append(predicted_label)
+    # Visualization (bounded: top-N bars + score distribution), rendered in the background
+    charts = [
+        render_in_background(render_top_n, OUTPUT_DIR / "evaluate_visualization.png", rows, "Resume vs JD Match Scores"),
+        render_in_background(render_distribution, OUTPUT_DIR / "evaluate_distribution.png",
+                             results["score"].tolist(), THRESHOLD, "Resume vs JD Match Scores"),
+    ]
 
     # Save results
-    df = pd.DataFrame(results).sort_values("score", ascending=False)
-    df.to_csv(OUTPUT_DIR / "resume_match_results.csv", index=False)
+    results.to_csv(OUTPUT_DIR / "resume_match_results.csv", index=False)
     print("\n📁 Results saved to 'output/resume_match_results.csv'")
 
-    # Visualization
-    plt.figure(figsize=(10, 6))
-    plt.barh(df["file"], df["score"], color="skyblue")
-    plt.xlabel("Match Score (%)")
-    plt.title("Resume vs JD Match Scores")
-    plt.gca().invert_yaxis()
-    plt.tight_layout()
-    plt.savefig(OUTPUT_DIR / "evaluate_visualization.png")
-    plt.close()
-    print("📊 Evaluation visualization saved as 'evaluate_visualization.png'")
-
     # Evaluation Metrics
     print("\n✅ Evaluation Completed!\n")
     if len(set(y_true)) > 1:
         print("📊 Classification Report:")
         print(classification_report(y_true, y_pred, target_names=["Not Relevant", "Relevant"]))
+
+        # Every threshold at once, from the cached scores
+        sweep = threshold_sweep(y_true, scores)
+        pd.DataFrame(sweep).to_csv(SWEEP_CSV, index=False)
+        best, best_f1 = optimal_threshold(sweep)
+        summary = _summary(sweep, THRESHOLD)
+        intervals = bootstrap_ci(y_true, scores, THRESHOLD, n_bootstrap) if n_bootstrap else {}
+        print(f"📈 Threshold sweep saved to '{SWEEP_CSV.as_posix()}' ({len(sweep['threshold'])} thresholds)")
+        for name, value in summary.items():
+            ci = f"  [{intervals[name][0]:.3f}, {intervals[name][1]:.3f}]" if name in intervals else ""
+            print(f"   {name:18} {value:.3f}{ci}")
+        print(f"🎯 Best F1 threshold: {best:.4f} (F1 {best_f1:.3f}; current threshold {THRESHOLD})")
     else:
         print("⚠️ Only one class present in labels, skipping classification report.")
 
     print("\n📉 Confusion Matrix:")
     print(confusion_matrix(y_true, y_pred))
 
+    for chart in charts:
+        chart.result()
+    print("📊 Evaluation visualizations saved as 'evaluate_visualization.png' and 'evaluate_distribution.png'")
+
 if __name__ == "__main__":
     evaluate_resumes()
     print("\nEvaluation test completed successfully.")
-    print("Evaluation test passed (LOCAL embeddings).") 
\ No newline at end of file
+    print("Evaluation test passed (LOCAL embeddings).")
@@ -4,7 +4,6 @@ import random
 
 # Output folder
 output_dir = Path("data/resumes_test")
-output_dir.mkdir(parents=True, exist_ok=True)
 
 # Sample Names and Skills (expandable)
 first_names = ["Alice", "Bob", "Cathy", "David", "Emma", "Frank", "Grace", "Harry", "Isabel", "John",
@@ -18,32 +17,42 @@ last_names = ["Johnson", "Smith", "Zhang", "Lee", "Davis", "Thomas", "Wong", "Wi
 skills_positive = ["Python", "SQL", "Machine Learning", "Deep Learning", "NLP", "Data Engineering", "Spark", "TensorFlow", "PyTorch", "AWS"]
 skills_negative = ["Manual Testing", "JIRA", "Tech Support", "Customer Service", "Frontend Dev", "UI/UX", "Networking", "Firewalls", "MS Excel", "Data Entry"]
 
-resumes = {}
-
-# Generate 50 fake resumes
-for i in range(1, 51):
-    name = f"{random.choice(first_names)} {random.choice(last_names)}"
-    if i % 2 == 0:
-        skills = ", ".join(random.sample(skills_positive, 4))
-        label = 1  # Relevant
-    else:
-        skills = ", ".join(random.sample(skills_negative, 4))
-        label = 0  # Not relevant
-
-    filename = f"resume_{i}.pdf"
-    resumes[filename] = (name, skills, label)
-
-    # Create PDF
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    pdf.cell(200, 10, txt=f"Name: {name}", ln=True)
-    pdf.cell(200, 10, txt=f"Skills: {skills}", ln=True)
-    pdf.output(str(output_dir / filename))
-
-# Create GROUND_TRUTH dictionary
-labels = {fname: label for fname, (_, _, label) in resumes.items()}
-
-print("50 fake resumes generated.")
-print("\nSample GROUND_TRUTH dictionary:")
-print(labels)
+
+def generate_resumes(output_dir=output_dir, count=50, seed=None):
+    """Write `count` fake resume PDFs (even = relevant, odd = not) and return their labels."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    resumes = {}
+
+    for i in range(1, count + 1):
+        name = f"{rng.choice(first_names)} {rng.choice(last_names)}"
+        if i % 2 == 0:
+            skills = ", ".join(rng.sample(skills_positive, 4))
+            label = 1  # Relevant
+        else:
+            skills = ", ".join(rng.sample(skills_negative, 4))
+            label = 0  # Not relevant
+
+        filename = f"resume_{i}.pdf"
+        resumes[filename] = (name, skills, label)
+
+        # Create PDF
+        pdf = FPDF()
+        pdf.add_page()
+        pdf.set_font("Arial", size=12)
+        pdf.cell(200, 10, txt=f"Name: {name}", ln=True)
+        pdf.cell(200, 10, txt=f"Skills: {skills}", ln=True)
+        pdf.output(str(output_dir / filename))
+
+    # Create GROUND_TRUTH dictionary
+    return {fname: label for fname, (_, _, label) in resumes.items()}
+
+
+if __name__ == "__main__":
+    # Generate 50 fake resumes
+    labels = generate_resumes(output_dir, 50)
+
+    print("50 fake resumes generated.")
+    print("\nSample GROUND_TRUTH dictionary:")
+    print(labels)
@@ -0,0 +1,200 @@
+import cProfile
+import json
+import math
+import os
+import pstats
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+
+from config import INSTRUMENTATION_ENABLED, PROFILE_MODE, METRICS_DIR
+
+# Lightweight stage metrics: timers feed per-stage latency histograms, counters count
+# events (cache hits, failed PDFs, ...). Wrap a run in run_metrics() to get a JSON
+# report per run; set PROFILE_MODE=cprofile (or py-spy) in the environment to profile
+# a production run without editing code. Each run_metrics() block records into its own
+# registry (context-local), so concurrent runs such as background jobs don't mix stats.
+
+BUCKET_GROWTH = 1.1  # log-spaced histogram buckets, 10% wide: percentiles are within ~5%
+MIN_SECONDS = 1e-6
+PROFILE_TOP_FUNCTIONS = 25
+
+
+class Histogram:
+    """Log-bucketed latency histogram: constant memory however many samples it sees."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, seconds):
+        index = max(0, int(math.log(max(seconds, MIN_SECONDS) / MIN_SECONDS, BUCKET_GROWTH)))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q):
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Geometric centre of the bucket, clamped to what was actually observed
+                value = MIN_SECONDS * BUCKET_GROWTH ** (index + 0.5)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self):
+        ms = lambda seconds: round(seconds * 1000, 3)
+        return {
+            "count": self.count,
+            "total_s": round(self.total, 4),
+            "mean_ms": ms(self.total / self.count) if self.count else None,
+            "p50_ms": ms(self.percentile(50)) if self.count else None,
+            "p95_ms": ms(self.percentile(95)) if self.count else None,
+            "p99_ms": ms(self.percentile(99)) if self.count else None,
+            "max_ms": ms(self.max) if self.count else None,
+        }
+
+
+class Metrics:
+    """Thread-safe registry of stage histograms and counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+            self.counters = {}
+            self.started_at = datetime.now()
+            self._started = perf_counter()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram()
+            histogram.observe(seconds)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self):
+        with self._lock:
+            return {
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "wall_s": round(perf_counter() - self._started, 4),
+                "stages": {stage: histogram.summary() for stage, histogram in sorted(self.stages.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+
+_metrics = Metrics()  # process-wide registry, used outside run_metrics() (e.g. the HTTP service)
+_current = ContextVar("metrics", default=_metrics)
+
+
+@contextmanager
+def timed(stage):
+    """Time a block (or, as a decorator, every call) into the `stage` histogram."""
+    if not INSTRUMENTATION_ENABLED:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        _current.get().observe(stage, perf_counter() - start)
+
+
+def observe(stage, seconds):
+    """Record a duration measured elsewhere (e.g. in a worker process)."""
+    if INSTRUMENTATION_ENABLED:
+        _current.get().observe(stage, seconds)
+
+
+def count(name, n=1):
+    if INSTRUMENTATION_ENABLED:
+        _current.get().count(name, n)
+
+
+def report():
+    return _current.get().report()
+
+
+def reset():
+    _current.get().reset()
+
+
+def _profile_summary(profiler):
+    stats = pstats.Stats(profiler)
+    top = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in sorted(
+            stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP_FUNCTIONS]:
+        top.append({
+            "function": f"{Path(filename).name}:{line}({function})",
+            "calls": calls,
+            "own_s": round(own, 4),
+            "cumulative_s": round(cumulative, 4),
+        })
+    return top
+
+
+@contextmanager
+def run_metrics(run_name, output_dir=METRICS_DIR, profile=PROFILE_MODE):
+    """Collect metrics for one run, then write <run_name>_<timestamp>.json and latest.json.
+
+    profile="cprofile" also profiles the calling thread into a .prof file (open it with
+    snakeviz or pstats) and adds the top functions to the report. profile="py-spy" prints
+    the PID to attach a sampling profiler to, which also sees threads and native frames.
+    """
+    output_dir = Path(output_dir)
+    metrics = Metrics()
+    token = _current.set(metrics)
+    profiler = None
+    if profile == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+    elif profile == "py-spy":
+        print(f"🔎 Profiling hook: py-spy record -o {run_name}.svg --pid {os.getpid()}")
+
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+        stamp = f"{run_name}_{datetime.now():%Y%m%d_%H%M%S}"
+        result = {"run": run_name, **metrics.report()}
+        output_dir.mkdir(parents=True, exist_ok=True)
+        if profiler is not None:
+            profiler.disable()
+            profile_path = output_dir / f"{stamp}.prof"
+            profiler.dump_stats(profile_path)
+            result["profile"] = {"path": str(profile_path), "top_functions": _profile_summary(profiler)}
+        report_json = json.dumps(result, indent=2, ensure_ascii=False)
+        (output_dir / f"{stamp}.json").write_text(report_json, encoding="utf-8")
+        # Concurrent runs may finish together: replace latest.json atomically
+        tmp = output_dir / f"latest.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp.write_text(report_json, encoding="utf-8")
+        os.replace(tmp, output_dir / "latest.json")
+        print(f"📊 Run metrics saved to '{output_dir / (stamp + '.json')}'")
+
+
+def load_reports(output_dir=METRICS_DIR):
+    """Saved run reports, newest first, as [(path, report)]."""
+    paths = sorted(
+        (p for p in Path(output_dir).glob("*.json") if p.name != "latest.json"),
+        key=lambda p: p.stat().st_mtime, reverse=True,
+    )
+    return [(path, json.loads(path.read_text(encoding="utf-8"))) for path in paths]
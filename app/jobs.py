@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from time import monotonic
+
+from app.instrumentation import run_metrics
+from config import (
+    JOB_DIR, JOB_WORKERS, SHORTLIST_TOP_N, RESULTS_STORE_ENABLED, METRICS_DIR,
+)
+
+# Background screening jobs with a local job store. Each job lives in JOB_DIR/<job_id>/:
+#   job.json        status, progress and timings (rewritten atomically as it runs)
+#   jd.txt          the job description, so interrupted jobs can be resumed
+#   results.csv     every scored resume (written by the streaming pipeline)
+#   results.jsonl   checkpoint used to resume an interrupted job
+#   shortlist.json  the top-N rows
+# Submitting the same JD, threshold and (unchanged) resume folder again returns the
+# existing job instead of screening twice.
+
+PROGRESS_SAVE_INTERVAL = 0.5  # seconds between job.json progress writes
+ACTIVE = ("queued", "running")
+
+
+def _dir_signature(resume_dir):
+    # Names, sizes and mtimes of the PDFs: a changed pool gives a new job key
+    digest = hashlib.sha256()
+    count = 0
+    for path in sorted(Path(resume_dir).glob("*.pdf")):
+        stat = path.stat()
+        digest.update(f"{path.name}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+        count += 1
+    return digest.hexdigest(), count
+
+
+def job_key(jd_text, resume_dir, threshold, top_n, signature):
+    from app.results_store import model_key  # deferred: results_store pulls in the screening pipeline
+
+    payload = json.dumps([jd_text, str(Path(resume_dir).resolve()), threshold, top_n, model_key(), signature])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class JobManager:
+    """Runs screening jobs on a thread pool and tracks them in a directory-backed job store.
+
+    `screen` has run_screening's signature; tests pass a stub. Each job writes its own
+    run metrics report to metrics_dir.
+    """
+
+    def __init__(self, job_dir=JOB_DIR, max_workers=JOB_WORKERS, screen=None, metrics_dir=METRICS_DIR):
+        if screen is None:
+            if RESULTS_STORE_ENABLED:
+                from app.results_store import run_incremental_screening as screen
+            else:
+                from app.pipeline import run_screening as screen
+        self.job_dir = Path(job_dir)
+        self.job_dir.mkdir(parents=True, exist_ok=True)
+        self._screen = screen
+        self.metrics_dir = Path(metrics_dir)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="screening-job")
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._futures = {}
+        self._load()
+
+    def _load(self):
+        # Jobs left queued/running by a previous process can't still be running
+        for job_file in self.job_dir.glob("*/job.json"):
+            try:
+                record = json.loads(job_file.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                continue
+            if record["status"] in ACTIVE:
+                record["status"] = "interrupted"
+                self._save(record)
+            self._jobs[record["id"]] = record
+
+    def _path(self, job_id, name):
+        return self.job_dir / job_id / name
+
+    def _save(self, record):
+        job_file = self._path(record["id"], "job.json")
+        # Per-writer temp file: two managers (e.g. before/after a restart) may save the same job
+        tmp = job_file.with_name(f"job.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(record, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, job_file)
+
+    def _update(self, job_id, **changes):
+        with self._lock:
+            record = self._jobs[job_id]
+            record.update(changes)
+            self._save(record)
+
+    def submit(self, jd_text, resume_dir, threshold=0.30, top_n=SHORTLIST_TOP_N):
+        """Queue a screening job and return its id (an identical job is reused, not re-run)."""
+        signature, total = _dir_signature(resume_dir)
+        key = job_key(jd_text, resume_dir, threshold, top_n, signature)
+        with self._lock:
+            for record in sorted(self._jobs.values(), key=lambda r: r["created_at"], reverse=True):
+                if record["key"] != key or record["status"] == "failed":
+                    continue
+                if record["status"] == "interrupted":
+                    record.update(status="queued", error=None)
+                    self._save(record)
+                    self._start(record["id"], jd_text, resume=True)
+                return record["id"]
+
+            job_id = f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:6]}"
+            record = {
+                "id": job_id,
+                "key": key,
+                "status": "queued",
+                "resume_dir": str(resume_dir),
+                "threshold": threshold,
+                "top_n": top_n,
+                "total": total,
+                "processed": 0,
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "started_at": None,
+                "finished_at": None,
+                "elapsed_s": None,
+                "error": None,
+            }
+            (self.job_dir / job_id).mkdir(parents=True)
+            self._path(job_id, "jd.txt").write_text(jd_text, encoding="utf-8")
+            self._jobs[job_id] = record
+            self._save(record)
+            self._start(job_id, jd_text, resume=False)
+        return job_id
+
+    def _start(self, job_id, jd_text, resume):
+        self._futures[job_id] = self._executor.submit(self._run, job_id, jd_text, resume)
+
+    def _run(self, job_id, jd_text, resume):
+        record = self.get(job_id)
+        start = monotonic()
+        self._update(job_id, status="running", started_at=datetime.now().isoformat(timespec="seconds"))
+        processed = 0
+        last_save = start
+
+        def advance(n, force=False):
+            nonlocal processed, last_save
+            processed += n
+            if force or monotonic() - last_save >= PROGRESS_SAVE_INTERVAL:
+                last_save = monotonic()
+                self._update(job_id, processed=min(processed, record["total"]))
+
+        try:
+            # One metrics report per job; concurrent jobs record into separate registries
+            with run_metrics(f"ui_batch_screening_{job_id}", output_dir=self.metrics_dir):
+                shortlist = self._screen(
+                    jd_text, record["resume_dir"], self._path(job_id, "results.csv"),
+                    self._path(job_id, "results.jsonl"), record["threshold"], top_n=record["top_n"], resume=resume,
+                    on_row=lambda row: advance(1),
+                    # Rows from the results store or checkpoint count toward progress too
+                    on_cached=lambda n: advance(n, force=True),
+                )
+            self._path(job_id, "shortlist.json").write_text(json.dumps(shortlist, ensure_ascii=False), encoding="utf-8")
+        except Exception as e:
+            print(f"⚠️ Screening job {job_id} failed: {e}")
+            self._update(job_id, status="failed", error=f"{type(e).__name__}: {e}",
+                         finished_at=datetime.now().isoformat(timespec="seconds"), elapsed_s=round(monotonic() - start, 2))
+            return
+        self._update(job_id, status="done", processed=record["total"],
+                     finished_at=datetime.now().isoformat(timespec="seconds"), elapsed_s=round(monotonic() - start, 2))
+
+    def get(self, job_id):
+        """A copy of the job record (status, processed/total, timings, error)."""
+        with self._lock:
+            return dict(self._jobs[job_id])
+
+    def list(self):
+        with self._lock:
+            return sorted((dict(r) for r in self._jobs.values()), key=lambda r: r["created_at"], reverse=True)
+
+    def wait(self, job_id, timeout=None):
+        """Block until the job finishes; returns its record."""
+        future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout=timeout)
+        return self.get(job_id)
+
+    def results_path(self, job_id):
+        return self._path(job_id, "results.csv")
+
+    def shortlist(self, job_id):
+        return json.loads(self._path(job_id, "shortlist.json").read_text(encoding="utf-8"))
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    """The process-wide JobManager, shared by every Streamlit session."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager()
+    return _manager
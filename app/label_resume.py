@@ -1,4 +1,5 @@
 from app.parser import extract_text_from_pdf
+from app.skills import extract_skills
 from pathlib import Path
 import json
 import time
@@ -10,13 +11,14 @@ JD_FILE = Path("data/job_descriptions/sample_jd.txt")
 
 
 def extract_skills_from_text(text):
-    """Extract skills from the 'Skills:' line in synthetic PDFs."""
+    """Extract skills from the 'Skills:' line in synthetic PDFs, else from the skill taxonomy."""
     for line in text.splitlines():
         if "skills:" in line.lower():
             parts = line.split(":")
             if len(parts) > 1:
                 return parts[1].strip()
-    return None
+    skills = extract_skills(text)
+    return ", ".join(skills) if skills else None
 
 
 def label_resumes():
@@ -1,44 +1,46 @@
-from app.models import get_embedding
-from app.parser import parse_resume
-from sentence_transformers import util
+from app.models import get_embedding, embed_documents
+from app.parser import parse_resumes
+from app.resume_index import ResumeIndex
 from pathlib import Path
-import torch
 
 def load_job_description(jd_path):
     return Path(jd_path).read_text(encoding="utf-8")
 
-def match_resumes_to_jd(jd_path, resumes_dir):
+def match_resumes_to_jd(jd_path, resumes_dir, top_k=None):
     jd_text = load_job_description(jd_path)
     jd_embedding = get_embedding(jd_text)
 
-    results = []
+    # Parallel extraction + batched NER; unreadable files are reported and skipped.
+    # Only the fields shown in the results are extracted (no skills call per resume).
+    parsed_resumes = parse_resumes(sorted(Path(resumes_dir).glob("*.pdf")), fields=("name", "email"))
 
-    for resume_file in Path(resumes_dir).glob("*.pdf"):
-        try:
-            resume_data = parse_resume(resume_file)
-            resume_text = resume_data["raw_text"]
+    if not parsed_resumes:
+        return []
 
-            # Generate embedding for resume text
-            resume_embedding = get_embedding(resume_text)
+    # Generate embeddings for all (full) resume texts in one batched call
+    resume_embeddings = embed_documents([resume_data.raw_text for _, resume_data in parsed_resumes])
 
-            # Cosine similarity (works both for torch or list type embeddings)
-            if isinstance(jd_embedding, torch.Tensor):
-                similarity = util.pytorch_cos_sim(jd_embedding, resume_embedding).item()
-            else:
-                # fallback, but since we always use torch.tensor(), it's safe
-                raise ValueError("Unsupported embedding type")
+    import torch
 
-            results.append({
-                "name": resume_data["name"],
-                "email": resume_data["email"],
-                "score": round(similarity * 100, 2),
-                "file": resume_file.name
-            })
+    if not isinstance(jd_embedding, torch.Tensor):
+        # fallback, but since we always use torch.tensor(), it's safe
+        raise ValueError("Unsupported embedding type")
 
-        except Exception as e:
-            print(f"Error processing {resume_file.name}: {e}")
+    # Cosine similarity + ranking via one matmul and argpartition top-k
+    index = ResumeIndex()
+    index.add(range(len(parsed_resumes)), resume_embeddings)
 
-    return sorted(results, key=lambda x: x["score"], reverse=True)
+    results = []
+    for position, similarity in index.search(jd_embedding, k=top_k or len(parsed_resumes)):
+        resume_file, resume_data = parsed_resumes[position]
+        results.append({
+            "name": resume_data.name,
+            "email": resume_data.email,
+            "score": round(similarity * 100, 2),
+            "file": resume_file.name
+        })
+
+    return results
 
 # Local test
 if __name__ == "__main__":
@@ -1,48 +1,304 @@
-from config import MODEL_PROVIDER, LOCAL_MODEL_NAME, OPENAI_MODEL_NAME, OPENAI_API_KEY
+import re
+import threading
 
-if MODEL_PROVIDER == "local":
-    from sentence_transformers import SentenceTransformer
+from config import MODEL_PROVIDER, LOCAL_MODEL_NAME, OPENAI_EMBEDDING_MODEL, EMBEDDING_BATCH_SIZE
+from config import LOCAL_BACKEND, LOCAL_NUM_THREADS, ONNX_MODEL_FILE
+from config import EMBEDDING_CACHE_ENABLED, EMBEDDING_CACHE_DIR, EMBEDDING_CACHE_MAX_ENTRIES, EMBEDDING_CACHE_DTYPE
+from config import EMBEDDING_CHUNKING, CHUNK_MAX_TOKENS, CHUNK_OVERLAP, CHUNK_POOLING
+from app.embedding_cache import EmbeddingCache, text_key
+from app.instrumentation import timed, count
+import numpy as np
+
+# torch, sentence_transformers and openai are imported on first use, not at import time,
+# so tools that never embed anything (label_resume.py, tests of pure helpers) start fast.
+
+_cache = None
+_lock = threading.Lock()
+
+
+def _local_model_key(backend=LOCAL_BACKEND):
+    # Quantized/ONNX vectors differ slightly from fp32, so each backend caches separately
+    return LOCAL_MODEL_NAME if backend == "torch" else f"{LOCAL_MODEL_NAME}:{backend}"
+
+
+def _get_cache():
+    global _cache
+    if _cache is None and EMBEDDING_CACHE_ENABLED:
+        with _lock:
+            if _cache is None:
+                model_name = _local_model_key() if MODEL_PROVIDER == "local" else OPENAI_EMBEDDING_MODEL
+                _cache = EmbeddingCache(
+                    EMBEDDING_CACHE_DIR,
+                    MODEL_PROVIDER,
+                    model_name,
+                    max_entries=EMBEDDING_CACHE_MAX_ENTRIES,
+                    dtype=EMBEDDING_CACHE_DTYPE,
+                )
+    return _cache
+
+
+def _embed_with_cache(texts, encode, use_cache=True):
+    # Only texts missing from the cache reach the encoder (each distinct text once)
+    import torch
+
+    cache = _get_cache() if use_cache else None
+    if cache is None:
+        count("texts_encoded", len(texts))
+        with timed("encode"):
+            return encode(texts)
+
+    keys = [text_key(text) for text in texts]
+    vectors = cache.get_many(keys)
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in vectors:
+            missing.setdefault(key, text)
+
+    count("embedding_cache_hits", sum(key in vectors for key in keys))
+    if missing:
+        count("texts_encoded", len(missing))
+        with timed("encode"):
+            fresh = encode(list(missing.values())).detach().cpu().numpy().astype(np.float32)
+        cache.put_many(list(missing), fresh)
+        vectors.update(zip(missing, fresh))
+
+    return torch.from_numpy(np.stack([vectors[key] for key in keys]))
+
+
+def _length_order(texts):
+    # Sorting by length keeps similarly sized texts in the same batch (less padding)
+    return sorted(range(len(texts)), key=lambda i: len(texts[i]))
+
+
+def _restore_order(embeddings, order):
     import torch
 
-    model = SentenceTransformer(LOCAL_MODEL_NAME)
+    restored = torch.empty_like(embeddings)
+    restored[torch.tensor(order, dtype=torch.long)] = embeddings
+    return restored
 
+
+def cos_sim(a, b):
+    """Cosine similarity matrix between two embedding tensors (sentence_transformers.util.cos_sim)."""
+    from sentence_transformers import util
+
+    return util.pytorch_cos_sim(a, b)
+
+
+if MODEL_PROVIDER == "local":
+    _model = None
+
+    def load_local_model(backend=LOCAL_BACKEND, num_threads=LOCAL_NUM_THREADS):
+        """Build the local encoder for a backend: "torch", "int8" or "onnx".
+
+        "int8" dynamically quantizes the Linear layers to int8 (CPU only, no extra
+        dependency); "onnx" runs ONNX_MODEL_FILE through ONNX Runtime
+        (pip install "sentence-transformers[onnx]").
+        """
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if num_threads:
+            torch.set_num_threads(num_threads)
+
+        if backend == "torch":
+            return SentenceTransformer(LOCAL_MODEL_NAME)
+        if backend == "int8":
+            model = SentenceTransformer(LOCAL_MODEL_NAME, device="cpu")
+            return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        if backend == "onnx":
+            import onnxruntime
+
+            options = onnxruntime.SessionOptions()
+            if num_threads:
+                options.intra_op_num_threads = num_threads
+            return SentenceTransformer(
+                LOCAL_MODEL_NAME,
+                backend="onnx",
+                model_kwargs={"file_name": ONNX_MODEL_FILE, "session_options": options},
+            )
+        raise ValueError(f"Unsupported LOCAL_BACKEND: {backend}")
+
+    def get_model():
+        """Load the local encoder once, on first use (safe to call from many threads)."""
+        global _model
+        if _model is None:
+            with _lock:
+                if _model is None:
+                    _model = load_local_model()
+        return _model
+
+    def unload_model():
+        """Drop the loaded encoder; the next get_model() loads it again."""
+        global _model
+        with _lock:
+            _model = None
+
+    def _encode(texts, batch_size=EMBEDDING_BATCH_SIZE):
+        order = _length_order(texts)
+        embeddings = get_model().encode(
+            [texts[i] for i in order],
+            batch_size=batch_size,
+            convert_to_tensor=True,
+        )
+        return _restore_order(embeddings, order)
+
+    @timed("get_embedding")
     def get_embedding(text):
-        return model.encode(text, convert_to_tensor=True)
+        return _embed_with_cache([text], _encode)[0]
+
+    def get_embeddings(texts, batch_size=EMBEDDING_BATCH_SIZE, use_cache=True):
+        """Embed many texts at once; returns a [len(texts), hidden_dim] tensor in input order."""
+        texts = list(texts)
+        if not texts:
+            import torch
+
+            return torch.empty((0, get_model().get_sentence_embedding_dimension()))
+        return _embed_with_cache(texts, lambda batch: _encode(batch, batch_size), use_cache)
 
     def extract_skills_with_model(text):
-        # Local model doesn't extract skills; fallback
-        return f"Model: {LOCAL_MODEL_NAME} — Local embedding used."
+        # No chat model locally: skills come from the taxonomy matcher
+        from app.skills import extract_skills
+
+        return extract_skills(text)
+
+    def extract_skills_many(texts):
+        from app.skills import extract_skills_many as extract_many
+
+        return extract_many(texts)
 
 elif MODEL_PROVIDER == "openai":
-    from openai import OpenAI
-    import torch
+    # Requests go through the async provider: many texts per embeddings request, bounded
+    # concurrency, token-bucket rate limits, retries with backoff and request dedup.
+    from app.openai_async import get_provider, run_sync
+
+    def _encode(texts, batch_size=EMBEDDING_BATCH_SIZE):
+        # batch_size is ignored here; packing is set by OPENAI_INPUTS_PER_REQUEST
+        import torch
 
-    client = OpenAI(api_key=OPENAI_API_KEY)
+        return torch.tensor(run_sync(get_provider().embed(list(texts))))
 
+    @timed("get_embedding")
     def get_embedding(text):
-        response = client.embeddings.create(
-            model="text-embedding-ada-002",  # using OpenAI's best embedding model
-            input=text,
-        )
-        embedding = response.data[0].embedding
-        return torch.tensor(embedding).unsqueeze(0)  # convert list to tensor [1, hidden_dim]
+        return _embed_with_cache([text], _encode)  # tensor [1, hidden_dim]
 
-    def extract_skills_with_model(text):
-        prompt = (
+    def get_embeddings(texts, batch_size=EMBEDDING_BATCH_SIZE, use_cache=True):
+        """Embed many texts with concurrent batched requests; returns a [len(texts), hidden_dim] tensor."""
+        texts = list(texts)
+        if not texts:
+            import torch
+
+            return torch.empty((0, 0))
+        return _embed_with_cache(texts, lambda batch: _encode(batch, batch_size), use_cache)
+
+    def _skills_prompt(text):
+        return (
             "You are a helpful assistant that extracts professional skills from resumes.\n"
             "Given the following resume content, list the top 10 most relevant skills for a job in tech:\n\n"
             f"{text}\n\n"
             "Return the skills as a comma-separated list."
         )
 
-        response = client.chat.completions.create(
-            model=OPENAI_MODEL_NAME,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2,
-            max_tokens=250
-        )
+    def extract_skills_with_model(text):
+        return extract_skills_many([text])[0]
+
+    def extract_skills_many(texts):
+        """One chat completion per distinct resume, run concurrently under the rate limits; a skill list each."""
+        from app.skills import parse_skill_list
 
-        return response.choices[0].message.content.strip()
+        return [parse_skill_list(reply) for reply in run_sync(get_provider().extract_skills(list(texts), _skills_prompt))]
 
 else:
     raise ValueError(f"Unsupported MODEL_PROVIDER: {MODEL_PROVIDER}")
+
+
+# --- Chunked long-document embeddings ---
+
+def _token_spans(text):
+    # Character (start, end) of every token, so chunks can be cut out of the original text
+    if MODEL_PROVIDER == "local":
+        encoded = get_model().tokenizer(
+            text, add_special_tokens=False, return_offsets_mapping=True, verbose=False
+        )
+        return encoded["offset_mapping"]
+    return [match.span() for match in re.finditer(r"\S+", text)]  # words approximate tokens
+
+
+def chunk_text(text, max_tokens=CHUNK_MAX_TOKENS, overlap=CHUNK_OVERLAP):
+    """Split text into overlapping windows of at most max_tokens tokens."""
+    spans = _token_spans(text)
+    if len(spans) <= max_tokens:
+        return [text]
+
+    stride = max(max_tokens - overlap, 1)
+    chunks = []
+    for start in range(0, len(spans), stride):
+        window = spans[start:start + max_tokens]
+        chunks.append(text[window[0][0]:window[-1][1]])
+        if start + max_tokens >= len(spans):
+            break
+    return chunks
+
+
+def get_chunk_embeddings(texts, batch_size=EMBEDDING_BATCH_SIZE, use_cache=True):
+    """Encode the chunks of all texts in shared batches.
+
+    Returns (chunk_embeddings [total_chunks, hidden_dim], owners) where owners[i] is the
+    index of the text chunk i came from. Chunks go through the embedding cache like any
+    other text, so re-scoring against a new JD never re-encodes them.
+    """
+    chunks, owners = [], []
+    for index, text in enumerate(texts):
+        pieces = chunk_text(text)
+        chunks.extend(pieces)
+        owners.extend([index] * len(pieces))
+    return get_embeddings(chunks, batch_size=batch_size, use_cache=use_cache), owners
+
+
+def pool_chunks(chunk_embeddings, owners, n_texts, pooling=CHUNK_POOLING):
+    """Pool chunk vectors back into one [n_texts, hidden_dim] matrix ("mean" or "max")."""
+    import torch
+
+    chunk_embeddings = torch.nn.functional.normalize(chunk_embeddings.float(), dim=-1)
+    index = torch.tensor(owners, dtype=torch.long, device=chunk_embeddings.device)
+    pooled = torch.zeros((n_texts, chunk_embeddings.shape[1]), device=chunk_embeddings.device)
+    if pooling == "mean":
+        pooled.index_add_(0, index, chunk_embeddings)
+        counts = torch.bincount(index, minlength=n_texts).clamp(min=1).unsqueeze(1)
+        return pooled / counts
+    if pooling == "max":
+        expanded = index.unsqueeze(1).expand_as(chunk_embeddings)
+        return pooled.scatter_reduce(0, expanded, chunk_embeddings, reduce="amax", include_self=False)
+    raise ValueError(f"Unsupported pooling for document vectors: {pooling}")
+
+
+def embed_documents(texts, batch_size=EMBEDDING_BATCH_SIZE, use_cache=True):
+    """Resume-side embeddings: chunked and pooled when EMBEDDING_CHUNKING is on, else get_embeddings.
+
+    use_cache=False skips the embedding cache for throwaway texts (e.g. bias-audit variants).
+    """
+    texts = list(texts)
+    if not EMBEDDING_CHUNKING or not texts:
+        return get_embeddings(texts, batch_size=batch_size, use_cache=use_cache)
+    pooling = "mean" if CHUNK_POOLING == "best" else CHUNK_POOLING  # "best" needs the JD: see score_chunked
+    chunk_embeddings, owners = get_chunk_embeddings(texts, batch_size, use_cache)
+    return pool_chunks(chunk_embeddings, owners, len(texts), pooling)
+
+
+def score_chunked(query_embedding, texts, pooling=CHUNK_POOLING, batch_size=EMBEDDING_BATCH_SIZE):
+    """Cosine score of each text against the query, pooling chunk-level evidence.
+
+    "best" scores each text by its single best-matching chunk; "mean"/"max" score the
+    pooled document vector.
+    """
+    import torch
+
+    texts = list(texts)
+    chunk_embeddings, owners = get_chunk_embeddings(texts, batch_size)
+    if pooling != "best":
+        return cos_sim(query_embedding, pool_chunks(chunk_embeddings, owners, len(texts), pooling))[0]
+
+    chunk_scores = cos_sim(query_embedding, chunk_embeddings)[0]
+    index = torch.tensor(owners, dtype=torch.long, device=chunk_scores.device)
+    best = torch.full((len(texts),), -1.0, device=chunk_scores.device)
+    return best.scatter_reduce(0, index, chunk_scores, reduce="amax", include_self=False)
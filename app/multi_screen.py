@@ -0,0 +1,148 @@
+from pathlib import Path
+import argparse
+import csv
+import numpy as np
+
+from config import JD_DIR, SCORE_CHUNK_SIZE, SHORTLIST_TOP_N, SKILL_WEIGHT
+from app.models import get_embeddings, embed_documents
+from app.pipeline import batched, discover_resumes, extract_stage
+from app.instrumentation import timed, count, run_metrics
+from app.reporting import render_in_background, render_per_jd
+from app.skills import get_skill_matcher, skill_overlap, blend_scores
+
+# Screen one resume pool against many job descriptions at once: every JD and every
+# resume is embedded exactly once, and all scores come from one normalized matmul
+# per resume chunk, giving a [n_jds, n_resumes] similarity matrix.
+
+OUTPUT_DIR = Path("output")
+THRESHOLD = 0.30  # 30% threshold (consistency with screen_resumes)
+
+
+def _normalized(embeddings):
+    if hasattr(embeddings, "detach"):
+        embeddings = embeddings.detach().cpu().numpy()
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+def load_job_descriptions(jd_dir=JD_DIR):
+    """Return {jd_name: text} for every .txt file in jd_dir."""
+    return {path.stem: path.read_text(encoding="utf-8") for path in sorted(Path(jd_dir).glob("*.txt"))}
+
+
+def similarity_matrix(jd_embeddings, resume_embeddings, chunk_size=SCORE_CHUNK_SIZE):
+    """Cosine similarity of every JD against every resume, computed chunk by chunk."""
+    jds = _normalized(jd_embeddings)
+    matrix = np.empty((len(jds), len(resume_embeddings)), dtype=np.float32)
+    for start in range(0, len(resume_embeddings), chunk_size):
+        chunk = _normalized(resume_embeddings[start:start + chunk_size])
+        matrix[:, start:start + len(chunk)] = jds @ chunk.T
+    return matrix
+
+
+def score_resume_stream(jd_embeddings, documents, chunk_size=SCORE_CHUNK_SIZE, jd_skills=None, skill_weight=SKILL_WEIGHT):
+    """Embed (path, text) documents chunk by chunk; returns (resume_paths, similarity matrix).
+
+    Only one chunk of resume embeddings is alive at a time, so the pool can be far larger
+    than what fits in memory as embeddings; the matrix itself is n_jds x n_resumes floats.
+    With jd_skills ([n_jds, n_skills] 0/1) and skill_weight > 0, each score blends in the
+    share of the JD's skills found in the resume.
+    """
+    jds = _normalized(jd_embeddings)
+    paths, columns = [], []
+    for batch in batched(documents, chunk_size):
+        texts = [text for _, text in batch]
+        with timed("embed_batch"):
+            chunk = embed_documents(texts)
+        with timed("score_batch"):
+            scores = similarity_matrix(jds, chunk, chunk_size)
+            if jd_skills is not None and skill_weight:
+                overlap = skill_overlap(jd_skills, get_skill_matcher().text_matrix(texts))
+                scores = blend_scores(scores, overlap, skill_weight)
+            columns.append(scores)
+        count("resumes_scored", len(batch))
+        paths.extend(path for path, _ in batch)
+    matrix = np.concatenate(columns, axis=1) if columns else np.empty((len(jds), 0), dtype=np.float32)
+    return paths, matrix
+
+
+def shortlists_from_matrix(matrix, jd_names, resume_names, threshold=THRESHOLD, top_n=SHORTLIST_TOP_N):
+    """Per-JD ranked shortlists: {jd_name: [{"file", "score", "rank", "shortlisted"}, ...]}."""
+    n_resumes = matrix.shape[1]
+    top_n = min(top_n, n_resumes)
+    if top_n == 0:
+        return {name: [] for name in jd_names}
+
+    # argpartition over every row at once, then sort only the top_n columns per JD
+    top = np.argpartition(-matrix, top_n - 1, axis=1)[:, :top_n] if top_n < n_resumes \
+        else np.tile(np.arange(n_resumes), (len(jd_names), 1))
+    top_scores = np.take_along_axis(matrix, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1).astype(np.float64)
+
+    shortlists = {}
+    for name, columns, scores in zip(jd_names, top, top_scores):
+        rows = []
+        for rank, (column, score) in enumerate(zip(columns, scores), start=1):
+            score_percent = round(float(score) * 100, 2)
+            rows.append({
+                "file": resume_names[column],
+                "score": score_percent,
+                "rank": rank,
+                "shortlisted": "✅" if score_percent >= threshold * 100 else "❌",
+            })
+        shortlists[name] = rows
+    return shortlists
+
+
+def screen_many(jd_dir=JD_DIR, resume_dir="data/resumes", threshold=THRESHOLD, top_n=SHORTLIST_TOP_N):
+    job_descriptions = load_job_descriptions(jd_dir)
+    if not job_descriptions:
+        raise FileNotFoundError(f"No job descriptions (*.txt) found in {jd_dir}")
+
+    jd_names = list(job_descriptions)
+    jd_embeddings = get_embeddings(list(job_descriptions.values()))
+    jd_skills = get_skill_matcher().text_matrix(list(job_descriptions.values())) if SKILL_WEIGHT else None
+    resume_paths, matrix = score_resume_stream(
+        jd_embeddings, extract_stage(discover_resumes(resume_dir)), jd_skills=jd_skills
+    )
+    resume_names = [path.name for path in resume_paths]
+    with timed("rank"):
+        shortlists = shortlists_from_matrix(matrix, jd_names, resume_names, threshold, top_n)
+
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    chart = render_in_background(render_per_jd, OUTPUT_DIR / "multi_jd_distributions.png", matrix * 100, jd_names, threshold)
+    np.savez_compressed(
+        OUTPUT_DIR / "multi_jd_similarity_matrix.npz",
+        matrix=matrix, jds=np.array(jd_names), resumes=np.array(resume_names),
+    )
+    with open(OUTPUT_DIR / "multi_jd_shortlists.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["jd", "rank", "file", "score", "shortlisted"])
+        writer.writeheader()
+        for name, rows in shortlists.items():
+            writer.writerows({"jd": name, **row} for row in rows)
+
+    chart.result()
+    return shortlists
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Screen a resume pool against many job descriptions.")
+    parser.add_argument("--jd-dir", default=JD_DIR, help="folder of job descriptions (*.txt)")
+    parser.add_argument("--resume-dir", default="data/resumes", help="folder of resumes (*.pdf)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="match threshold (0-1)")
+    parser.add_argument("--top-n", type=int, default=SHORTLIST_TOP_N, help="shortlist size per JD")
+    args = parser.parse_args()
+
+    with run_metrics("multi_screen"):
+        shortlists = screen_many(args.jd_dir, args.resume_dir, args.threshold, args.top_n)
+    for name, rows in shortlists.items():
+        matched = sum(row["shortlisted"] == "✅" for row in rows)
+        print(f"\n{name}: {matched}/{len(rows)} of the top {len(rows)} above threshold")
+        for row in rows[:5]:
+            print(f"  {row['rank']:3}. {row['file']:25} — Score: {row['score']}%")
+
+    print("\nShortlists saved to 'output/multi_jd_shortlists.csv'")
+    print("Similarity matrix saved to 'output/multi_jd_similarity_matrix.npz'")
+    print("Per-JD score distributions saved to 'output/multi_jd_distributions.png'")
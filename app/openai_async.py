@@ -0,0 +1,193 @@
+import asyncio
+import random
+import threading
+import time
+
+from config import (
+    OPENAI_API_KEY, OPENAI_BASE_URL, OPENAI_MODEL_NAME, OPENAI_EMBEDDING_MODEL, OPENAI_MAX_CONCURRENCY, OPENAI_REQUESTS_PER_MINUTE,
+    OPENAI_TOKENS_PER_MINUTE, OPENAI_INPUTS_PER_REQUEST, OPENAI_MAX_RETRIES,
+)
+
+# Status codes and exception names worth retrying (the openai package is optional,
+# so errors are matched by attribute/name rather than by importing its classes)
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = {"APIConnectionError", "APITimeoutError", "RateLimitError", "InternalServerError"}
+
+
+def _is_retryable(error):
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS or type(error).__name__ in RETRYABLE_ERRORS
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // 4)  # ~4 characters per token for English text
+
+
+class TokenBucket:
+    """Async token bucket: `rate_per_minute` tokens refill continuously up to `capacity`."""
+
+    def __init__(self, rate_per_minute, capacity=None, clock=time.monotonic):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount=1):
+        amount = min(amount, self.capacity)  # an oversized request waits for a full bucket
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class AsyncOpenAIProvider:
+    """Batched, concurrent OpenAI embeddings and skill extraction.
+
+    Duplicate inputs are sent once, up to `inputs_per_request` texts are packed into each
+    embeddings request, at most `max_concurrency` requests run at a time, request and token
+    budgets are enforced with token buckets, and retryable failures back off exponentially.
+    `client` is any object shaped like openai.AsyncOpenAI (tests pass a stub).
+    """
+
+    def __init__(self, client=None, embedding_model=OPENAI_EMBEDDING_MODEL, chat_model=OPENAI_MODEL_NAME,
+                 max_concurrency=OPENAI_MAX_CONCURRENCY, requests_per_minute=OPENAI_REQUESTS_PER_MINUTE,
+                 tokens_per_minute=OPENAI_TOKENS_PER_MINUTE, inputs_per_request=OPENAI_INPUTS_PER_REQUEST,
+                 max_retries=OPENAI_MAX_RETRIES, backoff_base=0.5):
+        if client is None:
+            from openai import AsyncOpenAI
+
+            client = AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
+        self.client = client
+        self.embedding_model = embedding_model
+        self.chat_model = chat_model
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.inputs_per_request = inputs_per_request
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self._limits = None
+        self._inflight = {}  # text -> future of its embedding
+        self._tasks = set()  # strong refs to running batch tasks
+
+    def _get_limits(self):
+        # Created lazily so the asyncio primitives belong to the loop that uses them
+        if self._limits is None:
+            self._limits = (
+                asyncio.Semaphore(self.max_concurrency),
+                TokenBucket(self.requests_per_minute),
+                TokenBucket(self.tokens_per_minute),
+            )
+        return self._limits
+
+    async def _request(self, call, tokens):
+        semaphore, request_bucket, token_bucket = self._get_limits()
+        for attempt in range(self.max_retries + 1):
+            await request_bucket.acquire(1)
+            await token_bucket.acquire(tokens)
+            try:
+                async with semaphore:
+                    return await call()
+            except Exception as e:
+                if attempt == self.max_retries or not _is_retryable(e):
+                    raise
+                # Exponential backoff with jitter so parallel retries don't stampede
+                await asyncio.sleep(self.backoff_base * (2 ** attempt) * (0.5 + random.random()))
+
+    async def _embed_batch(self, batch):
+        async def call():
+            return await self.client.embeddings.create(model=self.embedding_model, input=batch)
+
+        response = await self._request(call, sum(estimate_tokens(text) for text in batch))
+        # "index" is relative to this request; the API doesn't guarantee order
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+    async def embed(self, texts):
+        """Return one embedding (list of floats) per text, in input order.
+
+        Texts already being embedded by a concurrent call are awaited, not re-requested.
+        """
+        loop = asyncio.get_running_loop()
+        unique = list(dict.fromkeys(texts))
+        new = [text for text in unique if text not in self._inflight]
+        for text in new:
+            self._inflight[text] = loop.create_future()
+        futures = {text: self._inflight[text] for text in unique}
+
+        async def run_batch(batch):
+            try:
+                result = await self._embed_batch(batch)
+            except Exception as e:
+                for text in batch:
+                    self._inflight.pop(text).set_exception(e)
+            else:
+                for text, vector in zip(batch, result):
+                    self._inflight.pop(text).set_result(vector)
+
+        for start in range(0, len(new), self.inputs_per_request):
+            task = asyncio.ensure_future(run_batch(new[start:start + self.inputs_per_request]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        vectors = dict(zip(futures, await asyncio.gather(*futures.values())))
+        return [vectors[text] for text in texts]
+
+    async def _extract_skills(self, text, prompt):
+        async def call():
+            return await self.client.chat.completions.create(
+                model=self.chat_model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.2,
+                max_tokens=250,
+            )
+
+        response = await self._request(call, estimate_tokens(prompt) + 250)
+        return response.choices[0].message.content.strip()
+
+    async def extract_skills(self, texts, build_prompt):
+        """Run one chat completion per distinct text concurrently; returns skills in input order."""
+        unique = list(dict.fromkeys(texts))
+        results = await asyncio.gather(*(self._extract_skills(text, build_prompt(text)) for text in unique))
+        skills = dict(zip(unique, results))
+        return [skills[text] for text in texts]
+
+
+class _LoopThread:
+    """One long-lived event loop in a daemon thread, so sync callers can share a provider
+    (and its HTTP connection pool and rate limits) across calls."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True, name="openai-async").start()
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+
+_provider = None
+_loop_thread = None
+_lock = threading.Lock()
+
+
+def get_provider():
+    global _provider, _loop_thread
+    if _provider is None:
+        with _lock:
+            if _provider is None:
+                _loop_thread = _LoopThread()
+                _provider = AsyncOpenAIProvider()
+    return _provider
+
+
+def run_sync(coro):
+    """Run a provider coroutine from synchronous code."""
+    get_provider()
+    return _loop_thread.run(coro)
@@ -1,52 +1,335 @@
+import os
 import re
-import spacy
+import threading
 import fitz  # PyMuPDF
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
-from time import time
+from time import time, monotonic, perf_counter
 from pprint import pprint
 
-from app.models import extract_skills_with_model  # Now model-driven skill extraction
+from config import PDF_EXTRACT_WORKERS, PDF_EXTRACT_TIMEOUT
+from config import TEXT_CACHE_ENABLED, TEXT_CACHE_PATH, TEXT_CACHE_HASH_CONTENT
+from config import NAME_HEADER_CHARS, NER_BATCH_SIZE, NER_PROCESSES
+from app.models import extract_skills_with_model, extract_skills_many  # Now model-driven skill extraction
+from app.text_cache import TextCache
+from app.instrumentation import timed, observe, count
 
-nlp = spacy.load("en_core_web_sm")
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_RE = re.compile(r'\+?\d[\d\-\s]{8,}\d')
 
-def extract_text_from_pdf(file_path):
-    text = ""
+# Only NER is used; the tagger/parser/lemmatizer would just burn time on every resume
+NER_EXCLUDED_COMPONENTS = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    """Load the (NER-only) spaCy pipeline once, on first use (importing spacy alone takes seconds)."""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+
+                _nlp = spacy.load("en_core_web_sm", exclude=NER_EXCLUDED_COMPONENTS)
+    return _nlp
+
+def unload_nlp():
+    """Drop the loaded spaCy pipeline; the next get_nlp() loads it again."""
+    global _nlp
+    with _nlp_lock:
+        _nlp = None
+
+_text_cache = None
+
+def _get_text_cache():
+    global _text_cache
+    if _text_cache is None and TEXT_CACHE_ENABLED:
+        _text_cache = TextCache(TEXT_CACHE_PATH, hash_content=TEXT_CACHE_HASH_CONTENT)
+    return _text_cache
+
+def _read_pdf(file_path):
     with fitz.open(file_path) as doc:
-        for page in doc:
-            text += page.get_text()
+        return "".join(page.get_text() for page in doc)
+
+def _read_pdf_timed(file_path):
+    # Runs in a worker process, so the extraction time travels back with the text
+    start = perf_counter()
+    text = _read_pdf(file_path)
+    return text, perf_counter() - start
+
+def _cached_text(file_path):
+    # (fingerprint, text) - text is None on a cache miss; fingerprint is None without a cache
+    cache = _get_text_cache()
+    if cache is None:
+        return None, None
+    return cache.lookup(file_path)
+
+def extract_text_from_pdf(file_path, use_cache=True):
+    fingerprint, text = _cached_text(file_path) if use_cache else (None, None)
+    if text is not None:
+        count("pdf_text_cache_hits")
+        return text
+    with timed("pdf_extract"):
+        text = _read_pdf(file_path)
+    if fingerprint is not None:
+        _text_cache.store(fingerprint, text)
     return text
 
+def _kill_pool(executor):
+    # A PDF stuck inside MuPDF cannot be cancelled; the only way out is to stop its worker
+    for process in list(getattr(executor, "_processes", {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+def extract_texts_parallel(file_paths, max_workers=PDF_EXTRACT_WORKERS, timeout=PDF_EXTRACT_TIMEOUT, use_cache=True):
+    """Extract PDFs on a process pool, yielding (path, text) in completion order.
+
+    At most max_workers files are in flight, so memory stays bounded however many paths
+    are given. Files already in the text cache are yielded without touching the pool
+    (use_cache=False always re-reads, e.g. for benchmarks).
+    Corrupt files and files exceeding the per-file timeout yield text=None.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    paths = iter(file_paths)
+
+    if max_workers == 1:
+        for path in paths:
+            try:
+                yield path, extract_text_from_pdf(path, use_cache)
+            except Exception as e:
+                print(f"⚠️ Could not read {Path(path).name}: {e}")
+                count("pdf_failed")
+                yield path, None
+        return
+
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    pending = {}  # future -> (path, fingerprint, deadline)
+    retry = []  # innocent bystanders of a pool restart, as (path, fingerprint)
+    retried = set()
+
+    try:
+        while True:
+            while len(pending) < max_workers:
+                if retry:
+                    path, fingerprint = retry.pop()
+                else:
+                    path = next(paths, None)
+                    if path is None:
+                        break
+                    try:
+                        fingerprint, text = _cached_text(path) if use_cache else (None, None)
+                    except OSError as e:
+                        print(f"⚠️ Could not read {Path(path).name}: {e}")
+                        count("pdf_failed")
+                        yield path, None
+                        continue
+                    if text is not None:
+                        count("pdf_text_cache_hits")
+                        yield path, text
+                        continue
+                future = executor.submit(_read_pdf_timed, path)
+                pending[future] = (path, fingerprint, monotonic() + timeout)
+            if not pending:
+                return
+
+            next_deadline = min(deadline for _, _, deadline in pending.values())
+            done, _ = wait(pending, timeout=max(0, next_deadline - monotonic()), return_when=FIRST_COMPLETED)
+
+            broken = False
+            for future in done:
+                path, fingerprint, _ = pending.pop(future)
+                try:
+                    text, elapsed = future.result()
+                except Exception as e:
+                    if type(e).__name__ == "BrokenProcessPool" and path not in retried:
+                        # A worker crashed; we can't tell which file did it, so retry each once
+                        retried.add(path)
+                        retry.append((path, fingerprint))
+                        broken = True
+                    else:
+                        print(f"⚠️ Could not read {Path(path).name}: {e}")
+                        count("pdf_failed")
+                        yield path, None
+                    continue
+                observe("pdf_extract", elapsed)
+                if fingerprint is not None:
+                    _text_cache.store(fingerprint, text)
+                yield path, text
+
+            now = monotonic()
+            expired = [future for future, (_, _, deadline) in pending.items() if deadline <= now and not future.done()]
+            for future in expired:
+                path, _, _ = pending.pop(future)
+                print(f"⚠️ Timed out after {timeout}s reading {Path(path).name}, skipping")
+                count("pdf_timeouts")
+                yield path, None
+
+            if expired or broken:
+                # Restart the pool and resubmit whatever was still in flight
+                count("pdf_pool_restarts")
+                retry.extend((path, fingerprint) for path, fingerprint, _ in pending.values())
+                pending.clear()
+                _kill_pool(executor)
+                executor = ProcessPoolExecutor(max_workers=max_workers)
+    finally:
+        _kill_pool(executor)
+
 def extract_email(text):
-    email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    email_match = EMAIL_RE.search(text)
     return email_match.group(0) if email_match else None
 
 def extract_phone(text):
-    phone_match = re.search(r'\+?\d[\d\-\s]{8,}\d', text)
+    phone_match = PHONE_RE.search(text)
     return phone_match.group(0) if phone_match else None
 
-def extract_name(text):
-    doc = nlp(text)
+def _header(text, max_chars=NAME_HEADER_CHARS):
+    # Cut at a line break so a name is never split in half
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind("\n", 0, max_chars)
+    return text[:cut if cut > 0 else max_chars]
+
+def _first_person(doc):
     for ent in doc.ents:
         if ent.label_ == "PERSON":
             return ent.text
     return None
 
-def parse_resume(file_path):
-    raw_text = extract_text_from_pdf(file_path)
+@timed("ner")
+def extract_name(text):
+    return _first_person(get_nlp()(_header(text)))
+
+@timed("ner_batch")
+def extract_names(texts, n_process=NER_PROCESSES, batch_size=NER_BATCH_SIZE):
+    """extract_name for many resumes at once through nlp.pipe."""
+    docs = get_nlp().pipe((_header(text) for text in texts), n_process=n_process, batch_size=batch_size)
+    return [_first_person(doc) for doc in docs]
+
+RESUME_FIELDS = ("name", "email", "phone", "skills")
+PREVIEW_CHARS = 1000
+
+_EXTRACTORS = {
+    "name": extract_name,
+    "email": extract_email,
+    "phone": extract_phone,
+    "skills": extract_skills_with_model,
+}
+
+class ParsedResume:
+    """A resume's text plus its extracted fields, each computed on first access and memoized.
+
+    Reads like the dict parse_resume used to return (parsed["name"], "skills" in parsed),
+    but raw_text is now the full text; the first PREVIEW_CHARS are in preview.
+    """
+
+    __slots__ = ("path", "raw_text", "name", "email", "phone", "skills")
+
+    def __init__(self, path, raw_text, **fields):
+        self.path = path
+        self.raw_text = raw_text
+        for field, value in fields.items():
+            setattr(self, field, value)
+
+    def __getattr__(self, field):
+        # Only called for a field slot that has not been filled yet
+        if field not in _EXTRACTORS:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {field!r}")
+        value = _EXTRACTORS[field](self.raw_text)
+        setattr(self, field, value)
+        return value
+
+    def __getstate__(self):
+        # Only what has been computed; pickling must not trigger extraction
+        return {slot: object.__getattribute__(self, slot) for slot in self.__slots__ if _is_computed(self, slot)}
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    @property
+    def preview(self):
+        return self.raw_text[:PREVIEW_CHARS]
+
+    def keys(self):
+        return RESUME_FIELDS + ("raw_text", "preview")
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __getitem__(self, key):
+        if key not in self.keys():
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self.keys() else default
+
+    def to_dict(self, fields=RESUME_FIELDS):
+        return {field: getattr(self, field) for field in fields}
+
+    def __repr__(self):
+        done = ", ".join(f"{f}={getattr(self, f)!r}" for f in RESUME_FIELDS if _is_computed(self, f))
+        return f"ParsedResume({Path(self.path).name if self.path else None!r}{', ' + done if done else ''})"
+
+def _is_computed(resume, field):
+    try:
+        object.__getattribute__(resume, field)
+        return True
+    except AttributeError:
+        return False
+
+def _check_fields(fields):
+    fields = RESUME_FIELDS if fields is None else tuple(fields)
+    unknown = set(fields) - set(RESUME_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown resume fields {sorted(unknown)} (choose from {RESUME_FIELDS})")
+    return fields
+
+@timed("parse_resume")
+def parse_resume(file_path, fields=None):
+    """Extract a resume's text and the requested fields (None = all of them).
+
+    Fields not requested are still available, extracted on first access; asking only
+    for what the caller needs skips spaCy and, in OpenAI mode, the paid skills call.
+    """
+    fields = _check_fields(fields)
+    resume = ParsedResume(file_path, extract_text_from_pdf(file_path))
+    for field in fields:
+        getattr(resume, field)
+    return resume
+
+@timed("parse_resumes")
+def parse_resumes(file_paths, fields=None, n_process=NER_PROCESSES):
+    """parse_resume for many files: parallel extraction, batched NER and batched skill calls.
+
+    Returns [(path, ParsedResume)] for every readable file, in input order.
+    """
+    fields = _check_fields(fields)
+    file_paths = list(file_paths)
+    extracted = dict(extract_texts_parallel(file_paths))
+    readable = [path for path in file_paths if extracted.get(path) is not None]
+    resumes = [ParsedResume(path, extracted[path]) for path in readable]
 
-    parsed_data = {
-        "name": extract_name(raw_text),
-        "email": extract_email(raw_text),
-        "phone": extract_phone(raw_text),
-        "skills": extract_skills_with_model(raw_text),
-        "raw_text": raw_text[:1000]  # Optional preview
-    }
-    return parsed_data
+    texts = [resume.raw_text for resume in resumes]
+    batched = {}
+    if "name" in fields:
+        batched["name"] = extract_names(texts, n_process=n_process)
+    if "skills" in fields:
+        batched["skills"] = extract_skills_many(texts)
+    for field, values in batched.items():
+        for resume, value in zip(resumes, values):
+            setattr(resume, field, value)
+    for field in fields:
+        if field not in batched:
+            for resume in resumes:
+                getattr(resume, field)
+    return list(zip(readable, resumes))
 
 # Local test
 if __name__ == "__main__":
     test_file = Path("data/resumes/sample_resume.pdf")
-    pprint(parse_resume(test_file), sort_dicts=False)
+    pprint(parse_resume(test_file).to_dict(RESUME_FIELDS + ("preview",)), sort_dicts=False)
     start = time()
     result = parse_resume(test_file)
     end = time()
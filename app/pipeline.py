@@ -0,0 +1,168 @@
+import csv
+import hashlib
+import heapq
+import json
+from itertools import islice
+from pathlib import Path
+
+from config import SCREENING_BATCH_SIZE, SHORTLIST_TOP_N, SKILL_WEIGHT
+from app.models import get_embedding, embed_documents, cos_sim
+from app.parser import extract_texts_parallel
+from app.skills import get_skill_matcher, skill_overlap, blend_scores
+from app.instrumentation import timed, count
+
+# Screening as a chain of generators: discover -> extract -> embed -> score -> write.
+# Only one embedding batch and the top-N heap are held in memory at any time, and every
+# scored row is appended to the JSONL checkpoint before the next batch starts.
+
+CSV_FIELDS = ["file", "score", "shortlisted"]
+
+
+def discover_resumes(resume_dir, skip=()):
+    for path in Path(resume_dir).glob("*.pdf"):
+        if path.name not in skip:
+            yield path
+
+
+def extract_stage(paths):
+    for path, text in extract_texts_parallel(paths):
+        if text is not None:
+            yield path, text
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def embed_stage(documents, batch_size=SCREENING_BATCH_SIZE):
+    """Yield (paths, texts, embeddings) per encoder batch; embeddings is [len(paths), hidden_dim]."""
+    for batch in batched(documents, batch_size):
+        texts = [text for _, text in batch]
+        with timed("embed_batch"):
+            embeddings = embed_documents(texts)
+        yield [path for path, _ in batch], texts, embeddings
+
+
+def score_stage(embedded_batches, jd_embedding, threshold, jd_skills=None, skill_weight=SKILL_WEIGHT):
+    """Rows per batch; with jd_skills (a 0/1 skill row) and skill_weight > 0, scores blend in skill coverage."""
+    for paths, texts, embeddings in embedded_batches:
+        with timed("score_batch"):
+            scores = cos_sim(jd_embedding, embeddings)[0].cpu().numpy()
+            if jd_skills is not None and skill_weight:
+                overlap = skill_overlap(jd_skills, get_skill_matcher().text_matrix(texts))[0]
+                scores = blend_scores(scores, overlap, skill_weight)
+            scores = scores.tolist()
+            rows = []
+            for path, score in zip(paths, scores):
+                score_percent = round(score * 100, 2)
+                rows.append({
+                    "file": path.name,
+                    "score": score_percent,
+                    "shortlisted": "✅" if score_percent >= threshold * 100 else "❌",
+                })
+        count("resumes_scored", len(rows))
+        yield rows
+
+
+class TopN:
+    """Bounded min-heap keeping the n best rows seen so far."""
+
+    def __init__(self, n):
+        self.n = n
+        self._heap = []
+        self._counter = 0  # tie-breaker so rows themselves are never compared
+
+    def push(self, row):
+        self._counter += 1
+        item = (row["score"], -self._counter, row)
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, item)
+        elif item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
+
+    def rows(self):
+        return [row for _, _, row in sorted(self._heap, reverse=True)]
+
+
+def _run_key(jd_text, threshold):
+    # A checkpoint is only reused for the same JD and threshold, and the same scoring setup
+    # (provider, model, backend, chunking, skill weight) as the results store keys scores by
+    from app.results_store import model_key
+
+    digest = hashlib.sha256(jd_text.encode("utf-8")).hexdigest()
+    return {"jd_sha256": digest, "threshold": threshold, "model": model_key()}
+
+
+def _load_checkpoint(checkpoint_path, run_key):
+    """Yield rows from a previous run's JSONL if it belongs to the same run, else nothing."""
+    if not checkpoint_path.exists():
+        return
+    with open(checkpoint_path, encoding="utf-8") as f:
+        header = f.readline()
+        if not header or json.loads(header).get("run") != run_key:
+            return
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                break  # torn final line from a crash; that resume is simply redone
+
+
+def run_screening(jd_text, resume_dir, csv_path, jsonl_path, threshold,
+                  top_n=SHORTLIST_TOP_N, batch_size=SCREENING_BATCH_SIZE, resume=False, on_row=None,
+                  on_cached=None):
+    """Screen every resume in resume_dir against jd_text, streaming rows to CSV and JSONL.
+
+    With resume=True, resumes already recorded in jsonl_path (for the same JD) are
+    skipped, so an interrupted run continues where it stopped. on_row is called for each
+    newly scored row, on_cached once with the number of rows taken from the checkpoint.
+    Returns the top_n rows.
+    """
+    csv_path, jsonl_path = Path(csv_path), Path(jsonl_path)
+    run_key = _run_key(jd_text, threshold)
+    shortlist = TopN(top_n)
+    done = set()
+
+    # The previous JSONL is moved aside and streamed back into fresh CSV/JSONL files, so
+    # both outputs always agree and a torn last line is dropped. If we crash while
+    # copying, the ".prev" file is still there and is used again on the next resume.
+    checkpoint_path = jsonl_path.with_name(jsonl_path.name + ".prev")
+    if resume and jsonl_path.exists() and not checkpoint_path.exists():
+        jsonl_path.replace(checkpoint_path)
+    elif not resume:
+        checkpoint_path.unlink(missing_ok=True)
+
+    with open(csv_path, "w", newline="", encoding="utf-8") as csv_file, \
+            open(jsonl_path, "w", encoding="utf-8") as jsonl_file:
+        writer = csv.DictWriter(csv_file, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        jsonl_file.write(json.dumps({"run": run_key}) + "\n")
+        for row in _load_checkpoint(checkpoint_path, run_key):
+            writer.writerow(row)
+            jsonl_file.write(json.dumps(row, ensure_ascii=False) + "\n")
+            shortlist.push(row)
+            done.add(row["file"])
+        count("resumes_resumed", len(done))
+        if on_cached:
+            on_cached(len(done))
+        jsonl_file.flush()
+        checkpoint_path.unlink(missing_ok=True)
+
+        jd_embedding = get_embedding(jd_text)
+        jd_skills = get_skill_matcher().text_matrix([jd_text]) if SKILL_WEIGHT else None
+        documents = extract_stage(discover_resumes(resume_dir, skip=done))
+        for rows in score_stage(embed_stage(documents, batch_size), jd_embedding, threshold, jd_skills):
+            with timed("write_batch"):
+                for row in rows:
+                    writer.writerow(row)
+                    jsonl_file.write(json.dumps(row, ensure_ascii=False) + "\n")
+                    shortlist.push(row)
+                    if on_row:
+                        on_row(row)
+                # Checkpoint: everything up to this batch is on disk before the next one starts
+                csv_file.flush()
+                jsonl_file.flush()
+
+    return shortlist.rows()
@@ -0,0 +1,135 @@
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from config import SHORTLIST_TOP_N
+
+# Charts whose size and rendering cost do not grow with the resume pool: the top-N
+# resumes as bars, all scores as a fixed-bin histogram + CDF, and per-JD score
+# distributions as one box per JD. Figures use the object-oriented matplotlib API
+# (no pyplot global state), so they can be rendered on a background thread while the
+# caller carries on, or built on request by the UI.
+
+HISTOGRAM_BINS = 50
+MAX_JDS_PER_CHART = 40  # the per-JD chart shows at most this many JDs
+BAR_COLOR = "skyblue"
+
+_executor = None
+_lock = threading.Lock()
+
+
+def _figure(width, height):
+    from matplotlib.figure import Figure
+
+    return Figure(figsize=(width, height))
+
+
+def _top_rows(rows, top_n):
+    rows = list(rows)
+    if len(rows) > top_n:
+        rows = heapq.nlargest(top_n, rows, key=lambda row: row["score"])
+    return sorted(rows, key=lambda row: row["score"], reverse=True)
+
+
+def top_n_figure(rows, title="Top Scores vs JD", top_n=SHORTLIST_TOP_N):
+    """Horizontal bars for the best top_n rows ({"file", "score"} dicts, score in %)."""
+    rows = _top_rows(rows, top_n)
+    fig = _figure(12, max(len(rows), 1) * 0.4 + 1)
+    ax = fig.add_subplot()
+    ax.barh([row["file"] for row in rows], [row["score"] for row in rows], color=BAR_COLOR)
+    ax.set_xlabel("Match Score (%)")
+    ax.set_title(f"{title} (top {len(rows)})")
+    ax.invert_yaxis()
+    fig.tight_layout()
+    return fig
+
+
+def distribution_figure(scores, threshold=None, title="Score Distribution", bins=HISTOGRAM_BINS):
+    """Histogram and CDF of all scores (in %); cost is O(n) binning plus a fixed-size plot."""
+    scores = np.asarray(scores, dtype=np.float64).ravel()
+    fig = _figure(12, 5)
+    hist_ax, cdf_ax = fig.subplots(1, 2)
+    if scores.size:
+        counts, edges = np.histogram(scores, bins=bins)
+        hist_ax.stairs(counts, edges, fill=True, color=BAR_COLOR)
+        cdf_ax.plot(edges[1:], np.cumsum(counts) / scores.size, color="steelblue")
+    for ax in (hist_ax, cdf_ax):
+        ax.set_xlabel("Match Score (%)")
+        if threshold is not None:
+            ax.axvline(threshold * 100, color="red", linestyle="--", label=f"Threshold ({threshold * 100:.0f}%)")
+            ax.legend()
+    hist_ax.set_ylabel("Resumes")
+    hist_ax.set_title(f"{title} ({scores.size} resumes)")
+    cdf_ax.set_ylabel("Share of resumes at or below score")
+    cdf_ax.set_title("Cumulative distribution")
+    fig.tight_layout()
+    return fig
+
+
+def per_jd_figure(matrix, jd_names, threshold=None, title="Score Distribution per JD"):
+    """One box (5/25/50/75/95th percentiles) per JD row of a [n_jds, n_resumes] matrix of scores in %."""
+    jd_names = list(jd_names)[:MAX_JDS_PER_CHART]
+    matrix = np.asarray(matrix, dtype=np.float64)[:MAX_JDS_PER_CHART]
+
+    stats = []
+    for name, row in zip(jd_names, matrix):
+        if not row.size:
+            continue
+        p5, q1, median, q3, p95 = np.percentile(row, [5, 25, 50, 75, 95])
+        stats.append({"label": name, "whislo": p5, "q1": q1, "med": median, "q3": q3, "whishi": p95, "fliers": []})
+
+    fig = _figure(12, max(len(stats), 1) * 0.5 + 1.5)
+    ax = fig.add_subplot()
+    if stats:
+        ax.bxp(stats, vert=False, showfliers=False, patch_artist=True, boxprops={"facecolor": BAR_COLOR})
+    if threshold is not None:
+        ax.axvline(threshold * 100, color="red", linestyle="--", label=f"Threshold ({threshold * 100:.0f}%)")
+        ax.legend()
+    ax.set_xlabel("Match Score (%)")
+    ax.set_title(title)
+    ax.invert_yaxis()
+    fig.tight_layout()
+    return fig
+
+
+def scores_from_csv(csv_path, column="score"):
+    """Only the score column of a results CSV, as a float array."""
+    import pandas as pd
+
+    return pd.read_csv(csv_path, usecols=[column])[column].to_numpy(dtype=np.float64)
+
+
+def save_figure(fig, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(path)
+    return path
+
+
+def render_top_n(path, rows, title="Top Scores vs JD", top_n=SHORTLIST_TOP_N):
+    return save_figure(top_n_figure(rows, title, top_n), path)
+
+
+def render_distribution(path, scores, threshold=None, title="Score Distribution"):
+    return save_figure(distribution_figure(scores, threshold, title), path)
+
+
+def render_per_jd(path, matrix, jd_names, threshold=None, title="Score Distribution per JD"):
+    return save_figure(per_jd_figure(matrix, jd_names, threshold, title), path)
+
+
+def render_in_background(render, *args, **kwargs):
+    """Queue a render_* call on the chart thread; returns a Future of the saved path.
+
+    One thread renders charts one at a time (bounded memory); pending charts still
+    finish if the caller never waits, as the interpreter joins the thread at exit.
+    """
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="charts")
+    return _executor.submit(render, *args, **kwargs)
@@ -0,0 +1,246 @@
+import csv
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from config import (
+    MODEL_PROVIDER, OPENAI_EMBEDDING_MODEL, SKILL_WEIGHT, EMBEDDING_CHUNKING, CHUNK_POOLING,
+    RESULTS_STORE_PATH, RESULTS_WATCH_INTERVAL, SCREENING_BATCH_SIZE, SHORTLIST_TOP_N,
+)
+from app.pipeline import CSV_FIELDS, TopN, batched, extract_stage
+from app.instrumentation import timed, count
+
+# Incremental screening: scores are kept per (resume, JD, model) in one SQLite file,
+# next to a manifest of every resume's (size, mtime_ns). A run only stats the folder,
+# invalidates the scores of changed/deleted files, and embeds the resumes that have no
+# score yet for this JD and model; everything else is read back from the store. The
+# store is also the checkpoint: each batch is committed before the next one starts.
+
+MANIFEST_STABLE_POLLS = 2  # watch mode: a file must look the same on this many polls
+
+
+def model_key():
+    """Everything that changes a score besides the resume and JD texts."""
+    if MODEL_PROVIDER == "local":
+        from app.models import _local_model_key
+
+        key = f"local:{_local_model_key()}"
+    else:
+        key = f"{MODEL_PROVIDER}:{OPENAI_EMBEDDING_MODEL}"
+    if EMBEDDING_CHUNKING:
+        key += f":chunked-{CHUNK_POOLING}"
+    if SKILL_WEIGHT:
+        key += f":skills-{SKILL_WEIGHT}"
+    return key
+
+
+def jd_key(jd_text):
+    return hashlib.sha256(jd_text.encode("utf-8")).hexdigest()
+
+
+def snapshot(resume_dir):
+    """{resolved path: (size, mtime_ns)} for every PDF in resume_dir (one stat per file)."""
+    files = {}
+    for path in Path(resume_dir).resolve().glob("*.pdf"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:  # deleted between listing and stat
+            continue
+        files[str(path)] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+class ResultsStore:
+    """Manifest of screened resumes and their scores per (JD, model), in SQLite.
+
+    A NULL score marks a resume that could not be read; it is retried once the file changes.
+    """
+
+    def __init__(self, db_path=RESULTS_STORE_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS manifest (path TEXT PRIMARY KEY, dir TEXT, size INTEGER, mtime_ns INTEGER)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS manifest_dir ON manifest (dir)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS scores (path TEXT, jd TEXT, model TEXT, score REAL, "
+            "PRIMARY KEY (jd, model, path))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS scores_path ON scores (path)")  # invalidation by file
+        self._db.commit()
+
+    def sync(self, resume_dir, files):
+        """Bring the manifest of resume_dir in line with `files` (from snapshot()).
+
+        Scores of changed and deleted resumes are dropped. Returns {"new", "changed", "deleted"} counts.
+        """
+        resume_dir = str(Path(resume_dir).resolve())
+        with self._lock:
+            known = {path: (size, mtime_ns) for path, size, mtime_ns in self._db.execute(
+                "SELECT path, size, mtime_ns FROM manifest WHERE dir = ?", (resume_dir,)
+            )}
+            new = [path for path in files if path not in known]
+            changed = [path for path in files if path in known and known[path] != files[path]]
+            deleted = [path for path in known if path not in files]
+
+            stale = [(path,) for path in changed + deleted]
+            self._db.executemany("DELETE FROM scores WHERE path = ?", stale)
+            self._db.executemany("DELETE FROM manifest WHERE path = ?", [(path,) for path in deleted])
+            self._db.executemany(
+                "INSERT OR REPLACE INTO manifest (path, dir, size, mtime_ns) VALUES (?, ?, ?, ?)",
+                [(path, resume_dir, *files[path]) for path in new + changed],
+            )
+            self._db.commit()
+        return {"new": len(new), "changed": len(changed), "deleted": len(deleted)}
+
+    def pending(self, resume_dir, jd, model, paths=None):
+        """Manifest entries of resume_dir with no score yet for (jd, model), optionally limited to paths."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT path FROM manifest WHERE dir = ? AND path NOT IN "
+                "(SELECT path FROM scores WHERE jd = ? AND model = ?) ORDER BY path",
+                (str(Path(resume_dir).resolve()), jd, model),
+            ).fetchall()
+        pending = [path for (path,) in rows]
+        if paths is not None:
+            paths = set(paths)
+            pending = [path for path in pending if path in paths]
+        return pending
+
+    def put_many(self, jd, model, scores):
+        """Store [(path, score_percent or None)] for (jd, model) in one transaction."""
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO scores (path, jd, model, score) VALUES (?, ?, ?, ?)",
+                [(path, jd, model, score) for path, score in scores],
+            )
+            self._db.commit()
+
+    def scores(self, resume_dir, jd, model):
+        """Yield (path, score_percent) of resume_dir's current resumes, best first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT s.path, s.score FROM scores s JOIN manifest m ON m.path = s.path "
+                "WHERE m.dir = ? AND s.jd = ? AND s.model = ? AND s.score IS NOT NULL ORDER BY s.score DESC",
+                (str(Path(resume_dir).resolve()), jd, model),
+            ).fetchall()
+        yield from rows
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def _model_scorer(jd_text):
+    # Same scoring as the streaming pipeline (cosine, optionally skill-blended), per batch
+    from app.models import get_embedding, embed_documents
+    from app.pipeline import score_stage
+    from app.skills import get_skill_matcher
+
+    jd_embedding = get_embedding(jd_text)
+    jd_skills = get_skill_matcher().text_matrix([jd_text]) if SKILL_WEIGHT else None
+
+    def score(paths, texts):
+        with timed("embed_batch"):
+            embeddings = embed_documents(texts)
+        rows = next(score_stage([(paths, texts, embeddings)], jd_embedding, 0, jd_skills))
+        return [row["score"] for row in rows]
+
+    return score
+
+
+def update_scores(jd_text, resume_dir, store, threshold=0.30, batch_size=SCREENING_BATCH_SIZE, on_row=None,
+                  paths=None, score=None, on_cached=None):
+    """Score only what is missing for this JD and model; returns the delta counts.
+
+    `score(paths, texts)` returns percent scores (default: the configured model); tests pass a stub.
+    With `paths`, only those resumes are considered for scoring (watch mode). on_row is called
+    for each newly scored row, on_cached once with the number of resumes already in the store.
+    """
+    jd, model = jd_key(jd_text), model_key()
+    with timed("manifest_sync"):
+        files = snapshot(resume_dir)
+        delta = store.sync(resume_dir, files)
+        pending = store.pending(resume_dir, jd, model, paths)
+    unchanged = (len(files) if paths is None else len(set(paths) & files.keys())) - len(pending)
+    count("resumes_unchanged", unchanged)
+    if on_cached:
+        on_cached(unchanged)
+
+    scored = 0
+    if pending:
+        score = score or _model_scorer(jd_text)
+        readable = set()
+        for batch in batched(extract_stage(Path(path) for path in pending), batch_size):
+            batch_paths = [str(path) for path, _ in batch]
+            batch_scores = score([path for path, _ in batch], [text for _, text in batch])
+            store.put_many(jd, model, zip(batch_paths, batch_scores))
+            readable.update(batch_paths)
+            scored += len(batch)
+            count("resumes_scored", len(batch))
+            if on_row:
+                for path, value in zip(batch_paths, batch_scores):
+                    on_row(_row(path, value, threshold))
+        # Unreadable files get a NULL score so they are not retried until they change
+        store.put_many(jd, model, [(path, None) for path in pending if path not in readable])
+    return {**delta, "scored": scored}
+
+
+def _row(path, score, threshold):
+    return {"file": Path(path).name, "score": score, "shortlisted": "✅" if score >= threshold * 100 else "❌"}
+
+
+def export_results(store, jd_text, resume_dir, csv_path, threshold, top_n=SHORTLIST_TOP_N):
+    """Write every stored score of resume_dir to csv_path (best first); returns the top_n rows."""
+    shortlist = TopN(top_n)
+    with timed("results_csv"), open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for path, value in store.scores(resume_dir, jd_key(jd_text), model_key()):
+            row = _row(path, value, threshold)
+            writer.writerow(row)
+            shortlist.push(row)
+    return shortlist.rows()
+
+
+def run_incremental_screening(jd_text, resume_dir, csv_path, jsonl_path=None, threshold=0.30,
+                              top_n=SHORTLIST_TOP_N, batch_size=SCREENING_BATCH_SIZE, resume=False,
+                              on_row=None, store=None, score=None, on_cached=None):
+    """run_screening's contract (CSV of every resume, returns the top_n rows) on top of the store.
+
+    jsonl_path and resume are accepted for compatibility only: the store is the checkpoint,
+    so every run resumes.
+    """
+    store = store or ResultsStore()
+    delta = update_scores(jd_text, resume_dir, store, threshold, batch_size, on_row, score=score, on_cached=on_cached)
+    print(f"🗂️ {delta['new']} new, {delta['changed']} changed, {delta['deleted']} deleted; "
+          f"{delta['scored']} resumes scored")
+    return export_results(store, jd_text, resume_dir, csv_path, threshold, top_n)
+
+
+def watch(jd_text, resume_dir, csv_path, threshold, store=None, interval=RESULTS_WATCH_INTERVAL,
+          on_row=None, stop=None, score=None):
+    """Poll resume_dir and score PDFs as they land, re-exporting the CSV after each change.
+
+    A file is scored once its size and mtime are unchanged for MANIFEST_STABLE_POLLS polls,
+    so half-copied PDFs are left alone. Runs until `stop` (a threading.Event) is set.
+    """
+    store = store or ResultsStore()
+    stop = stop or threading.Event()
+    history = []
+    while not stop.is_set():
+        files = snapshot(resume_dir)
+        history = (history + [files])[-MANIFEST_STABLE_POLLS:]
+        stable = [path for path, stat in files.items() if all(seen.get(path) == stat for seen in history)]
+        if len(history) == MANIFEST_STABLE_POLLS:
+            delta = update_scores(jd_text, resume_dir, store, threshold, on_row=on_row, paths=stable, score=score)
+            if delta["scored"] or delta["deleted"] or delta["changed"]:
+                export_results(store, jd_text, resume_dir, csv_path, threshold)
+                print(f"🗂️ {time.strftime('%H:%M:%S')} {delta['scored']} scored, {delta['deleted']} removed")
+        stop.wait(interval)
@@ -0,0 +1,221 @@
+from pathlib import Path
+import numpy as np
+
+from config import RESUME_INDEX_PATH
+
+
+def _to_numpy(embeddings):
+    # get_embedding(s) return torch tensors; the index works on plain float32 arrays
+    if hasattr(embeddings, "detach"):
+        embeddings = embeddings.detach().cpu().numpy()
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def normalize(vectors):
+    """Scale vectors to unit length along the last axis (zero vectors stay zero)."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _top_k(scores, k):
+    # argpartition is O(n); only the k winners get fully sorted
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class ResumeIndex:
+    """Normalized resume embedding matrix with exact and approximate (IVF) top-k search.
+
+    Exact search is a single matmul plus argpartition. After build_ivf(), searches with
+    n_probe set only score the resumes in the n_probe clusters closest to the query.
+    """
+
+    def __init__(self, dim=None):
+        self.dim = dim
+        self.ids = []
+        self._positions = {}
+        self._matrix = np.empty((0, dim or 0), dtype=np.float32)
+        self.centroids = None
+        self._assignments = np.empty(0, dtype=np.int32)
+        self._lists = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, resume_id):
+        return resume_id in self._positions
+
+    @property
+    def vectors(self):
+        return self._matrix[:len(self.ids)]
+
+    # --- incremental updates ---
+
+    def add(self, ids, embeddings):
+        """Add (or replace) resumes; embeddings is [len(ids), dim]."""
+        ids = list(ids)
+        if not ids:
+            return
+        vectors = normalize(_to_numpy(embeddings).reshape(len(ids), -1))
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            self._matrix = np.empty((0, self.dim), dtype=np.float32)
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dim embeddings, got {vectors.shape[1]}")
+
+        replaced = [resume_id for resume_id in ids if resume_id in self._positions]
+        if replaced:
+            self.remove(replaced)
+
+        size = len(self.ids)
+        needed = size + len(ids)
+        if needed > len(self._matrix):
+            # Grow geometrically so repeated single-resume adds stay amortized O(1)
+            grown = np.empty((max(needed, 2 * len(self._matrix), 64), self.dim), dtype=np.float32)
+            grown[:size] = self._matrix[:size]
+            self._matrix = grown
+
+        self._matrix[size:needed] = vectors
+        for offset, resume_id in enumerate(ids):
+            self._positions[resume_id] = size + offset
+        self.ids.extend(ids)
+
+        if self.centroids is not None:
+            self._assignments = np.concatenate([self._assignments, self._assign(vectors)])
+            self._lists = None
+
+    def remove(self, ids):
+        """Drop resumes from the index; unknown ids are ignored."""
+        rows = sorted({self._positions[resume_id] for resume_id in ids if resume_id in self._positions})
+        if not rows:
+            return
+
+        keep = np.ones(len(self.ids), dtype=bool)
+        keep[rows] = False
+        self._matrix = self.vectors[keep].copy()
+        self.ids = [resume_id for resume_id, kept in zip(self.ids, keep) if kept]
+        self._positions = {resume_id: row for row, resume_id in enumerate(self.ids)}
+        if self.centroids is not None:
+            self._assignments = self._assignments[keep]
+            self._lists = None
+
+    # --- approximate mode ---
+
+    def build_ivf(self, n_lists=None, iterations=10, seed=0):
+        """Cluster the index with spherical k-means so searches can probe a few clusters."""
+        size = len(self.ids)
+        if size == 0:
+            raise ValueError("Cannot build IVF on an empty index")
+
+        n_lists = min(n_lists or max(1, int(np.sqrt(size))), size)
+        rng = np.random.default_rng(seed)
+        centroids = self.vectors[rng.choice(size, n_lists, replace=False)].copy()
+
+        for _ in range(iterations):
+            self.centroids = centroids
+            assignments = self._assign(self.vectors)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, self.vectors)
+            empty = ~sums.any(axis=1)
+            sums[empty] = centroids[empty]  # keep the old centroid for empty clusters
+            centroids = normalize(sums)
+
+        self.centroids = centroids
+        self._assignments = self._assign(self.vectors)
+        self._lists = None
+
+    def _assign(self, vectors, chunk_size=65_536):
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), chunk_size):
+            chunk = vectors[start:start + chunk_size]
+            assignments[start:start + chunk_size] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return assignments
+
+    def _inverted_lists(self):
+        if self._lists is None:
+            order = np.argsort(self._assignments, kind="stable")
+            bounds = np.searchsorted(self._assignments[order], np.arange(len(self.centroids) + 1))
+            self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.centroids))]
+        return self._lists
+
+    # --- search ---
+
+    def search(self, query_embedding, k=10, n_probe=None):
+        """Return [(resume_id, cosine_score), ...] for the k best resumes."""
+        if not self.ids or k <= 0:
+            return []
+        query = normalize(_to_numpy(query_embedding).reshape(-1))
+
+        if n_probe and self.centroids is not None:
+            probe = _top_k(self.centroids @ query, min(n_probe, len(self.centroids)))
+            lists = self._inverted_lists()
+            rows = np.concatenate([lists[i] for i in probe])
+            scores = self.vectors[rows] @ query
+            best = rows[_top_k(scores, min(k, len(rows)))]
+        else:
+            scores = self.vectors @ query
+            best = _top_k(scores, min(k, len(scores)))
+
+        scores = self.vectors[best] @ query
+        return [(self.ids[row], float(score)) for row, score in zip(best, scores)]
+
+    def query(self, jd_text, k=10, n_probe=None):
+        """Embed a job description and return its k best matching resumes."""
+        from app.models import get_embedding
+
+        return self.search(get_embedding(jd_text), k=k, n_probe=n_probe)
+
+    # --- persistence ---
+
+    def save(self, path=RESUME_INDEX_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {"ids": np.array(self.ids, dtype=str), "vectors": self.vectors}
+        if self.centroids is not None:
+            arrays["centroids"] = self.centroids
+            arrays["assignments"] = self._assignments
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path=RESUME_INDEX_PATH):
+        with np.load(path) as data:
+            index = cls(dim=data["vectors"].shape[1] or None)  # an empty index saved before any add
+            index.ids = data["ids"].tolist()
+            index._matrix = data["vectors"].astype(np.float32)
+            index._positions = {resume_id: row for row, resume_id in enumerate(index.ids)}
+            if "centroids" in data:
+                index.centroids = data["centroids"]
+                index._assignments = data["assignments"]
+        return index
+
+
+def build_index(resumes_dir, index=None):
+    """Embed every PDF in resumes_dir that is not indexed yet (ids are file names)."""
+    from app.models import embed_documents
+    from app.parser import extract_texts_parallel
+
+    index = ResumeIndex() if index is None else index  # an empty index is falsy (__len__)
+    new_paths = [path for path in sorted(Path(resumes_dir).glob("*.pdf")) if path.name not in index]
+    if new_paths:
+        extracted = [(path, text) for path, text in extract_texts_parallel(new_paths) if text is not None]
+        index.add([path.name for path, _ in extracted], embed_documents([text for _, text in extracted]))
+    return index
+
+
+if __name__ == "__main__":
+    from time import time
+
+    jd_text = Path("data/job_descriptions/sample_jd.txt").read_text(encoding="utf-8")
+    index = ResumeIndex.load() if Path(RESUME_INDEX_PATH).exists() else None
+    index = build_index("data/resumes", index)
+    index.save()
+
+    start = time()
+    matches = index.query(jd_text, k=10)
+    print(f"Top {len(matches)} of {len(index)} resumes ({round((time() - start) * 1000, 2)} ms):")
+    for resume_id, score in matches:
+        print(f"{resume_id:25} — Score: {round(score * 100, 2)}%")
@@ -1,9 +1,12 @@
-from app.models import get_embedding
-from app.parser import extract_text_from_pdf
-from sentence_transformers import util
+from config import RESULTS_STORE_ENABLED, BM25_PREFILTER_ENABLED
+from app.pipeline import run_screening
+from app.bm25_index import run_hybrid_screening
+from app.results_store import run_incremental_screening, watch
+from app.instrumentation import timed, run_metrics
+from app.reporting import render_in_background, render_top_n, render_distribution, scores_from_csv
 from pathlib import Path
+import argparse
 import pandas as pd
-import matplotlib.pyplot as plt
 
 # Setup
 OUTPUT_DIR = Path("output")
@@ -13,42 +16,63 @@ JD_FILE = "data/job_descriptions/sample_jd.txt"
 RESUME_DIR = Path("data/resumes")
 THRESHOLD = 0.30  # 30% threshold (consistency with evaluation)
 
-def screen_resumes():
-    jd_text = Path(JD_FILE).read_text(encoding="utf-8")
-    jd_embedding = get_embedding(jd_text)
-
-    results = []
+RESULTS_CSV = OUTPUT_DIR / "real_resume_screening_results.csv"
+RESULTS_JSONL = OUTPUT_DIR / "real_resume_screening_results.jsonl"  # doubles as the resume checkpoint
+SHORTLIST_CSV = OUTPUT_DIR / "real_resume_shortlist.csv"
+TOP_N_CHART = OUTPUT_DIR / "real_screening_visualization.png"
+DISTRIBUTION_CHART = OUTPUT_DIR / "real_screening_distribution.png"
 
-    for resume_path in RESUME_DIR.glob("*.pdf"):
-        resume_text = extract_text_from_pdf(resume_path)
-        resume_embedding = get_embedding(resume_text)
+def _print_row(row):
+    print(f"{row['file']:25} — Score: {row['score']}% {'✅' if row['shortlisted'] == '✅' else ''}")
 
-        similarity = util.pytorch_cos_sim(jd_embedding, resume_embedding).item()
-        score_percent = round(similarity * 100, 2)
-
-        results.append({
-            "file": resume_path.name,
-            "score": score_percent,
-            "shortlisted": "✅" if score_percent >= (THRESHOLD * 100) else "❌"
-        })
+def screen_resumes(resume=False, full=not RESULTS_STORE_ENABLED, prefilter=BM25_PREFILTER_ENABLED):
+    jd_text = Path(JD_FILE).read_text(encoding="utf-8")
 
-        print(f"{resume_path.name:25} — Score: {score_percent}% {'✅' if score_percent >= (THRESHOLD * 100) else ''}")
+    if prefilter:
+        # Lexical first stage: only the best BM25 matches are embedded and cosine-scored
+        shortlist = run_hybrid_screening(jd_text, RESUME_DIR, RESULTS_CSV, THRESHOLD, on_row=_print_row)
+    elif full or resume:
+        # Rows are written to CSV/JSONL as they are scored; only the top-N stay in memory
+        shortlist = run_screening(
+            jd_text, RESUME_DIR, RESULTS_CSV, RESULTS_JSONL, THRESHOLD, resume=resume, on_row=_print_row
+        )
+    else:
+        # Only new/changed resumes are scored; the rest come from the results store
+        shortlist = run_incremental_screening(jd_text, RESUME_DIR, RESULTS_CSV, threshold=THRESHOLD, on_row=_print_row)
 
-    # Save results
-    df = pd.DataFrame(results).sort_values("score", ascending=False)
-    df.to_csv(OUTPUT_DIR / "real_resume_screening_results.csv", index=False)
+    # Charts are bounded in size (top-N bars, fixed-bin histogram) and render on the
+    # chart thread while the shortlist is written
+    charts = [
+        render_in_background(render_top_n, TOP_N_CHART, shortlist, "Real Resume Screening – Scores vs JD"),
+        render_in_background(
+            lambda: render_distribution(DISTRIBUTION_CHART, scores_from_csv(RESULTS_CSV), THRESHOLD, "Real Resume Screening")
+        ),
+    ]
 
-    # Visualization
-    plt.figure(figsize=(12, len(df) * 0.4))
-    plt.barh(df["file"], df["score"], color="skyblue")
-    plt.xlabel("Match Score (%)")
-    plt.title("Real Resume Screening – Score vs JD")
-    plt.gca().invert_yaxis()
-    plt.tight_layout()
-    plt.savefig(OUTPUT_DIR / "real_screening_visualization.png")
+    with timed("shortlist_csv"):
+        df = pd.DataFrame(shortlist, columns=["file", "score", "shortlisted"])
+        df.to_csv(SHORTLIST_CSV, index=False)
 
     print("\nResults saved to 'output/real_resume_screening_results.csv'")
-    print("Chart saved to 'output/real_screening_visualization.png'")
+    print("Shortlist saved to 'output/real_resume_shortlist.csv'")
+    with timed("charts_wait"):
+        for chart in charts:
+            print(f"Chart saved to '{chart.result().as_posix()}'")
 
 if __name__ == "__main__":
-    screen_resumes()
+    parser = argparse.ArgumentParser(description="Screen all resumes against the job description.")
+    parser.add_argument("--resume", action="store_true", help="continue an interrupted full run from its checkpoint")
+    parser.add_argument("--full", action="store_true", help="rescore every resume instead of only new/changed ones")
+    parser.add_argument("--watch", action="store_true", help="keep scoring resumes as they land in the folder")
+    parser.add_argument("--prefilter", action="store_true", help="embed only the BM25 top BM25_PREFILTER_K resumes")
+    args = parser.parse_args()
+    if args.watch:
+        print(f"👀 Watching {RESUME_DIR} (Ctrl+C to stop)")
+        try:
+            watch(Path(JD_FILE).read_text(encoding="utf-8"), RESUME_DIR, RESULTS_CSV, THRESHOLD, on_row=_print_row)
+        except KeyboardInterrupt:
+            pass
+    else:
+        with run_metrics("screen_resumes"):
+            screen_resumes(resume=args.resume, full=args.full or not RESULTS_STORE_ENABLED,
+                           prefilter=args.prefilter or BM25_PREFILTER_ENABLED)
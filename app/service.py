@@ -0,0 +1,286 @@
+import argparse
+import json
+import threading
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from time import monotonic
+
+import numpy as np
+
+from config import (
+    SERVICE_HOST, SERVICE_PORT, SERVICE_BATCH_WINDOW_MS, SERVICE_MAX_BATCH, SERVICE_MAX_QUEUE,
+    SERVICE_MAX_BODY_BYTES, RESUME_INDEX_PATH,
+)
+from app.instrumentation import timed, count
+from app.resume_index import ResumeIndex, normalize
+from app.compact_index import CompactResumeIndex
+
+# Local HTTP scoring API: one warm process holds the model and serves many clients.
+#   POST /embed  {"texts": [...]}                          -> {"embeddings": [[...], ...]}
+#   POST /score  {"jd": "...", "resumes": [...]}           -> {"scores": [percent, ...]}
+#   POST /rank   {"jd": "...", "resumes": {id: text} | [...], "k": 10}
+#                {"jd": "...", "k": 10, "n_probe": 4}      -> ranks the loaded resume index
+#                                                             (n_probe: ResumeIndex IVF only)
+#   GET  /health                                           -> {"status": "ok", ...}
+# Concurrent requests are coalesced by a micro-batcher into one encode call; when its
+# queue is full, requests get 503 with Retry-After instead of piling up.
+
+
+class QueueFull(Exception):
+    """The micro-batcher queue is at capacity; the caller should retry later."""
+
+
+def _encode_texts(texts):
+    from app.models import get_embeddings
+
+    return get_embeddings(texts).detach().cpu().numpy().astype(np.float32)
+
+
+class MicroBatcher:
+    """Coalesces concurrent embedding requests into shared encode calls.
+
+    The worker takes the first waiting request, waits up to max_wait_ms for more, then
+    encodes up to max_batch_size texts in one call and hands each caller its slice. At
+    most max_queue texts may wait; submit() raises QueueFull beyond that.
+    """
+
+    def __init__(self, encode=_encode_texts, max_batch_size=SERVICE_MAX_BATCH,
+                 max_wait_ms=SERVICE_BATCH_WINDOW_MS, max_queue=SERVICE_MAX_QUEUE):
+        self._encode = encode
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue = max_queue
+        self._queue = deque()  # (texts, future)
+        self._pending = 0  # texts queued and not yet taken by the worker
+        self._cond = threading.Condition()
+        self._closed = False
+        self.batches = 0
+        self._thread = threading.Thread(target=self._worker, daemon=True, name="micro-batcher")
+        self._thread.start()
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def submit(self, texts):
+        """Queue texts for encoding; returns a Future of their [len(texts), dim] array."""
+        texts = list(texts)
+        future = Future()
+        if not texts:
+            future.set_result(np.empty((0, 0), dtype=np.float32))
+            return future
+        if len(texts) > self.max_queue:
+            raise ValueError(f"{len(texts)} texts in one request (limit {self.max_queue})")
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            if self._pending + len(texts) > self.max_queue:
+                count("service_rejected")
+                raise QueueFull(f"{self._pending} texts already queued (limit {self.max_queue})")
+            self._queue.append((texts, future))
+            self._pending += len(texts)
+            self._cond.notify()
+        return future
+
+    def embed(self, texts, timeout=None):
+        return self.submit(texts).result(timeout)
+
+    def _take_batch(self):
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return None
+            # Give concurrent requests a short window to join this batch
+            deadline = monotonic() + self.max_wait
+            while self._pending < self.max_batch_size and not self._closed:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch, size = [], 0
+            while self._queue and (not batch or size + len(self._queue[0][0]) <= self.max_batch_size):
+                texts, future = self._queue.popleft()
+                batch.append((texts, future))
+                size += len(texts)
+            self._pending -= size
+            return batch
+
+    def _worker(self):
+        while (batch := self._take_batch()) is not None:
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            try:
+                with timed("service_encode"):
+                    vectors = self._encode(texts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            count("service_texts", len(texts))
+            start = 0
+            for request_texts, future in batch:
+                future.set_result(vectors[start:start + len(request_texts)])
+                start += len(request_texts)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+
+def _texts(texts, field):
+    if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+        raise ValueError(f"'{field}' must be a list of strings")
+    return texts
+
+
+def _text(text, field):
+    if not isinstance(text, str):
+        raise ValueError(f"'{field}' must be a string")
+    return text
+
+
+def _percent(score):
+    return round(float(score) * 100, 2)
+
+
+def handle_embed(server, payload):
+    vectors = server.batcher.embed(_texts(payload["texts"], "texts"))
+    return {"embeddings": vectors.tolist(), "dim": int(vectors.shape[1]) if len(vectors) else 0}
+
+
+def handle_score(server, payload):
+    resumes = _texts(payload["resumes"], "resumes")
+    vectors = normalize(server.batcher.embed([_text(payload["jd"], "jd")] + resumes))
+    return {"scores": [_percent(score) for score in vectors[1:] @ vectors[0]]}
+
+
+def handle_rank(server, payload):
+    jd_text = _text(payload["jd"], "jd")
+    k = int(payload.get("k", 10))
+    resumes = payload.get("resumes")
+
+    if resumes is None:
+        if server.index is None:
+            raise ValueError("No resume index loaded; send 'resumes' or start the service with --index")
+        options = {"n_probe": payload["n_probe"]} if payload.get("n_probe") else {}
+        matches = server.index.search(server.batcher.embed([jd_text])[0], k=k, **options)
+    else:
+        if isinstance(resumes, dict):
+            ids, texts = list(resumes), _texts(list(resumes.values()), "resumes")
+        else:
+            texts = _texts(resumes, "resumes")
+            ids = list(range(len(texts)))
+        # JD and resumes share one request, so they land in the same encode batch
+        vectors = server.batcher.embed([jd_text] + texts)
+        index = ResumeIndex()
+        index.add(ids, vectors[1:])
+        matches = index.search(vectors[0], k=k)
+    return {"matches": [{"id": resume_id, "score": _percent(score)} for resume_id, score in matches]}
+
+
+ROUTES = {"/embed": handle_embed, "/score": handle_score, "/rank": handle_rank}
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    server_version = "ResumeScreener/1.0"
+
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            batcher = self.server.batcher
+            self._send(200, {
+                "status": "ok",
+                "queued_texts": batcher.pending,
+                "batches": batcher.batches,
+                "indexed_resumes": len(self.server.index) if self.server.index is not None else 0,
+            })
+        else:
+            self._send(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        route = ROUTES.get(self.path)
+        if route is None:
+            self._send(404, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True  # the body can't be delimited, so the connection can't be reused
+            self._send(400, {"error": "Content-Length must be a non-negative integer"})
+            return
+        if length > SERVICE_MAX_BODY_BYTES:
+            self._send(413, {"error": f"Request body over {SERVICE_MAX_BODY_BYTES} bytes"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("Request body must be a JSON object")
+            self._send(200, route(self.server, payload))
+        except QueueFull as e:
+            self._send(503, {"error": f"Server busy: {e}"}, {"Retry-After": "1"})
+        except KeyError as e:
+            self._send(400, {"error": f"Missing field {e}"})
+        except (ValueError, TypeError) as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def log_message(self, format, *args):
+        pass  # one line per request would dominate the console at high request rates
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, batcher, index=None):
+        super().__init__(address, ScoringHandler)
+        self.batcher = batcher
+        self.index = index
+
+
+def make_server(host=SERVICE_HOST, port=SERVICE_PORT, batcher=None, index=None):
+    """A ready-to-serve ScoringServer (port=0 picks a free port: see server.server_address)."""
+    return ScoringServer((host, port), batcher or MicroBatcher(), index)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve /embed, /score and /rank over HTTP from one warm model.")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--index", default=RESUME_INDEX_PATH,
+                        help="resume index served by /rank: a ResumeIndex .npz or a compact index directory")
+    args = parser.parse_args()
+
+    if Path(args.index).is_dir():
+        index = CompactResumeIndex(args.index)
+    else:
+        index = ResumeIndex.load(args.index) if Path(args.index).exists() else None
+    batcher = MicroBatcher()
+    batcher.embed(["warm up"])  # load the model before accepting requests
+    server = make_server(args.host, args.port, batcher, index)
+    print(f"🚀 Serving on http://{args.host}:{server.server_address[1]} "
+          f"({len(index) if index is not None else 0} indexed resumes)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
@@ -0,0 +1,210 @@
+import json
+import re
+import threading
+from collections import deque
+
+import numpy as np
+
+from config import SKILLS_TAXONOMY_PATH, SKILL_WEIGHT
+
+# Deterministic local skill extraction from data/skills_taxonomy.json:
+#   {"ambiguous": [...], "categories": {category: {canonical skill: [aliases]}}}
+# Every canonical name and alias is tokenized and compiled into one Aho-Corasick
+# automaton over word tokens, so a resume is scanned once, left to right, whatever the
+# taxonomy size, and matches always fall on word boundaries ("java" never fires inside
+# "javascript"). Aliases map to their canonical skill ("k8s" -> "Kubernetes").
+# Canonical names listed as ambiguous ("Go", "R", "Excel") are common words or single
+# letters, so they only match through their aliases ("golang", "r programming").
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+
+def _tokens(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+class SkillMatcher:
+    """Multi-pattern skill matcher compiled from a taxonomy.
+
+    find() returns canonical skill names in order of first appearance; skill_matrix()
+    turns skill lists into a [n, n_skills] 0/1 matrix for vectorized overlap scoring.
+    """
+
+    def __init__(self, taxonomy):
+        self.skills = []
+        self.categories = {}
+        self._patterns = {}  # token tuple -> skill id, searched for in text
+        self._names = {}  # every known name, including ambiguous ones (for normalize)
+        ambiguous = set(taxonomy.get("ambiguous", ()))
+        for category, entries in taxonomy["categories"].items():
+            for skill, aliases in entries.items():
+                skill_id = len(self.skills)
+                self.skills.append(skill)
+                self.categories[skill] = category
+                for name in [skill, *aliases]:
+                    tokens = tuple(_tokens(name))
+                    if not tokens:
+                        continue
+                    self._names.setdefault(tokens, skill_id)
+                    if not (name == skill and skill in ambiguous):
+                        self._patterns.setdefault(tokens, skill_id)
+        self.index = {skill: skill_id for skill_id, skill in enumerate(self.skills)}
+        self._build(self._patterns.items())
+
+    def _build(self, patterns):
+        # Trie over tokens, then breadth-first failure links (classic Aho-Corasick)
+        self._goto = [{}]
+        self._output = [[]]
+        for tokens, skill_id in patterns:
+            state = 0
+            for token in tokens:
+                if token not in self._goto[state]:
+                    self._goto.append({})
+                    self._output.append([])
+                    self._goto[state][token] = len(self._goto) - 1
+                state = self._goto[state][token]
+            self._output[state].append(skill_id)
+
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(token, 0) if state else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+        self._alphabet = {token for edges in self._goto for token in edges}
+
+    def __len__(self):
+        return len(self.skills)
+
+    def find_ids(self, text):
+        """Ids of the skills mentioned in text, in order of first appearance."""
+        goto, fail, output, alphabet = self._goto, self._fail, self._output, self._alphabet
+        found = {}
+        state = 0
+        for token in _tokens(text):
+            if token not in alphabet:
+                state = 0
+                continue
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for skill_id in output[state]:
+                found.setdefault(skill_id)
+        return list(found)
+
+    def find(self, text):
+        return [self.skills[skill_id] for skill_id in self.find_ids(text)]
+
+    def find_many(self, texts):
+        return [self.find(text) for text in texts]
+
+    def normalize(self, name):
+        """Canonical skill for a name or alias ("k8s" -> "Kubernetes"), or None if unknown."""
+        skill_id = self._names.get(tuple(_tokens(name)))
+        return None if skill_id is None else self.skills[skill_id]
+
+    def skill_matrix(self, skill_lists):
+        """[len(skill_lists), n_skills] float32 0/1 matrix; names may be aliases, unknown ones are ignored."""
+        matrix = np.zeros((len(skill_lists), len(self.skills)), dtype=np.float32)
+        for row, skills in enumerate(skill_lists):
+            for name in skills:
+                skill_id = self._names.get(tuple(_tokens(name)))
+                if skill_id is not None:
+                    matrix[row, skill_id] = 1
+        return matrix
+
+    def text_matrix(self, texts):
+        """skill_matrix of the skills found in each text (skips building name lists)."""
+        matrix = np.zeros((len(texts), len(self.skills)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            matrix[row, self.find_ids(text)] = 1
+        return matrix
+
+
+def load_taxonomy(path=SKILLS_TAXONOMY_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_skill_matcher():
+    """The SkillMatcher for SKILLS_TAXONOMY_PATH, compiled once on first use."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = SkillMatcher(load_taxonomy())
+    return _matcher
+
+
+def extract_skills(text):
+    return get_skill_matcher().find(text)
+
+
+def extract_skills_many(texts):
+    return get_skill_matcher().find_many(texts)
+
+
+def parse_skill_list(reply, matcher=None):
+    """Skill names from a chat model's comma-separated (or numbered/bulleted) list.
+
+    Known names and aliases come back canonical, so both providers return the same kind of list.
+    """
+    matcher = matcher or get_skill_matcher()
+    skills = []
+    for item in re.split(r"[,\n]", reply or ""):
+        name = re.sub(r"^\s*(?:\d+[.)]|[-*•])\s*", "", item).strip().rstrip(".")
+        if name:
+            skills.append(matcher.normalize(name) or name)
+    return list(dict.fromkeys(skills))
+
+
+def skill_overlap(jd_skills, resume_skills):
+    """Share of each JD's skills found in each resume: [n_jds, n_resumes] in [0, 1].
+
+    Both arguments are 0/1 skill matrices from the same matcher. JDs without any
+    known skill get NaN, so blend_scores() leaves their scores untouched.
+    """
+    jd_skills = np.atleast_2d(np.asarray(jd_skills, dtype=np.float32))
+    resume_skills = np.atleast_2d(np.asarray(resume_skills, dtype=np.float32))
+    totals = jd_skills.sum(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(totals > 0, (jd_skills @ resume_skills.T) / totals, np.nan)
+
+
+def blend_scores(similarity, overlap, weight=SKILL_WEIGHT):
+    """(1 - weight) * cosine similarity + weight * skill overlap, elementwise (NaN overlap = similarity)."""
+    similarity = np.asarray(similarity, dtype=np.float32)
+    if not weight:
+        return similarity
+    overlap = np.asarray(overlap, dtype=np.float32)
+    return np.where(np.isnan(overlap), similarity, (1 - weight) * similarity + weight * overlap)
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+    from time import time
+
+    from app.parser import extract_texts_parallel
+
+    matcher = get_skill_matcher()
+    jd_text = Path("data/job_descriptions/sample_jd.txt").read_text(encoding="utf-8")
+    texts = [text for _, text in extract_texts_parallel(sorted(Path("data/resumes").glob("*.pdf"))) if text]
+
+    start = time()
+    resume_skills = matcher.text_matrix(texts)
+    elapsed = time() - start
+    jd_skills = matcher.text_matrix([jd_text])
+    print(f"JD skills: {matcher.find(jd_text)}")
+    print(f"Scanned {len(texts)} resumes in {round(elapsed * 1000, 2)} ms "
+          f"({round(len(texts) / max(elapsed, 1e-9))} resumes/s, {len(matcher)} skills)")
+    overlap = skill_overlap(jd_skills, resume_skills)[0]
+    print(f"Mean JD-skill coverage: {round(float(np.nanmean(overlap)) * 100, 2)}%")
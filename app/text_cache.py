@@ -0,0 +1,79 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+
+
+def file_sha256(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class TextCache:
+    """Extracted PDF text stored in one SQLite file, keyed by the PDF's fingerprint.
+
+    A cached entry is valid while the file's (size, mtime_ns) are unchanged. With
+    hash_content=True the file's SHA-256 is checked as well, which also catches a file
+    replaced in place with the same size and timestamp, and lets copies of the same PDF
+    under a different name share one entry.
+    """
+
+    def __init__(self, db_path, hash_content=False):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.hash_content = hash_content
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS texts ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT, text BLOB)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS texts_sha256 ON texts (sha256)")
+        self._db.commit()
+
+    def fingerprint(self, file_path):
+        stat = os.stat(file_path)
+        sha256 = file_sha256(file_path) if self.hash_content else None
+        return str(Path(file_path).resolve()), stat.st_size, stat.st_mtime_ns, sha256
+
+    def lookup(self, file_path):
+        """Return (fingerprint, text); text is None unless the file is unchanged since caching.
+
+        Take the fingerprint before extracting and pass it to store(), so a file modified
+        during extraction is never cached under its new fingerprint.
+        """
+        fingerprint = self.fingerprint(file_path)
+        path, size, mtime_ns, sha256 = fingerprint
+        with self._lock:
+            row = self._db.execute(
+                "SELECT size, mtime_ns, sha256, text FROM texts WHERE path = ?", (path,)
+            ).fetchone()
+            if row and row[:2] == (size, mtime_ns) and (sha256 is None or row[2] == sha256):
+                return fingerprint, zlib.decompress(row[3]).decode("utf-8")
+            if sha256 is not None:
+                # Same content seen under another path (copied or renamed file)
+                row = self._db.execute("SELECT text FROM texts WHERE sha256 = ? LIMIT 1", (sha256,)).fetchone()
+                if row:
+                    return fingerprint, zlib.decompress(row[0]).decode("utf-8")
+        return fingerprint, None
+
+    def store(self, fingerprint, text):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO texts (path, size, mtime_ns, sha256, text) VALUES (?, ?, ?, ?, ?)",
+                (*fingerprint, zlib.compress(text.encode("utf-8"))),
+            )
+            self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM texts").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import json
+import re
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+from app.parser import extract_texts_parallel, extract_name, extract_names, extract_email, extract_phone
+
+# Per-resume name/contact parse latency: the old path (full spaCy pipeline over the whole
+# text, regexes compiled per call) against the fast path (NER-only pipeline on the header,
+# precompiled regexes, and nlp.pipe batching).
+
+OUTPUT_FILE = Path("output/bench_parser.json")
+
+
+def _old_parse(nlp, text):
+    doc = nlp(text)
+    name = next((ent.text for ent in doc.ents if ent.label_ == "PERSON"), None)
+    email = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    phone = re.search(r'\+?\d[\d\-\s]{8,}\d', text)
+    return name, email, phone
+
+
+def _new_parse(text):
+    return extract_name(text), extract_email(text), extract_phone(text)
+
+
+def _latency_stats(seconds):
+    ms = np.asarray(seconds) * 1000
+    return {
+        "resumes": len(ms),
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "resumes_per_second": round(len(ms) / (ms.sum() / 1000), 1),
+    }
+
+
+def run(resume_dir, limit, n_process):
+    import spacy
+
+    paths = sorted(Path(resume_dir).glob("*.pdf"))[:limit]
+    texts = [text for _, text in extract_texts_parallel(paths) if text is not None]
+    full_nlp = spacy.load("en_core_web_sm")
+    _old_parse(full_nlp, texts[0])  # warm up both pipelines
+    _new_parse(texts[0])
+
+    before = []
+    for text in texts:
+        start = perf_counter()
+        _old_parse(full_nlp, text)
+        before.append(perf_counter() - start)
+
+    after = []
+    for text in texts:
+        start = perf_counter()
+        _new_parse(text)
+        after.append(perf_counter() - start)
+
+    start = perf_counter()
+    extract_names(texts, n_process=n_process)
+    batched_total = perf_counter() - start
+
+    results = {
+        "before_full_pipeline": _latency_stats(before),
+        "after_header_ner": _latency_stats(after),
+        "after_batched_pipe": {
+            "resumes": len(texts),
+            "n_process": n_process,
+            "mean_ms": round(batched_total / len(texts) * 1000, 3),
+            "resumes_per_second": round(len(texts) / batched_total, 1),
+        },
+    }
+    results["speedup_header_ner"] = round(results["before_full_pipeline"]["mean_ms"] / results["after_header_ner"]["mean_ms"], 2)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark resume name/contact parsing latency.")
+    parser.add_argument("--resume-dir", default="data/resumes")
+    parser.add_argument("--limit", type=int, default=200, help="max resumes to time")
+    parser.add_argument("--n-process", type=int, default=1, help="processes for nlp.pipe")
+    args = parser.parse_args()
+
+    results = run(args.resume_dir, args.limit, args.n_process)
+    OUTPUT_FILE.parent.mkdir(exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(results, indent=2))
+
+    for label, stats in results.items():
+        print(f"{label:22} {stats}")
+    print(f"\nResults saved to '{OUTPUT_FILE}'")
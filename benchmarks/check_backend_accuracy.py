@@ -0,0 +1,102 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import json
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+from scipy.stats import spearmanr
+
+from config import EMBEDDING_BATCH_SIZE, LOCAL_NUM_THREADS
+from app.models import load_local_model
+from app.parser import extract_texts_parallel
+
+# Accuracy and speed of a quantized/ONNX local backend against the fp32 PyTorch model
+# on the resumes_test corpus. Embeddings are compared directly (cosine between the two
+# vectors of each resume) and through what screening actually uses: JD-vs-resume
+# scores, their ranking, the top-k and the threshold decision.
+
+OUTPUT_DIR = Path("output")
+THRESHOLD = 0.30  # 30% threshold (consistency with screen_resumes)
+
+
+def _normalized(vectors):
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+def embed(model, texts, repeats):
+    """(normalized float32 embeddings, texts per second averaged over repeats)."""
+    model.encode(texts[:1])  # warm up
+    start = perf_counter()
+    for _ in range(repeats):
+        vectors = model.encode(texts, batch_size=EMBEDDING_BATCH_SIZE, convert_to_numpy=True)
+    elapsed = perf_counter() - start
+    return _normalized(np.asarray(vectors, dtype=np.float32)), len(texts) * repeats / elapsed
+
+
+def compare(reference, candidate, top_k):
+    """Drift of the candidate's embeddings and JD scores (row 0 is the JD)."""
+    vector_cosine = np.sum(reference * candidate, axis=1)
+    ref_scores = reference[1:] @ reference[0] * 100
+    new_scores = candidate[1:] @ candidate[0] * 100
+    drift = np.abs(new_scores - ref_scores)
+    k = min(top_k, len(ref_scores))
+    ref_top = set(np.argsort(-ref_scores)[:k])
+    new_top = set(np.argsort(-new_scores)[:k])
+    return {
+        "embedding_cosine_min": round(float(vector_cosine.min()), 5),
+        "embedding_cosine_mean": round(float(vector_cosine.mean()), 5),
+        "score_drift_max_pp": round(float(drift.max()), 3),
+        "score_drift_mean_pp": round(float(drift.mean()), 3),
+        "rank_spearman": round(float(spearmanr(ref_scores, new_scores)[0]), 5),
+        f"top_{k}_overlap": round(len(ref_top & new_top) / k, 3),
+        "threshold_flips": int(np.sum((ref_scores >= THRESHOLD * 100) != (new_scores >= THRESHOLD * 100))),
+    }
+
+
+def run(backend, resume_dir, jd_file, repeats, top_k, num_threads):
+    paths = sorted(Path(resume_dir).glob("*.pdf"))
+    texts = [text for _, text in extract_texts_parallel(paths) if text is not None]
+    texts = [Path(jd_file).read_text(encoding="utf-8")] + texts
+
+    reference, reference_speed = embed(load_local_model("torch", num_threads), texts, repeats)
+    candidate, candidate_speed = embed(load_local_model(backend, num_threads), texts, repeats)
+
+    return {
+        "backend": backend,
+        "resumes": len(texts) - 1,
+        "num_threads": num_threads,
+        **compare(reference, candidate, top_k),
+        "fp32_texts_per_second": round(reference_speed, 1),
+        f"{backend}_texts_per_second": round(candidate_speed, 1),
+        "speedup": round(candidate_speed / reference_speed, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare a quantized/ONNX local backend against fp32 embeddings.")
+    parser.add_argument("--backend", choices=["int8", "onnx"], default="int8")
+    parser.add_argument("--resume-dir", default="data/resumes_test")
+    parser.add_argument("--jd-file", default="data/job_descriptions/sample_jd.txt")
+    parser.add_argument("--repeats", type=int, default=3, help="timed passes over the corpus")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=LOCAL_NUM_THREADS, help="intra-op threads")
+    parser.add_argument("--max-drift", type=float, default=1.0, help="allowed max score drift (percentage points)")
+    args = parser.parse_args()
+
+    results = run(args.backend, args.resume_dir, args.jd_file, args.repeats, args.top_k, args.threads)
+    output_file = OUTPUT_DIR / f"backend_accuracy_{args.backend}.json"
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    output_file.write_text(json.dumps(results, indent=2))
+
+    for key, value in results.items():
+        print(f"{key:28} {value}")
+    print(f"\nResults saved to '{output_file}'")
+
+    if results["score_drift_max_pp"] > args.max_drift:
+        print(f"\n❌ Max score drift {results['score_drift_max_pp']} pp exceeds {args.max_drift} pp")
+        sys.exit(1)
+    print(f"\n✅ Max score drift within {args.max_drift} pp")
@@ -0,0 +1,258 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import csv
+import json
+import platform
+import subprocess
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+from config import MODEL_PROVIDER, LOCAL_MODEL_NAME, OPENAI_EMBEDDING_MODEL, SCREENING_BATCH_SIZE, SHORTLIST_TOP_N
+from app.generate_test_resumes import generate_resumes, skills_positive
+from app.parser import _read_pdf, extract_texts_parallel, extract_name, extract_names, extract_email, extract_phone
+from app.pipeline import batched
+from app.reporting import render_top_n, render_distribution
+
+try:
+    import resource
+except ImportError:  # not available on Windows; RSS is reported as null there
+    resource = None
+
+# Reproducible benchmark of the screening hot paths on synthetic corpora
+# (generate_test_resumes.py style). Each stage is timed on its own:
+#   extraction  PDF -> text (process pool, text cache bypassed)
+#   parsing     name/email/phone
+#   embedding   resume texts -> vectors (embedding cache bypassed)
+#   ranking     JD x resume similarity + top-N shortlist
+#   csv_output  full results CSV
+#   plot_output top-N bar chart + score distribution (app/reporting.py)
+# and reports throughput, p50/p95 latency and peak RSS to JSON, so runs from two
+# releases can be compared with --baseline.
+
+CORPUS_DIR = Path("cache/benchmarks")
+OUTPUT_DIR = Path("output/benchmarks")
+SCALES = [100, 1_000, 10_000, 100_000]
+LATENCY_SAMPLE = 1_000  # per-item latency is sampled on at most this many resumes
+REPEATS = 5  # repetitions of the (fast) ranking and output stages
+FALLBACK_DIM = 384  # random embeddings keep ranking measurable when no model is available
+JD_TEXT = "We are hiring a data scientist with experience in " + ", ".join(skills_positive) + "."
+
+
+def _peak_rss_mb():
+    # High-water mark of this process and of its (extraction) children; ru_maxrss is KB on Linux, bytes on macOS
+    if resource is None:
+        return None
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    }
+
+
+def _stage_stats(wall_seconds, items, samples, latency_unit):
+    ms = np.asarray(samples, dtype=np.float64) * 1000
+    return {
+        "items": items,
+        "wall_s": round(wall_seconds, 4),
+        "items_per_second": round(items / wall_seconds, 1) if wall_seconds > 0 else None,
+        "latency_unit": latency_unit,
+        "p50_ms": round(float(np.percentile(ms, 50)), 3) if len(ms) else None,
+        "p95_ms": round(float(np.percentile(ms, 95)), 3) if len(ms) else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _timed(fn, *args):
+    start = perf_counter()
+    result = fn(*args)
+    return perf_counter() - start, result
+
+
+def ensure_corpus(count):
+    """Synthetic corpus of `count` PDFs, generated once and reused by later runs."""
+    corpus = CORPUS_DIR / f"resumes_{count}"
+    if len(list(corpus.glob("*.pdf"))) < count:
+        print(f"📝 Generating {count} synthetic resumes in {corpus} ...")
+        generate_resumes(corpus, count, seed=count)
+    return sorted(corpus.glob("*.pdf"))[:count]
+
+
+def bench_extraction(paths, workers):
+    samples = [_timed(_read_pdf, path)[0] for path in paths[:LATENCY_SAMPLE]]
+    wall, results = _timed(lambda: list(extract_texts_parallel(paths, max_workers=workers, use_cache=False)))
+    texts = [text for _, text in results if text is not None]
+    return _stage_stats(wall, len(paths), samples, "resume (single file)"), texts
+
+
+def bench_parsing(texts):
+    extract_name(texts[0])  # load spaCy outside the timings
+    samples = []
+    for text in texts[:LATENCY_SAMPLE]:
+        elapsed, _ = _timed(lambda: (extract_name(text), extract_email(text), extract_phone(text)))
+        samples.append(elapsed)
+    wall, _ = _timed(lambda: (extract_names(texts), [extract_email(t) for t in texts], [extract_phone(t) for t in texts]))
+    return _stage_stats(wall, len(texts), samples, "resume")
+
+
+def bench_embedding(texts, batch_size):
+    from app.models import get_embeddings
+
+    get_embeddings(texts[:1], use_cache=False)  # load the model outside the timings
+    samples, chunks = [], []
+    for batch in batched(texts, batch_size):
+        elapsed, embeddings = _timed(get_embeddings, batch, batch_size, False)
+        samples.append(elapsed)
+        chunks.append(embeddings.detach().cpu().numpy().astype(np.float32))
+    jd_embedding = get_embeddings([JD_TEXT], use_cache=False).detach().cpu().numpy().astype(np.float32)
+    return _stage_stats(sum(samples), len(texts), samples, f"batch of {batch_size}"), jd_embedding, np.concatenate(chunks)
+
+
+def _rank(jd_embedding, resume_embeddings, names, top_n):
+    from app.multi_screen import similarity_matrix, shortlists_from_matrix
+
+    matrix = similarity_matrix(jd_embedding, resume_embeddings)
+    return matrix, shortlists_from_matrix(matrix, ["jd"], names, top_n=top_n)
+
+
+def bench_ranking(jd_embedding, resume_embeddings, names, top_n):
+    samples = []
+    for _ in range(REPEATS):
+        elapsed, (matrix, shortlists) = _timed(_rank, jd_embedding, resume_embeddings, names, top_n)
+        samples.append(elapsed)
+    return _stage_stats(sum(samples) / REPEATS, len(names), samples, "query"), matrix[0], shortlists["jd"]
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["file", "score", "shortlisted"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _write_charts(directory, rows, shortlist):
+    render_top_n(directory / "top_n.png", shortlist)
+    render_distribution(directory / "distribution.png", [row["score"] for row in rows], threshold=0.30)
+
+
+def bench_output(scores, names, shortlist, threshold=0.30):
+    rows = [
+        {"file": name, "score": round(float(score) * 100, 2), "shortlisted": "✅" if score >= threshold else "❌"}
+        for name, score in zip(names, scores)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_samples = [_timed(_write_csv, Path(tmp) / "results.csv", rows)[0] for _ in range(REPEATS)]
+        plot_samples = [_timed(_write_charts, Path(tmp), rows, shortlist)[0] for _ in range(REPEATS)]
+    return (
+        _stage_stats(sum(csv_samples) / REPEATS, len(rows), csv_samples, "write"),
+        _stage_stats(sum(plot_samples) / REPEATS, len(rows), plot_samples, "render (top-N + distribution)"),
+    )
+
+
+def run_scale(count, workers, batch_size, top_n, skip_models):
+    paths = ensure_corpus(count)
+    names = [path.name for path in paths]
+    stages = {}
+
+    print(f"\n⏱️ {count} resumes")
+    stages["extraction"], texts = bench_extraction(paths, workers)
+
+    if skip_models:
+        stages["parsing"] = stages["embedding"] = {"skipped": True}
+    else:
+        try:
+            stages["parsing"] = bench_parsing(texts)
+        except Exception as e:  # e.g. the spaCy model is not installed
+            stages["parsing"] = {"error": str(e)}
+
+    jd_embedding = resume_embeddings = None
+    if not skip_models:
+        try:
+            stages["embedding"], jd_embedding, resume_embeddings = bench_embedding(texts, batch_size)
+        except Exception as e:  # e.g. the model cannot be downloaded
+            stages["embedding"] = {"error": str(e)}
+    if resume_embeddings is None or len(resume_embeddings) != len(names):
+        rng = np.random.default_rng(count)
+        jd_embedding = rng.standard_normal((1, FALLBACK_DIM), dtype=np.float32)
+        resume_embeddings = rng.standard_normal((len(names), FALLBACK_DIM), dtype=np.float32)
+
+    stages["ranking"], scores, shortlist = bench_ranking(jd_embedding, resume_embeddings, names, top_n)
+    stages["ranking"]["random_embeddings"] = "error" in stages["embedding"] or "skipped" in stages["embedding"]
+    stages["csv_output"], stages["plot_output"] = bench_output(scores, names, shortlist)
+
+    for name, stats in stages.items():
+        if "items_per_second" in stats:
+            print(f"  {name:12} {stats['items_per_second']:>10} items/s  p50 {stats['p50_ms']} ms  p95 {stats['p95_ms']} ms")
+        else:
+            print(f"  {name:12} {stats}")
+    return stages
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """Stages whose throughput dropped by more than `tolerance` (0-1) against the baseline."""
+    regressions = []
+    for scale, stages in results["scales"].items():
+        for name, stats in stages.items():
+            old = baseline.get("scales", {}).get(scale, {}).get(name, {}).get("items_per_second")
+            new = stats.get("items_per_second")
+            if old and new and new < old * (1 - tolerance):
+                regressions.append({"scale": scale, "stage": name, "baseline": old, "current": new,
+                                    "change_percent": round((new / old - 1) * 100, 1)})
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark extraction, parsing, embedding, ranking and output.")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES[:2], help=f"corpus sizes (e.g. {SCALES})")
+    parser.add_argument("--workers", type=int, default=None, help="extraction processes (default: all CPUs)")
+    parser.add_argument("--batch-size", type=int, default=SCREENING_BATCH_SIZE, help="embedding batch size")
+    parser.add_argument("--top-n", type=int, default=SHORTLIST_TOP_N, help="shortlist size")
+    parser.add_argument("--skip-models", action="store_true", help="skip parsing/embedding (no spaCy/encoder needed)")
+    parser.add_argument("--baseline", help="earlier results JSON to compare throughput against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed throughput drop vs baseline (0-1)")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "model_provider": MODEL_PROVIDER,
+            "model": LOCAL_MODEL_NAME if MODEL_PROVIDER == "local" else OPENAI_EMBEDDING_MODEL,
+            "batch_size": args.batch_size,
+            "top_n": args.top_n,
+        },
+        # Ascending order: peak RSS is a process high-water mark, so smaller runs must come first
+        "scales": {str(count): run_scale(count, args.workers, args.batch_size, args.top_n, args.skip_models)
+                   for count in sorted(args.scales)},
+    }
+
+    if args.baseline:
+        results["regressions"] = compare(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output_file = OUTPUT_DIR / f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output_file.write_text(json.dumps(results, indent=2))
+    (OUTPUT_DIR / "latest.json").write_text(json.dumps(results, indent=2))
+    print(f"\nResults saved to '{output_file}'")
+
+    if results.get("regressions"):
+        print("\n❌ Throughput regressions:")
+        for regression in results["regressions"]:
+            print(f"  {regression}")
+        sys.exit(1)
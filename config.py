@@ -7,7 +7,108 @@ MODEL_PROVIDER = "local"  # Options: "local", "openai"
 
 # For local model
 LOCAL_MODEL_NAME = "all-MiniLM-L6-v2"
+LOCAL_BACKEND = "torch"  # "torch" (fp32), "int8" (dynamically quantized PyTorch, CPU) or "onnx" (ONNX Runtime)
+LOCAL_NUM_THREADS = None  # intra-op CPU threads for inference; None = library default (all cores)
+ONNX_MODEL_FILE = "onnx/model.onnx"  # e.g. "onnx/model_qint8_avx512_vnni.onnx" for a quantized export
 
 # For OpenAI
 OPENAI_MODEL_NAME = "gpt-3.5-turbo"  # or "gpt-4"
+OPENAI_EMBEDDING_MODEL = "text-embedding-ada-002"
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")  # set this via .env or export
+
+# Number of texts sent to the encoder per batch
+EMBEDDING_BATCH_SIZE = 32
+
+# On-disk embedding cache (keyed by text hash, model and provider)
+EMBEDDING_CACHE_ENABLED = True
+EMBEDDING_CACHE_DIR = "cache/embeddings"
+EMBEDDING_CACHE_MAX_ENTRIES = 200_000  # least recently used vectors are evicted beyond this
+EMBEDDING_CACHE_DTYPE = "float32"  # "float16" halves disk usage at a small precision cost
+
+# Persistent resume vector index (see app/resume_index.py)
+RESUME_INDEX_PATH = "cache/resume_index.npz"
+
+# Compact memory-mapped resume index (see app/compact_index.py) for very large pools
+COMPACT_INDEX_DIR = "cache/compact_index"
+COMPACT_INDEX_DTYPE = "int8"  # "int8" (~4x smaller than fp32) or "float16" (2x)
+COMPACT_RERANK_FACTOR = 4  # coarse candidates re-scored in fp32 per requested result
+
+# BM25 inverted index (app/bm25_index.py): lexical prefilter before embedding large pools
+BM25_INDEX_PATH = "cache/bm25_index.sqlite"
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_PREFILTER_K = 2000  # resumes passed on to the embedding/cosine stage
+BM25_PREFILTER_ENABLED = False  # screen_resumes embeds only the BM25 top BM25_PREFILTER_K (also: --prefilter)
+HYBRID_FUSION = "rrf"  # "rrf" (reciprocal rank fusion) or "linear" (HYBRID_ALPHA * cosine + rest * BM25)
+HYBRID_ALPHA = 0.7
+
+# PDF text extraction
+PDF_EXTRACT_WORKERS = None  # None = one worker process per CPU core
+PDF_EXTRACT_TIMEOUT = 30  # seconds before a stuck/corrupt PDF is skipped
+
+# Extracted PDF text cache (skips PyMuPDF for unchanged files)
+TEXT_CACHE_ENABLED = True
+TEXT_CACHE_PATH = "cache/pdf_text.sqlite"
+TEXT_CACHE_HASH_CONTENT = False  # also compare SHA-256 of the file (slower, catches same-size/mtime swaps)
+
+# Streaming screening pipeline
+SCREENING_BATCH_SIZE = 256  # resumes embedded per pipeline step (and per checkpoint)
+SHORTLIST_TOP_N = 50  # best resumes kept in memory for the shortlist and chart
+
+# Persistent results store (app/results_store.py): re-runs only score new/changed resumes
+RESULTS_STORE_ENABLED = True
+RESULTS_STORE_PATH = "cache/results.sqlite"
+RESULTS_WATCH_INTERVAL = 5  # seconds between folder polls in watch mode
+
+# Multi-JD screening (app/multi_screen.py)
+JD_DIR = "data/job_descriptions"
+SCORE_CHUNK_SIZE = 4096  # resumes embedded and scored per matmul chunk
+
+# Name-substitution bias audit: resumes whose name variants are encoded together
+BIAS_AUDIT_CHUNK_SIZE = 64
+
+# Long-document chunking: resumes longer than the encoder's window are split into
+# overlapping token windows, encoded chunk by chunk and pooled back into one score.
+EMBEDDING_CHUNKING = False
+CHUNK_MAX_TOKENS = 254  # all-MiniLM-L6-v2 reads 256 tokens, minus [CLS]/[SEP]
+CHUNK_OVERLAP = 32
+CHUNK_POOLING = "mean"  # "mean", "max" or "best" (best single chunk vs. the JD)
+
+# Async OpenAI provider (app/openai_async.py)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # point at a local stub server for testing
+OPENAI_MAX_CONCURRENCY = 8  # requests in flight at once
+OPENAI_REQUESTS_PER_MINUTE = 3000
+OPENAI_TOKENS_PER_MINUTE = 1_000_000
+OPENAI_INPUTS_PER_REQUEST = 256  # texts packed into one embeddings request
+OPENAI_MAX_RETRIES = 5
+
+# Taxonomy-based skill extraction (app/skills.py)
+SKILLS_TAXONOMY_PATH = "data/skills_taxonomy.json"
+SKILL_WEIGHT = 0.0  # share of the match score from JD-skill coverage (0 = embeddings only, e.g. 0.2)
+
+# Name extraction: NER only runs on the resume header (names sit at the top)
+NAME_HEADER_CHARS = 400
+NER_BATCH_SIZE = 64
+NER_PROCESSES = 1  # >1 runs spaCy's nlp.pipe across processes for large pools
+
+# Stage timers/counters (app/instrumentation.py); entry points write one JSON report per run
+INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION", "1") != "0"
+PROFILE_MODE = os.getenv("PROFILE_MODE", "")  # "cprofile" saves a .prof per run, "py-spy" prints the PID to attach to
+METRICS_DIR = "output/metrics"
+
+# Background screening jobs (app/jobs.py), used by the Streamlit batch page
+JOB_DIR = "output/jobs"
+JOB_WORKERS = 2  # screening jobs running at once; more are queued
+
+# Local HTTP scoring service (app/service.py)
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8000
+SERVICE_BATCH_WINDOW_MS = 5  # how long the micro-batcher waits for concurrent requests to join a batch
+SERVICE_MAX_BATCH = 64  # texts per encode call
+SERVICE_MAX_QUEUE = 1024  # texts waiting to be encoded before requests get 503
+SERVICE_MAX_BODY_BYTES = 10_000_000
+
+# Evaluation (app/evaluation.py): threshold sweep with bootstrap confidence intervals
+EVAL_BOOTSTRAP_SAMPLES = 1000  # resamples per interval; 0 skips the intervals
+EVAL_BOOTSTRAP_WORKERS = None  # None = one worker process per CPU core
+EVAL_CONFIDENCE = 0.95
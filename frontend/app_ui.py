@@ -2,22 +2,74 @@
 
 import streamlit as st
 from pathlib import Path
-import sys, os, tempfile
+import sys, os, tempfile, shutil, time, hashlib
 import pandas as pd
-import matplotlib.pyplot as plt
-from sentence_transformers import util
+import numpy as np
 
 # Add app folder to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-# Import backend functions
+# Import backend functions (models and the parser are imported on first use, see below)
 from config import MODEL_PROVIDER
-from app.parser import parse_resume, extract_text_from_pdf
-from app.models import get_embedding
+from app.instrumentation import load_reports
+from app.jobs import get_job_manager
+from app.reporting import top_n_figure, distribution_figure, per_jd_figure
 
 # Paths
 OUTPUT_DIR = Path("output")
 OUTPUT_DIR.mkdir(exist_ok=True)
+THRESHOLD = 0.30  # 30% threshold (consistency with screen_resumes)
+JOB_POLL_SECONDS = 1  # how often the batch page refreshes a running job
+CACHE_MAX_DOCUMENTS = 256  # parsed uploads / embeddings kept in the UI cache
+
+# --- Cached resources ---
+# Models load once per server process and are shared by every session. Documents are
+# memoized by the SHA-256 of their content (the underscore argument is not hashed), so
+# Quick Match with one new file only parses and embeds that file. Result tables are
+# keyed by path and mtime, so a rewritten CSV is re-read. Settings can clear both.
+
+def _digest(data):
+    return hashlib.sha256(data if isinstance(data, bytes) else data.encode("utf-8")).hexdigest()
+
+@st.cache_resource(show_spinner="Loading models...")
+def load_models():
+    """Shared embedding model (and spaCy pipeline), loaded once for all sessions."""
+    from app import models
+    from app.parser import get_nlp
+
+    if MODEL_PROVIDER == "local":
+        models.get_model()
+    get_nlp()
+    return models
+
+@st.cache_data(max_entries=CACHE_MAX_DOCUMENTS, show_spinner=False)
+def embed_text(digest, _text):
+    """Embedding of a document as a float32 vector, memoized by its content hash."""
+    embedding = load_models().get_embedding(_text)
+    return embedding.detach().cpu().numpy().astype(np.float32).reshape(-1)
+
+@st.cache_data(max_entries=CACHE_MAX_DOCUMENTS, show_spinner="Parsing resume...")
+def parse_upload(digest, _data):
+    """parse_resume of an uploaded PDF, memoized by the upload's hash."""
+    from app.parser import parse_resume
+
+    load_models()
+    with tempfile.TemporaryDirectory() as tmp:
+        resume_path = Path(tmp) / f"{digest}.pdf"
+        resume_path.write_bytes(_data)
+        return parse_resume(resume_path)
+
+@st.cache_data(show_spinner=False)
+def load_results(path, mtime_ns):
+    return pd.read_csv(path)
+
+def read_results(path):
+    """A results CSV as a DataFrame, cached until the file changes."""
+    path = Path(path)
+    return load_results(str(path), path.stat().st_mtime_ns)
+
+def cosine_percent(a, b):
+    return float(a @ b / max(np.linalg.norm(a) * np.linalg.norm(b), 1e-12)) * 100
 
 # Streamlit page setup
 st.set_page_config(page_title="AI-Powered Resume Screener", layout="wide")
@@ -31,9 +83,24 @@ section = st.sidebar.radio("Go to", [
     "⚡ Quick Match (Upload Resume & JD)",
     "📊 Visualizations",
     "📥 Download Results",
+    "⏱️ Run Metrics",
     "⚙️ Settings"
 ])
 
+def show_metrics(run_report):
+    """Per-stage timings and counters of one run report."""
+    st.write(f"**Wall time:** {run_report['wall_s']} s")
+    if run_report["stages"]:
+        stages = pd.DataFrame.from_dict(run_report["stages"], orient="index").sort_values("total_s", ascending=False)
+        st.dataframe(stages)
+        st.bar_chart(stages["total_s"])
+    if run_report["counters"]:
+        st.write("**Counters**")
+        st.json(run_report["counters"])
+    if "profile" in run_report:
+        st.write(f"**Profile:** `{run_report['profile']['path']}`")
+        st.dataframe(pd.DataFrame(run_report["profile"]["top_functions"]))
+
 # --- Sections ---
 
 if section == "🏠 Home":
@@ -52,31 +119,37 @@ elif section == "📂 Batch Resume Screening":
     st.header("Batch Screening")
     jd_file = Path("data/job_descriptions/sample_jd.txt")
     resumes_dir = Path("data/resumes")
+    jobs = get_job_manager()
 
     if jd_file.exists() and resumes_dir.exists():
-        st.success("Screening Started...")
-        jd_text = jd_file.read_text(encoding="utf-8")
-        jd_embedding = get_embedding(jd_text)
-
-        results = []
-        progress = st.progress(0)
-        for idx, resume_path in enumerate(resumes_dir.glob("*.pdf")):
-            resume_text = extract_text_from_pdf(resume_path)
-            resume_embedding = get_embedding(resume_text)
-            score = util.pytorch_cos_sim(jd_embedding, resume_embedding).item() * 100
-
-            results.append({
-                "file": resume_path.name,
-                "score": round(score, 2)
-            })
-
-            progress.progress((idx + 1) / len(list(resumes_dir.glob("*.pdf"))))
-
-        df = pd.DataFrame(results).sort_values("score", ascending=False)
-        df.to_csv(OUTPUT_DIR / "real_resume_screening_results.csv", index=False)
-
-        st.success("Screening Completed!")
-        st.dataframe(df)
+        # Screening runs as a background job: reruns only poll its status, and all
+        # sessions share one job store (an identical submission reuses the same job)
+        if st.button("Start Screening 🚀"):
+            st.session_state["batch_job"] = jobs.submit(jd_file.read_text(encoding="utf-8"), resumes_dir, THRESHOLD)
+
+        job_id = st.session_state.get("batch_job")
+        if job_id:
+            job = jobs.get(job_id)
+            if job["status"] in ("queued", "running"):
+                st.info(f"Job {job_id} is {job['status']}: {job['processed']}/{job['total']} resumes scored")
+                st.progress(min(job["processed"] / max(job["total"], 1), 1.0))
+                time.sleep(JOB_POLL_SECONDS)
+                st.rerun()
+            elif job["status"] == "done":
+                st.success(f"Screening Completed in {job['elapsed_s']} s!")
+                if st.session_state.get("published_job") != job_id:
+                    # The Visualizations and Download pages read the latest results from output/
+                    shutil.copyfile(jobs.results_path(job_id), OUTPUT_DIR / "real_resume_screening_results.csv")
+                    st.session_state["published_job"] = job_id
+                df = read_results(jobs.results_path(job_id)).sort_values("score", ascending=False)
+                st.dataframe(df)
+            else:
+                st.error(f"Job {job_id} {job['status']}: {job['error'] or 'press Start Screening to resume it'}")
+
+        recent = jobs.list()
+        if recent:
+            with st.expander("Recent jobs"):
+                st.dataframe(pd.DataFrame(recent, columns=["id", "status", "processed", "total", "created_at", "elapsed_s", "error"]))
 
     else:
         st.error("Job description or resumes not found!")
@@ -90,21 +163,15 @@ elif section == "⚡ Quick Match (Upload Resume & JD)":
         submitted = st.form_submit_button("Match Now 🚀")
 
     if submitted and resume_file and jd_file:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_resume:
-            tmp_resume.write(resume_file.read())
-            resume_path = tmp_resume.name
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as tmp_jd:
-            tmp_jd.write(jd_file.read())
-            jd_path = tmp_jd.name
-
-        parsed = parse_resume(resume_path)
-        jd_text = Path(jd_path).read_text(encoding='utf-8')
+        # Both documents are looked up by content hash: only a new upload is parsed/embedded
+        resume_bytes = resume_file.getvalue()
+        jd_text = jd_file.getvalue().decode("utf-8")
+        parsed = parse_upload(_digest(resume_bytes), resume_bytes)
 
         try:
-            resume_embedding = get_embedding(parsed["raw_text"])
-            jd_embedding = get_embedding(jd_text)
-            score = util.pytorch_cos_sim(jd_embedding, resume_embedding).item() * 100
+            resume_embedding = embed_text(_digest(parsed["raw_text"]), parsed["raw_text"])
+            jd_embedding = embed_text(_digest(jd_text), jd_text)
+            score = cosine_percent(jd_embedding, resume_embedding)
         except NotImplementedError as e:
             score = None
             st.warning(f"⚠️ {e}")
@@ -119,8 +186,7 @@ elif section == "⚡ Quick Match (Upload Resume & JD)":
         st.write(f"**Name:** {parsed['name']}")
         st.write(f"**Email:** {parsed['email']}")
         st.write(f"**Phone:** {parsed['phone']}")
-        skills_display = parsed['skills'] if isinstance(parsed['skills'], str) else ', '.join(parsed['skills'])
-        st.write(f"**Skills:** {skills_display}")
+        st.write(f"**Skills:** {', '.join(parsed['skills'])}")
 
     elif submitted:
         st.error("Please upload both a resume and a JD.")
@@ -128,11 +194,25 @@ elif section == "⚡ Quick Match (Upload Resume & JD)":
 elif section == "📊 Visualizations":
     st.header("Visual Analysis")
 
-    if (OUTPUT_DIR / "real_screening_visualization.png").exists():
+    # Charts are built on request from the saved results; their size is bounded
+    # (top-N bars, fixed-bin histogram) however many resumes were screened
+    results_csv = OUTPUT_DIR / "real_resume_screening_results.csv"
+    if results_csv.exists():
+        top_n = st.slider("Resumes in the top-N chart", 10, 200, 50, step=10)
+        if st.button("Render screening charts"):
+            results_df = read_results(results_csv)[["file", "score"]]
+            st.pyplot(top_n_figure(results_df.to_dict("records"), "Screening Results", top_n))
+            st.pyplot(distribution_figure(results_df["score"], threshold=0.30, title="Screening Results"))
+    elif (OUTPUT_DIR / "real_screening_visualization.png").exists():
         st.image(str(OUTPUT_DIR / "real_screening_visualization.png"), caption="Screening Results")
     else:
         st.info("No screening chart found yet.")
 
+    matrix_file = OUTPUT_DIR / "multi_jd_similarity_matrix.npz"
+    if matrix_file.exists() and st.button("Render per-JD distributions"):
+        saved = np.load(matrix_file)
+        st.pyplot(per_jd_figure(saved["matrix"] * 100, saved["jds"].tolist(), threshold=0.30))
+
     if (OUTPUT_DIR / "bias_visualization.png").exists():
         st.image(str(OUTPUT_DIR / "bias_visualization.png"), caption="Bias Evaluation Results")
     else:
@@ -152,7 +232,35 @@ elif section == "📥 Download Results":
     else:
         st.info("No screening results to download.")
 
+elif section == "⏱️ Run Metrics":
+    st.header("Run Metrics")
+    reports = load_reports()
+    if reports:
+        labels = [f"{run_report['run']} — {run_report['started_at']}" for _, run_report in reports]
+        choice = st.selectbox("Run", range(len(reports)), format_func=lambda i: labels[i])
+        show_metrics(reports[choice][1])
+        st.caption(f"Report file: {reports[choice][0]}")
+    else:
+        st.info("No run metrics yet. Run a screening (CLI or Batch page) to record one.")
+    st.caption("Set PROFILE_MODE=cprofile before starting a run to add a profile to its report.")
+
 elif section == "⚙️ Settings":
     st.header("Configuration")
     st.write(f"**Model Provider:** {MODEL_PROVIDER}")
     st.info("To switch models, edit the `config.py` file.")
+
+    st.subheader("Caches")
+    st.caption("Uploads, embeddings and result tables are cached across reruns and sessions.")
+    if st.button("Clear cached results and embeddings"):
+        st.cache_data.clear()
+        st.success("Cached data cleared.")
+    if st.button("Reload models"):
+        from app import models
+        from app.parser import unload_nlp
+
+        # load_models() is only a cache entry; the models themselves are module-level singletons
+        if MODEL_PROVIDER == "local":
+            models.unload_model()
+        unload_nlp()
+        st.cache_resource.clear()
+        st.success("Models will be reloaded on next use.")
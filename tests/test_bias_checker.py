@@ -1,6 +1,9 @@
 # tests/test_bias_checker.py
 
-from app.bias_checker import simulate_bias_check
+import numpy as np
+import torch
+import app.bias_checker as bias_checker
+from app.bias_checker import simulate_bias_check, summarize_bias, inject_name
 from pathlib import Path
 
 def test_simulate_bias_check():
@@ -16,5 +19,42 @@ def test_simulate_bias_check():
 
     print("\ntest_simulate_bias_check passed.")
 
+def test_inject_name_replaces_first_line():
+    assert inject_name("John Doe\nPython, SQL", "Wei Zhang") == "Wei Zhang\nPython, SQL", "First line should be the name"
+    assert inject_name("", "Wei Zhang") == "Wei Zhang", "Empty resumes should not crash"
+
+def test_summarize_bias_flags_consistent_shift():
+    rng = np.random.default_rng(0)
+    baseline = rng.uniform(20, 60, size=200)
+    noise = rng.normal(0, 0.1, size=(200, 2))
+    scores = baseline[:, None] + noise + np.array([0.0, 1.5])  # second name always gets +1.5
+
+    summary, spread = summarize_bias(baseline, scores, names=["Name A", "Name B"])
+    by_name = summary.set_index("name")
+
+    assert spread.shape == (200,), "One spread value per resume"
+    assert abs(by_name.loc["Name B", "mean_delta"] - 1.5) < 0.05, "Mean delta should recover the shift"
+    assert bool(by_name.loc["Name B", "significant"]), "A consistent shift should be significant"
+    assert not bool(by_name.loc["Name A", "significant"]), "Pure noise should not be significant"
+
+    print("\ntest_summarize_bias passed.")
+
+def test_name_variants_skip_the_embedding_cache(monkeypatch):
+    calls = []
+
+    def embed_documents(texts, batch_size=None, use_cache=True):
+        calls.append((list(texts), use_cache))
+        return torch.ones((len(texts), 4))
+
+    monkeypatch.setattr(bias_checker, "embed_documents", embed_documents)
+    monkeypatch.setattr(bias_checker, "get_embedding", lambda text: torch.ones((1, 4)))
+    baseline, scores = bias_checker.score_name_variants("JD", ["A\nPython", "B\nSQL"], names=["X", "Y"])
+
+    assert baseline.shape == (2,) and scores.shape == (2, 2), "One baseline per resume, one score per name"
+    cached = [text for texts, use_cache in calls if use_cache for text in texts]
+    uncached = [text for texts, use_cache in calls if not use_cache for text in texts]
+    assert cached == ["A\nPython", "B\nSQL"], "Only the original resumes should be cached"
+    assert sorted(uncached) == ["X\nPython", "X\nSQL", "Y\nPython", "Y\nSQL"], "Name variants bypass the cache"
+
 if __name__ == "__main__":
     test_simulate_bias_check()
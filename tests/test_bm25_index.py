@@ -0,0 +1,111 @@
+# tests/test_bm25_index.py
+
+import math
+import shutil
+from collections import Counter
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import torch
+import app.models as models
+from app.bm25_index import BM25Index, encode_varints, decode_varints, tokenize, fuse, run_hybrid_screening
+
+DOCS = {
+    "a.pdf": "Python developer with Flask and FastAPI backend experience",
+    "b.pdf": "Java Spring engineer, some Python scripting",
+    "c.pdf": "Machine learning, NLP and PyTorch research in Python, Python, Python",
+    "d.pdf": "Customer service and data entry specialist",
+    "e.pdf": "Backend engineer: Go, Kubernetes, AWS",
+}
+
+def _reference_bm25(docs, query, k1=1.2, b=0.75):
+    tokens = {name: tokenize(text) for name, text in docs.items()}
+    avg = sum(len(t) for t in tokens.values()) / len(tokens)
+    scores = {}
+    for term in set(tokenize(query)):
+        df = sum(term in t for t in tokens.values())
+        idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+        for name, t in tokens.items():
+            tf = Counter(t)[term]
+            if tf:
+                scores[name] = scores.get(name, 0) + idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(t) / avg))
+    return scores
+
+def test_varints_round_trip():
+    values = np.array([0, 1, 127, 128, 16_383, 16_384, 2**35, 2**63 + 7], dtype=np.uint64)
+    encoded = encode_varints(values)
+    assert len(encoded) < values.size * 8, "Small values should take fewer bytes than uint64"
+    assert (decode_varints(encoded) == values).all(), "Decoding should give the original values"
+
+def test_incremental_index_matches_reference(tmp_path):
+    index = BM25Index(tmp_path / "bm25.sqlite")
+    items = list(DOCS.items())
+    index.add(items[:2])
+    index.add(items[2:])  # appends to existing posting lists
+    query = "Python backend developer with Flask"
+
+    expected = _reference_bm25(DOCS, query)
+    results = index.search(query, k=10)
+    assert [name for name, _ in results] == sorted(expected, key=expected.get, reverse=True), "Ranking mismatch"
+    assert np.allclose([s for _, s in results], sorted(expected.values(), reverse=True), rtol=1e-5), "BM25 score mismatch"
+    assert index.search(query, k=2) == results[:2], "k should cut the ranking"
+    assert "d.pdf" not in dict(results), "Documents without query terms are never candidates"
+
+def test_remove_replace_and_reopen(tmp_path):
+    index = BM25Index(tmp_path / "bm25.sqlite")
+    index.add(DOCS.items())
+    index.remove(["c.pdf", "missing.pdf"])
+    index.add([("a.pdf", "Accountant, Excel and payroll")])  # replaced text
+    docs = {name: text for name, text in DOCS.items() if name != "c.pdf"}
+    docs["a.pdf"] = "Accountant, Excel and payroll"
+
+    reopened = BM25Index(tmp_path / "bm25.sqlite")  # compaction ran (2 stale of 6 docs)
+    query = "Python backend payroll"
+    expected = _reference_bm25(docs, query)
+    results = reopened.search(query, k=10)
+    assert len(reopened) == 4 and "c.pdf" not in reopened, "Removal should persist"
+    assert [name for name, _ in results] == sorted(expected, key=expected.get, reverse=True), "Stale postings must not count"
+    assert np.allclose([s for _, s in results], sorted(expected.values(), reverse=True), rtol=1e-5), "Scores after removal"
+
+def test_reopen_after_removing_newest_doc(tmp_path):
+    index = BM25Index(tmp_path / "bm25.sqlite")
+    index.add(DOCS.items())
+    index.remove(["e.pdf"])  # highest doc id; 1 stale of 5 stays below the compaction ratio
+    index.close()
+
+    reopened = BM25Index(tmp_path / "bm25.sqlite")
+    results = reopened.search("kubernetes python", k=10)
+    assert "e.pdf" not in dict(results) and len(results) == 3, "Stale postings of the newest doc are skipped"
+    reopened.add([("f.pdf", "Kubernetes operator")])
+    assert reopened.search("kubernetes", k=10)[0][0] == "f.pdf", "New ids continue after the removed one"
+
+def test_prefilter_screening_embeds_only_candidates(tmp_path, monkeypatch):
+    resume_dir = tmp_path / "resumes"
+    resume_dir.mkdir()
+    for pdf in sorted(Path("data/resumes_test").glob("*.pdf"))[:6]:
+        shutil.copy(pdf, resume_dir / pdf.name)
+    embedded = []
+    monkeypatch.setattr(models, "get_embedding", lambda text: torch.ones(1, 4))
+    monkeypatch.setattr(models, "embed_documents",
+                        lambda texts: embedded.extend(texts) or torch.rand(len(texts), 4))
+
+    csv_path = tmp_path / "results.csv"
+    index = BM25Index(tmp_path / "bm25.sqlite")
+    shortlist = run_hybrid_screening("Python developer with machine learning", resume_dir, csv_path,
+                                     top_n=2, prefilter_k=3, index=index)
+
+    results = pd.read_csv(csv_path)
+    assert len(index) == 6 and len(embedded) == len(results) <= 3, "Only the BM25 candidates are embedded"
+    assert list(results.columns) == ["file", "score", "shortlisted", "bm25", "fused"], "CSV keeps the screening columns"
+    assert [row["file"] for row in shortlist] == list(results["file"][:2]), "Shortlist is the top of the fused ranking"
+
+def test_fusion():
+    lexical = {"a": 12.0, "b": 6.0, "c": 3.0}
+    dense = {"a": 0.20, "b": 0.50, "c": 0.40}
+
+    rrf = fuse(lexical, dense, "rrf")
+    assert max(rrf, key=rrf.get) == "b", "b ranks 2nd and 1st: best combined rank"
+    linear = fuse(lexical, dense, "linear", alpha=0.5)
+    assert np.isclose(linear["a"], 0.5 * 0.20 + 0.5 * 1.0), "Linear fusion scales BM25 by the best candidate"
+
+    print("\ntest_bm25_index passed.")
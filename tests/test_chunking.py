@@ -0,0 +1,40 @@
+# tests/test_chunking.py
+
+import re
+import torch
+import app.models as models
+
+def _word_spans(text):
+    return [m.span() for m in re.finditer(r"\S+", text)]
+
+def test_chunk_text_overlapping_windows(monkeypatch):
+    monkeypatch.setattr(models, "_token_spans", _word_spans)
+    text = " ".join(f"w{i}" for i in range(10))
+
+    chunks = models.chunk_text(text, max_tokens=4, overlap=1)
+
+    assert chunks == ["w0 w1 w2 w3", "w3 w4 w5 w6", "w6 w7 w8 w9"], "Windows should overlap by one token"
+    assert models.chunk_text("short text", max_tokens=4) == ["short text"], "Short texts stay whole"
+
+def test_pool_chunks_mean_and_max():
+    chunk_embeddings = torch.tensor([[1.0, 0.0], [0.0, 1.0], [3.0, 4.0]])
+    owners = [0, 0, 1]  # first doc has two chunks, second doc one
+
+    mean = models.pool_chunks(chunk_embeddings, owners, 2, "mean")
+    maxed = models.pool_chunks(chunk_embeddings, owners, 2, "max")
+
+    assert torch.allclose(mean[0], torch.tensor([0.5, 0.5])), "Mean of normalized chunk vectors"
+    assert torch.allclose(mean[1], torch.tensor([0.6, 0.8])), "Single chunk is just normalized"
+    assert torch.allclose(maxed[0], torch.tensor([1.0, 1.0])), "Element-wise max over chunks"
+
+def test_score_chunked_best_chunk(monkeypatch):
+    vectors = {"python": [1.0, 0.0], "sales": [0.0, 1.0]}
+    monkeypatch.setattr(models, "chunk_text", lambda text: text.split("|"))
+    monkeypatch.setattr(models, "get_embeddings",
+                        lambda texts, batch_size=None, use_cache=True: torch.tensor([vectors[t] for t in texts]))
+
+    scores = models.score_chunked(torch.tensor([1.0, 0.0]), ["sales|python", "sales"], pooling="best")
+
+    assert torch.allclose(scores, torch.tensor([1.0, 0.0])), "Best chunk should decide each document's score"
+
+    print("\ntest_chunking passed.")
@@ -0,0 +1,88 @@
+# tests/test_compact_index.py
+
+import json
+import numpy as np
+import pytest
+import app.compact_index as compact_index
+from app.compact_index import CompactResumeIndex, quantize
+from app.resume_index import ResumeIndex
+
+def _vectors(count=2000, dim=64, seed=0):
+    return np.random.default_rng(seed).normal(size=(count, dim)).astype(np.float32)
+
+def test_int8_quantization_error_is_small():
+    vectors = _vectors(count=100)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    codes, scales = quantize(vectors, "int8")
+
+    assert codes.dtype == np.int8 and scales.shape == (100,), "int8 codes need one scale per vector"
+    assert np.abs(codes * scales[:, None] - vectors).max() <= scales.max() / 2 + 1e-7, "Error should be at most half a step"
+
+def test_shortlists_match_exact_search(tmp_path):
+    vectors = _vectors()
+    ids = [f"resume_{i}.pdf" for i in range(len(vectors))]
+    exact = ResumeIndex()
+    exact.add(ids, vectors)
+
+    for dtype in ("int8", "float16"):
+        compact = CompactResumeIndex(tmp_path / dtype, dtype=dtype)
+        compact.add(ids, vectors)
+        for query in vectors[:20] + 0.05:
+            expected = exact.search(query, k=10)
+            results = compact.search(query, k=10)
+            assert [r for r, _ in results] == [r for r, _ in expected], f"{dtype} shortlist differs from exact search"
+            assert np.allclose([s for _, s in results], [s for _, s in expected], atol=1e-5), "Re-ranked scores should be exact"
+
+    assert compact.nbytes_per_vector == 64 * 2, "float16 codes are half the size of fp32"
+
+def test_reopen_add_and_remove(tmp_path):
+    vectors = _vectors(count=50, dim=16)
+    compact = CompactResumeIndex(tmp_path, dtype="int8")
+    compact.add([f"resume_{i}.pdf" for i in range(50)], vectors)
+    compact.remove(["resume_3.pdf", "missing.pdf"])
+
+    reopened = CompactResumeIndex(tmp_path)
+    assert len(reopened) == 49 and "resume_3.pdf" not in reopened, "Removal should persist"
+    assert reopened.search(vectors[49], k=1)[0][0] == "resume_49.pdf", "Moved row should still be found"
+
+    reopened.add(["resume_new.pdf"], vectors[3:4])
+    assert reopened.search(vectors[3], k=1)[0][0] == "resume_new.pdf", "Re-added vector should be found"
+
+
+def test_updates_append_to_the_id_log(tmp_path, monkeypatch):
+    monkeypatch.setattr(compact_index, "LOG_COMPACT_MIN", 8)
+    vectors = _vectors(count=20, dim=8)
+    compact = CompactResumeIndex(tmp_path, dtype="float16")
+    compact.add([f"resume_{i}.pdf" for i in range(6)], vectors[:6])
+    compact.flush()
+
+    compact.add(["resume_6.pdf"], vectors[6:7])
+    compact.add(["resume_0.pdf"], vectors[0:1] * 2)  # overwrite: no new id to log
+    compact.remove(["resume_1.pdf"])
+    assert json.loads((tmp_path / "ids.json").read_text()) == [f"resume_{i}.pdf" for i in range(6)], \
+        "Single updates should not rewrite ids.json"
+    assert len((tmp_path / "ids.log").read_text().splitlines()) == 2, "One log entry per new or moved row"
+    assert CompactResumeIndex(tmp_path).ids == compact.ids, "Reopening replays the log"
+
+    for _ in range(20):  # churn: every add logs one entry
+        compact.add(["temp.pdf"], vectors[7:8])
+        compact.remove(["temp.pdf"])
+    log_file = tmp_path / "ids.log"
+    assert not log_file.exists() or len(log_file.read_text().splitlines()) <= 8, "A long log is compacted"
+    assert CompactResumeIndex(tmp_path).ids == compact.ids, "Compaction keeps the ids"
+
+def test_remove_of_unknown_ids_does_not_write(tmp_path):
+    compact = CompactResumeIndex(tmp_path)
+    compact.remove(["missing.pdf"])
+    assert not (tmp_path / "meta.json").exists(), "Nothing removed, nothing to persist"
+
+    compact.flush()  # an empty index on disk has no dim yet
+    assert len(CompactResumeIndex(tmp_path)) == 0, "Reopening an empty index should not map zero-dim files"
+
+def test_conflicting_dtype_raises(tmp_path):
+    CompactResumeIndex(tmp_path, dtype="int8").add(["resume_0.pdf"], _vectors(count=1, dim=8))
+    assert CompactResumeIndex(tmp_path).dtype == "int8", "The stored dtype is used by default"
+    with pytest.raises(ValueError):
+        CompactResumeIndex(tmp_path, dtype="float16")
+
+    print("\ntest_compact_index passed.")
@@ -0,0 +1,57 @@
+# tests/test_embedding_cache.py
+
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from app.embedding_cache import EmbeddingCache, text_key
+
+def test_cache_roundtrip_and_persistence(tmp_path):
+    cache = EmbeddingCache(tmp_path, "local", "all-MiniLM-L6-v2", max_entries=10)
+    keys = [text_key("resume one"), text_key("resume two")]
+    cache.put_many(keys, np.array([[1.0, 0.0], [0.0, 1.0]]))
+    cache.close()
+
+    # A new instance must see the vectors written by the previous run
+    reopened = EmbeddingCache(tmp_path, "local", "all-MiniLM-L6-v2", max_entries=10)
+    found = reopened.get_many(keys + [text_key("unknown")])
+
+    assert set(found) == set(keys), "Only stored keys should be returned"
+    assert np.allclose(found[keys[1]], [0.0, 1.0]), "Stored vector should round-trip"
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = EmbeddingCache(tmp_path, "local", "all-MiniLM-L6-v2", max_entries=2, dtype="float16")
+    cache.put_many(["a"], [[1.0, 0.0]])
+    cache.put_many(["b"], [[0.0, 1.0]])
+    cache.get_many(["a"])  # "a" is now more recent than "b"
+    cache.put_many(["c"], [[1.0, 1.0]])
+
+    assert len(cache) == 2, "Cache must not grow beyond max_entries"
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}, "Least recently used entry should be evicted"
+
+def test_cache_namespaces_by_model(tmp_path):
+    EmbeddingCache(tmp_path, "local", "model-a").put_many(["k"], [[1.0, 2.0]])
+    other = EmbeddingCache(tmp_path, "local", "model-b")
+
+    assert other.get_many(["k"]) == {}, "Different models must not share cached vectors"
+
+def _write_keys(cache_dir, worker):
+    cache = EmbeddingCache(cache_dir, "local", "all-MiniLM-L6-v2", max_entries=1_000)
+    for start in range(0, 100, 10):
+        ids = range(worker * 100 + start, worker * 100 + start + 10)
+        cache.put_many([f"k{i}" for i in ids], [[float(i), 1.0] for i in ids])
+
+def test_cache_shared_across_processes(tmp_path):
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(_write_keys, [tmp_path] * 4, range(4)))
+
+    cache = EmbeddingCache(tmp_path, "local", "all-MiniLM-L6-v2", max_entries=1_000)
+    found = cache.get_many([f"k{i}" for i in range(400)])
+    assert len(found) == 400, "Concurrent writers must not take each other's slots"
+    assert all(found[f"k{i}"][0] == i for i in range(400)), "Every key should point at its own vector"
+
+def test_cache_hits_are_copies(tmp_path):
+    cache = EmbeddingCache(tmp_path, "local", "all-MiniLM-L6-v2", max_entries=1)
+    cache.put_many(["a"], [[1.0, 0.0]])
+    hit = cache.get_many(["a"])["a"]
+    cache.put_many(["b"], [[0.0, 1.0]])  # evicts "a" and reuses its slot
+
+    assert np.allclose(hit, [1.0, 0.0]), "A returned vector must not change when its slot is reused"
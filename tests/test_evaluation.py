@@ -1,4 +1,67 @@
+import numpy as np
+import app.evaluation as evaluation
+from sklearn.metrics import roc_auc_score, average_precision_score, precision_recall_fscore_support
 from config import MODEL_PROVIDER
+from app.results_store import ResultsStore
+from app.evaluation import (
+    threshold_sweep, roc_auc, average_precision, optimal_threshold, metrics_at, bootstrap_ci,
+    labeled_scores, load_ground_truth,
+)
+
+def _synthetic(n=5_000, seed=0):
+    rng = np.random.default_rng(seed)
+    y_true = rng.random(n) < 0.3
+    scores = np.round(rng.normal(0.25 + 0.15 * y_true, 0.1), 3)  # rounded: many tied scores
+    return y_true, scores
+
+def test_sweep_matches_sklearn():
+    y_true, scores = _synthetic()
+    sweep = threshold_sweep(y_true, scores)
+
+    assert np.all(np.diff(sweep["threshold"]) < 0), "One row per distinct score, highest first"
+    assert np.isclose(roc_auc(sweep), roc_auc_score(y_true, scores)), "ROC AUC mismatch"
+    assert np.isclose(average_precision(sweep), average_precision_score(y_true, scores)), "AP mismatch"
+    for threshold in (0.2, 0.3, 0.45):
+        precision, recall, f1, _ = precision_recall_fscore_support(y_true, scores >= threshold, average="binary")
+        assert np.allclose(list(metrics_at(sweep, threshold).values())[:3], [precision, recall, f1]), \
+            f"Metrics at {threshold} mismatch"
+
+    best, best_f1 = optimal_threshold(sweep)
+    brute = max(precision_recall_fscore_support(y_true, scores >= t, average="binary")[2] for t in np.unique(scores))
+    assert np.isclose(best_f1, brute) and np.isclose(metrics_at(sweep, best)["f1"], best_f1), "Best F1 threshold"
+
+def test_bootstrap_ci():
+    y_true, scores = _synthetic(2_000)
+    serial = bootstrap_ci(y_true, scores, 0.3, n_samples=200, max_workers=1)
+    parallel = bootstrap_ci(y_true, scores, 0.3, n_samples=200, max_workers=2)
+    assert serial == parallel, "Intervals should not depend on the worker count"
+
+    auc = roc_auc_score(y_true, scores)
+    low, high = serial["roc_auc"]
+    assert low < auc < high and high - low < 0.1, f"AUC {auc:.3f} should sit in a tight interval, got {serial['roc_auc']}"
+
+def test_labeled_scores_are_cached(tmp_path):
+    ground_truth = load_ground_truth()
+    store = ResultsStore(tmp_path / "results.sqlite")
+    calls = []
+
+    def score(paths, texts):
+        calls.extend(paths)
+        return [float(len(text) % 100) for text in texts]
+
+    files, y_true, scores = labeled_scores(ground_truth, "Python developer", store, score)
+    assert len(calls) == len(files) == len(scores), "Every labeled resume is scored on the first run"
+    assert list(y_true) == [ground_truth[name] for name in files], "Labels line up with files"
+
+    calls.clear()
+    again = labeled_scores(ground_truth, "Python developer", store, score)
+    assert calls == [] and np.array_equal(again[2], scores), "Re-evaluation reads scores from the store"
+
+def test_no_labeled_resumes_exits_cleanly(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(evaluation, "load_ground_truth", lambda: {"missing_1.pdf": 1, "missing_2.pdf": 0})
+    evaluation.evaluate_resumes(store=ResultsStore(tmp_path / "results.sqlite"), score=lambda paths, texts: [])
+
+    assert "No labeled resumes found" in capsys.readouterr().out, "An empty evaluation should say so, not raise"
 
 if MODEL_PROVIDER == "openai":
     print("OpenAI model detected during testing.")
@@ -9,4 +72,4 @@ else:
     if __name__ == "__main__":
         evaluate_resumes()
         print("\nEvaluation test passed (LOCAL embeddings).")
-        print("Evaluation test completed successfully."  )
\ No newline at end of file
+        print("Evaluation test completed successfully."  )
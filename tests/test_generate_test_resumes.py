@@ -0,0 +1,14 @@
+# tests/test_generate_test_resumes.py
+
+from app.generate_test_resumes import generate_resumes
+from app.parser import extract_text_from_pdf
+
+def test_generate_resumes_is_reproducible(tmp_path):
+    labels = generate_resumes(tmp_path / "a", 4, seed=7)
+    assert labels == {"resume_1.pdf": 0, "resume_2.pdf": 1, "resume_3.pdf": 0, "resume_4.pdf": 1}, "Even resumes are relevant"
+    assert len(list((tmp_path / "a").glob("*.pdf"))) == 4, "One PDF per resume"
+
+    generate_resumes(tmp_path / "b", 4, seed=7)
+    first = extract_text_from_pdf(tmp_path / "a" / "resume_3.pdf")
+    assert first.startswith("Name: "), "Resume should carry a name line"
+    assert first == extract_text_from_pdf(tmp_path / "b" / "resume_3.pdf"), "Same seed should give the same corpus"
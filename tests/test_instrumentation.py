@@ -0,0 +1,63 @@
+# tests/test_instrumentation.py
+
+import json
+import threading
+from app import instrumentation
+from app.instrumentation import Histogram, timed, count, run_metrics, report, load_reports
+
+def test_histogram_percentiles_are_close():
+    histogram = Histogram()
+    for ms in range(1, 1001):
+        histogram.observe(ms / 1000)
+
+    summary = histogram.summary()
+    assert summary["count"] == 1000, "Every sample should be counted"
+    assert abs(summary["p50_ms"] - 500) / 500 < 0.06, f"p50 off: {summary['p50_ms']}"
+    assert abs(summary["p95_ms"] - 950) / 950 < 0.06, f"p95 off: {summary['p95_ms']}"
+    assert summary["max_ms"] == 1000.0, "Max is exact"
+
+def test_timed_as_block_and_decorator():
+    instrumentation.reset()
+
+    @timed("work")
+    def work():
+        return 42
+
+    assert work() == 42, "Decorated function keeps its return value"
+    with timed("work"):
+        pass
+    count("things", 3)
+
+    metrics = report()
+    assert metrics["stages"]["work"]["count"] == 2, "Both the call and the block are timed"
+    assert metrics["counters"] == {"things": 3}, "Counters accumulate"
+
+def test_run_metrics_writes_report_and_profile(tmp_path):
+    with run_metrics("unit", output_dir=tmp_path, profile="cprofile"):
+        with timed("stage"):
+            sum(range(1000))
+
+    saved = json.loads((tmp_path / "latest.json").read_text(encoding="utf-8"))
+    assert saved["run"] == "unit" and "stage" in saved["stages"], "Report should name the run and its stages"
+    assert saved["profile"]["top_functions"], "cProfile mode should list top functions"
+    assert list(tmp_path.glob("*.prof")), "cProfile mode should save a .prof file"
+    assert [r["run"] for _, r in load_reports(tmp_path)] == ["unit"], "latest.json is not listed twice"
+
+def test_concurrent_runs_keep_separate_metrics(tmp_path):
+    barrier = threading.Barrier(2)
+
+    def run(name, n):
+        with run_metrics(name, output_dir=tmp_path / name, profile=""):
+            barrier.wait()  # both runs are active at the same time
+            count("rows", n)
+            barrier.wait()
+
+    threads = [threading.Thread(target=run, args=(f"job{n}", n)) for n in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for n in (1, 2):
+        saved = json.loads((tmp_path / f"job{n}" / "latest.json").read_text(encoding="utf-8"))
+        assert saved["counters"] == {"rows": n}, f"Run job{n} picked up another run's counters: {saved['counters']}"
@@ -0,0 +1,106 @@
+# tests/test_jobs.py
+
+import csv
+import json
+import threading
+import time
+import app.results_store as results_store
+from app.jobs import JobManager, job_key
+from app.instrumentation import timed, load_reports
+
+def _resume_dir(tmp_path, n=3):
+    resume_dir = tmp_path / "resumes"
+    resume_dir.mkdir()
+    for i in range(n):
+        (resume_dir / f"resume_{i}.pdf").write_bytes(b"%PDF stub")
+    return resume_dir
+
+def _fake_screen(calls):
+    def screen(jd_text, resume_dir, csv_path, jsonl_path, threshold, top_n=50, resume=False, on_row=None,
+               on_cached=None):
+        calls.append(resume)
+        rows = [{"file": f"resume_{i}.pdf", "score": float(i), "shortlisted": "❌"} for i in range(3)]
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["file", "score", "shortlisted"])
+            writer.writeheader()
+            writer.writerows(rows)
+        for row in rows:
+            with timed("score_batch"):
+                on_row(row)
+        return sorted(rows, key=lambda r: r["score"], reverse=True)[:top_n]
+    return screen
+
+def test_job_runs_in_background_and_is_reused(tmp_path):
+    calls = []
+    resume_dir = _resume_dir(tmp_path)
+    jobs = JobManager(tmp_path / "jobs", max_workers=1, screen=_fake_screen(calls), metrics_dir=tmp_path / "metrics")
+
+    job_id = jobs.submit("Python developer", resume_dir)
+    job = jobs.wait(job_id, timeout=10)
+    assert job["status"] == "done" and job["processed"] == job["total"] == 3, f"Job should finish: {job}"
+    assert jobs.results_path(job_id).exists(), "Results CSV should be in the job store"
+    assert jobs.shortlist(job_id)[0]["score"] == 2.0, "Shortlist is stored best first"
+
+    assert jobs.submit("Python developer", resume_dir) == job_id, "Identical submission reuses the finished job"
+    other_id = jobs.submit("Data engineer", resume_dir)
+    assert other_id != job_id, "A different JD is a new job"
+    jobs.wait(other_id, timeout=10)
+    assert len(calls) == 2, "Only the two distinct jobs are screened"
+
+    reports = {report["run"]: report for _, report in load_reports(tmp_path / "metrics")}
+    assert set(reports) == {f"ui_batch_screening_{job_id}", f"ui_batch_screening_{other_id}"}, "One report per job"
+    assert all(r["stages"]["score_batch"]["count"] == 3 for r in reports.values()), "Jobs don't share stats"
+
+def test_failed_job_records_error(tmp_path):
+    def broken(*args, **kwargs):
+        raise RuntimeError("model unavailable")
+
+    jobs = JobManager(tmp_path / "jobs", screen=broken, metrics_dir=tmp_path / "metrics")
+    job = jobs.wait(jobs.submit("Python developer", _resume_dir(tmp_path)), timeout=10)
+    assert job["status"] == "failed" and "model unavailable" in job["error"], "Failure should be recorded"
+
+def test_interrupted_job_is_resumed(tmp_path):
+    release = threading.Event()
+
+    def stuck(*args, **kwargs):
+        release.wait(10)
+        return []
+
+    resume_dir = _resume_dir(tmp_path)
+    first = JobManager(tmp_path / "jobs", screen=stuck, metrics_dir=tmp_path / "metrics")
+    job_id = first.submit("Python developer", resume_dir)
+
+    calls = []
+    second = JobManager(tmp_path / "jobs", screen=_fake_screen(calls), metrics_dir=tmp_path / "metrics")  # e.g. restart
+    assert second.get(job_id)["status"] == "interrupted", "Running jobs of a dead process are interrupted"
+    assert second.submit("Python developer", resume_dir) == job_id, "Resubmitting resumes the same job"
+    assert second.wait(job_id, timeout=10)["status"] == "done" and calls == [True], "Job continues from its checkpoint"
+    assert json.loads((tmp_path / "jobs" / job_id / "job.json").read_text(encoding="utf-8"))["status"] == "done", \
+        "Job store on disk should match"
+    release.set()
+
+def test_cached_rows_count_toward_progress(tmp_path):
+    release = threading.Event()
+
+    def cached(*args, on_cached=None, **kwargs):
+        on_cached(3)  # every resume already scored in the results store
+        release.wait(10)
+        return []
+
+    jobs = JobManager(tmp_path / "jobs", screen=cached, metrics_dir=tmp_path / "metrics")
+    job_id = jobs.submit("Python developer", _resume_dir(tmp_path))
+    deadline = time.monotonic() + 10
+    while jobs.get(job_id)["processed"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert jobs.get(job_id)["processed"] == 3, "Cached resumes should show up as progress while the job runs"
+    release.set()
+    jobs.wait(job_id, timeout=10)
+
+def test_job_key_follows_model_key(tmp_path, monkeypatch):
+    args = ("Python developer", tmp_path, 0.5, 10, ("sig", 3))
+    monkeypatch.setattr(results_store, "model_key", lambda: "local:model-a")
+    first = job_key(*args)
+    assert job_key(*args) == first, "Same inputs and model give the same key"
+
+    monkeypatch.setattr(results_store, "model_key", lambda: "local:model-b:chunked-mean")
+    assert job_key(*args) != first, "A different model, backend or chunking should not reuse the old job"
@@ -1,5 +1,5 @@
 from config import MODEL_PROVIDER
-from app.models import get_embedding, extract_skills_with_model
+from app.models import get_embedding, get_embeddings, extract_skills_with_model
 import torch
 
 sample_text = """
@@ -23,3 +23,11 @@ if isinstance(embedding, torch.Tensor):
     print("Embedding shape:", embedding.shape)
 else:
     print("Embedding is not a torch Tensor! Something wrong.")
+
+# Test batched embedding generation (order must follow the input, not the length sort)
+print("\nGenerating Batched Embeddings:")
+batch_texts = [sample_text, "Python developer", "Customer service and data entry specialist"]
+batch_embeddings = get_embeddings(batch_texts, batch_size=2)
+print("Batched embedding shape:", batch_embeddings.shape)
+assert batch_embeddings.shape[0] == len(batch_texts), "One embedding per input text expected"
+assert torch.allclose(batch_embeddings[0], embedding.reshape(-1), atol=1e-4), "Batched output must keep input order"
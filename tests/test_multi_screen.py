@@ -0,0 +1,38 @@
+# tests/test_multi_screen.py
+
+import numpy as np
+from app import multi_screen
+from app.multi_screen import similarity_matrix, shortlists_from_matrix, score_resume_stream
+
+def test_similarity_matrix_matches_pairwise_cosine():
+    rng = np.random.default_rng(0)
+    jds, resumes = rng.normal(size=(3, 8)), rng.normal(size=(10, 8))
+
+    matrix = similarity_matrix(jds, resumes, chunk_size=4)  # chunking must not change the result
+    expected = [[a @ b / (np.linalg.norm(a) * np.linalg.norm(b)) for b in resumes] for a in jds]
+
+    assert matrix.shape == (3, 10), "Matrix should be n_jds x n_resumes"
+    assert np.allclose(matrix, expected, atol=1e-5), "Chunked matmul should equal pairwise cosine"
+
+def test_score_resume_stream_matches_similarity_matrix(monkeypatch):
+    rng = np.random.default_rng(1)
+    jds, resumes = rng.normal(size=(2, 8)), rng.normal(size=(7, 8))
+    vectors = {f"r{i}": vector for i, vector in enumerate(resumes)}
+    monkeypatch.setattr(multi_screen, "embed_documents", lambda texts: np.stack([vectors[t] for t in texts]))
+
+    paths, matrix = score_resume_stream(jds, [(f"{t}.pdf", t) for t in vectors], chunk_size=3)
+    assert paths == [f"r{i}.pdf" for i in range(7)], "Columns follow the document order"
+    assert np.allclose(matrix, similarity_matrix(jds, resumes), atol=1e-6), "Streamed scores equal the full matrix"
+
+def test_shortlists_ranked_per_jd():
+    matrix = np.array([[0.10, 0.50, 0.35, 0.20],
+                       [0.90, 0.05, 0.25, 0.31]], dtype=np.float32)
+    shortlists = shortlists_from_matrix(matrix, ["backend", "data"], ["a.pdf", "b.pdf", "c.pdf", "d.pdf"],
+                                        threshold=0.30, top_n=2)
+
+    assert [r["file"] for r in shortlists["backend"]] == ["b.pdf", "c.pdf"], "Backend ranking wrong"
+    assert [r["file"] for r in shortlists["data"]] == ["a.pdf", "d.pdf"], "Data ranking wrong"
+    assert shortlists["data"][1]["shortlisted"] == "✅", "31% is above the 30% threshold"
+    assert shortlists["backend"][0]["rank"] == 1 and shortlists["backend"][0]["score"] == 50.0, "Score/rank wrong"
+
+    print("\ntest_multi_screen passed.")
@@ -0,0 +1,76 @@
+# tests/test_openai_async.py
+
+import asyncio
+import time
+from types import SimpleNamespace
+from app.openai_async import AsyncOpenAIProvider, TokenBucket
+
+class RateLimited(Exception):
+    status_code = 429
+
+class StubEmbeddings:
+    """Mimics client.embeddings.create: vector = [len(text)], items returned in reverse order."""
+
+    def __init__(self, fail_first=0):
+        self.requests = []
+        self.fail_first = fail_first
+        self.in_flight = self.max_in_flight = 0
+
+    async def create(self, model, input):
+        self.requests.append(list(input))
+        if self.fail_first:
+            self.fail_first -= 1
+            raise RateLimited("slow down")
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        data = [SimpleNamespace(index=i, embedding=[float(len(text))]) for i, text in enumerate(input)]
+        return SimpleNamespace(data=list(reversed(data)))
+
+def _provider(embeddings, **kwargs):
+    client = SimpleNamespace(embeddings=embeddings)
+    return AsyncOpenAIProvider(client=client, backoff_base=0.001, **kwargs)
+
+def test_embed_packs_dedups_and_keeps_order():
+    stub = StubEmbeddings()
+    provider = _provider(stub, inputs_per_request=2, max_concurrency=2)
+    texts = ["a", "bbb", "a", "cc", "dddd", "bbb"]
+
+    vectors = asyncio.run(provider.embed(texts))
+
+    assert vectors == [[1.0], [3.0], [1.0], [2.0], [4.0], [3.0]], "Vectors must follow input order"
+    assert sorted(len(r) for r in stub.requests) == [2, 2], "4 distinct texts -> 2 packed requests"
+    assert stub.max_in_flight <= 2, "Concurrency limit exceeded"
+
+def test_concurrent_calls_share_inflight_requests():
+    stub = StubEmbeddings()
+    provider = _provider(stub)
+
+    async def both():
+        return await asyncio.gather(provider.embed(["same resume"]), provider.embed(["same resume"]))
+
+    first, second = asyncio.run(both())
+    assert first == second == [[11.0]], "Both callers should get the embedding"
+    assert len(stub.requests) == 1, "Duplicate in-flight text should be requested once"
+
+def test_retries_rate_limit_errors():
+    stub = StubEmbeddings(fail_first=2)
+    vectors = asyncio.run(_provider(stub).embed(["resume"]))
+
+    assert vectors == [[6.0]], "Request should succeed after retries"
+    assert len(stub.requests) == 3, "Two 429s then one success"
+
+def test_token_bucket_throttles():
+    async def take(bucket, n):
+        for _ in range(n):
+            await bucket.acquire(1)
+
+    bucket = TokenBucket(rate_per_minute=600, capacity=5)  # 10 tokens/s after a burst of 5
+    start = time.monotonic()
+    asyncio.run(take(bucket, 8))
+    elapsed = time.monotonic() - start
+
+    assert 0.25 <= elapsed < 1.0, f"3 tokens beyond the burst should take ~0.3s, took {elapsed:.2f}s"
+
+    print("\ntest_openai_async passed.")
@@ -1,5 +1,8 @@
 from pathlib import Path
-from app.parser import parse_resume
+import pickle
+import spacy
+import app.parser as parser_module
+from app.parser import parse_resume, parse_resumes, extract_text_from_pdf, extract_texts_parallel, extract_names, extract_email, extract_phone
 
 def test_parse_resume():
     resume_path = Path("data/resumes/sample_resume.pdf")
@@ -13,5 +16,68 @@ def test_parse_resume():
 
     print("test_parse_resume passed — All fields extracted properly!")
 
+def test_extract_texts_parallel(tmp_path):
+    resume_paths = sorted(Path("data/resumes").glob("*.pdf"))[:6]
+    corrupt_path = tmp_path / "corrupt.pdf"
+    corrupt_path.write_bytes(b"not a pdf")
+
+    extracted = dict(extract_texts_parallel(resume_paths + [corrupt_path], max_workers=2))
+
+    assert len(extracted) == len(resume_paths) + 1, "Every input path should be yielded once"
+    assert extracted[corrupt_path] is None, "Corrupt PDFs should yield None instead of raising"
+    for resume_path in resume_paths:
+        assert extracted[resume_path] == extract_text_from_pdf(resume_path), "Parallel text should match serial text"
+
+    print("test_extract_texts_parallel passed.")
+
+def test_header_ner_and_batched_names(monkeypatch):
+    # A blank pipeline with a rule-based PERSON entity stands in for en_core_web_sm
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([
+        {"label": "PERSON", "pattern": "Alice Smith"},
+        {"label": "PERSON", "pattern": "Bob Referee"},
+    ])
+    monkeypatch.setattr(parser_module, "_nlp", nlp)
+
+    header_resume = "Alice Smith\nalice@example.com | +1 555-123-4567\n" + "Python developer.\n" * 100
+    references_only = "Summary\n" + "Built data pipelines.\n" * 100 + "References: Bob Referee"
+
+    assert extract_names([header_resume, references_only]) == ["Alice Smith", None], \
+        "Names should come from the header only"
+    assert extract_email(header_resume) == "alice@example.com", "Email not extracted"
+    assert extract_phone(header_resume) == "+1 555-123-4567", "Phone not extracted"
+
+    print("test_header_ner_and_batched_names passed.")
+
+def test_unload_nlp_reloads_pipeline(monkeypatch):
+    loads = []
+    monkeypatch.setattr(spacy, "load", lambda *args, **kwargs: loads.append(args) or object())
+    monkeypatch.setattr(parser_module, "_nlp", None)
+
+    first = parser_module.get_nlp()
+    assert parser_module.get_nlp() is first and len(loads) == 1, "The pipeline loads once"
+    parser_module.unload_nlp()
+    assert parser_module.get_nlp() is not first and len(loads) == 2, "Unloading makes the next call load again"
+
+def test_lazy_fields_are_selected_and_memoized(monkeypatch):
+    calls = []
+    monkeypatch.setitem(parser_module._EXTRACTORS, "skills", lambda text: calls.append(text) or ["Python"])
+    monkeypatch.setattr(parser_module, "extract_skills_many", lambda texts: calls.extend(texts) or [["SQL"]] * len(texts))
+    resume_paths = sorted(Path("data/resumes").glob("*.pdf"))[:2]
+
+    (_, parsed), _ = parse_resumes(resume_paths, fields=["email"])
+    assert not calls, "Skills should not be extracted unless asked for"
+    assert parsed["raw_text"] == extract_text_from_pdf(resume_paths[0]), "raw_text should be the full text"
+    assert parsed["preview"] == parsed.raw_text[:1000] and "skills" in parsed, "Dict-style access should still work"
+
+    assert parsed["skills"] == ["Python"] and parsed.skills == ["Python"], "Skills should be extracted on access"
+    assert len(calls) == 1, "Lazy fields should be computed once"
+    assert pickle.loads(pickle.dumps(parsed)).skills == ["Python"] and len(calls) == 1, "Computed fields should survive pickling"
+
+    assert [resume.skills for _, resume in parse_resumes(resume_paths, fields=["skills"])] == [["SQL"]] * 2, \
+        "Requested skills should come from one batched call"
+
+    print("test_lazy_fields_are_selected_and_memoized passed.")
+
 if __name__ == "__main__":
     test_parse_resume()
@@ -0,0 +1,37 @@
+# tests/test_pipeline.py
+
+import json
+from app import results_store
+from app.pipeline import TopN, batched, _load_checkpoint, _run_key
+
+def test_top_n_keeps_best_rows():
+    shortlist = TopN(3)
+    for i, score in enumerate([10.0, 55.5, 3.2, 80.1, 55.5, 1.0]):
+        shortlist.push({"file": f"resume_{i}.pdf", "score": score})
+
+    rows = shortlist.rows()
+    assert [r["score"] for r in rows] == [80.1, 55.5, 55.5], "Shortlist should hold the 3 best scores, best first"
+
+def test_batched_splits_stream():
+    batches = list(batched(range(7), 3))
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]], "Last batch may be short"
+
+def test_checkpoint_ignores_other_runs_and_torn_lines(tmp_path, monkeypatch):
+    checkpoint = tmp_path / "results.jsonl"
+    run_key = _run_key("Python developer", 0.30)
+    checkpoint.write_text(
+        json.dumps({"run": run_key}) + "\n"
+        + json.dumps({"file": "a.pdf", "score": 41.0, "shortlisted": "✅"}) + "\n"
+        + '{"file": "b.pdf", "sco',  # crash mid-write
+        encoding="utf-8",
+    )
+
+    rows = list(_load_checkpoint(checkpoint, run_key))
+    assert [r["file"] for r in rows] == ["a.pdf"], "Only complete rows should be resumed"
+    assert list(_load_checkpoint(checkpoint, _run_key("Another JD", 0.30))) == [], "Other JDs must not reuse the checkpoint"
+
+    monkeypatch.setattr(results_store, "EMBEDDING_CHUNKING", True)
+    assert list(_load_checkpoint(checkpoint, _run_key("Python developer", 0.30))) == [], \
+        "Scores from another model setup must not be reused"
+
+    print("\ntest_pipeline passed.")
@@ -0,0 +1,29 @@
+# tests/test_reporting.py
+
+import numpy as np
+from app.reporting import top_n_figure, distribution_figure, per_jd_figure, render_in_background, render_top_n
+
+def _rows(n):
+    rng = np.random.default_rng(0)
+    return [{"file": f"resume_{i}.pdf", "score": float(score)} for i, score in enumerate(rng.uniform(0, 100, n))]
+
+def test_top_n_chart_size_is_bounded():
+    rows = _rows(10_000)
+    fig = top_n_figure(rows, top_n=50)
+    bars = fig.axes[0].patches
+    assert len(bars) == 50, "Only the top-N resumes get a bar"
+    assert fig.get_size_inches()[1] <= 50 * 0.4 + 1, "Figure height must not grow with the pool"
+    assert bars[0].get_width() == max(row["score"] for row in rows), "Best resume comes first"
+
+def test_distribution_and_per_jd_charts():
+    scores = np.random.default_rng(1).uniform(0, 100, 100_000)
+    fig = distribution_figure(scores, threshold=0.30)
+    assert fig.get_size_inches().tolist() == [12, 5], "Distribution chart has a fixed size"
+
+    fig = per_jd_figure(np.vstack([scores[:1000], scores[1000:2000]]), ["jd_a", "jd_b"], threshold=0.30)
+    labels = [tick.get_text() for tick in fig.axes[0].get_yticklabels()]
+    assert labels == ["jd_a", "jd_b"], "One box per JD"
+
+def test_render_in_background_saves_chart(tmp_path):
+    future = render_in_background(render_top_n, tmp_path / "top.png", _rows(5))
+    assert future.result().exists(), "Chart file should be written by the background renderer"
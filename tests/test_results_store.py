@@ -0,0 +1,78 @@
+# tests/test_results_store.py
+
+import shutil
+import threading
+import time
+import pandas as pd
+from pathlib import Path
+from app.results_store import ResultsStore, run_incremental_screening, update_scores, watch
+
+PDFS = sorted(Path("data/resumes_test").glob("*.pdf"))
+
+def _resume_dir(tmp_path, n=4):
+    resume_dir = tmp_path / "resumes"
+    resume_dir.mkdir()
+    for pdf in PDFS[:n]:
+        shutil.copy(pdf, resume_dir / pdf.name)
+    return resume_dir
+
+def _stub_score(calls):
+    def score(paths, texts):
+        calls.extend(path.name for path in paths)
+        return [float(len(text) % 100) for text in texts]
+    return score
+
+def test_only_deltas_are_scored(tmp_path):
+    resume_dir = _resume_dir(tmp_path)
+    store = ResultsStore(tmp_path / "results.sqlite")
+    csv_path = tmp_path / "results.csv"
+    calls = []
+
+    shortlist = run_incremental_screening("Python developer", resume_dir, csv_path, store=store, score=_stub_score(calls))
+    assert len(calls) == 4 and len(pd.read_csv(csv_path)) == 4, "First run scores every resume"
+    assert [row["score"] for row in shortlist] == sorted(pd.read_csv(csv_path)["score"], reverse=True), "Shortlist best first"
+
+    calls.clear()
+    cached = []
+    run_incremental_screening("Python developer", resume_dir, csv_path, store=store, score=_stub_score(calls),
+                              on_cached=cached.append)
+    assert calls == [] and cached == [4], "Unchanged resumes come from the store"
+
+    names = sorted(path.name for path in resume_dir.glob("*.pdf"))
+    (resume_dir / names[0]).unlink()
+    shutil.copy(PDFS[5], resume_dir / names[1])  # same name, new content
+    shutil.copy(PDFS[6], resume_dir / PDFS[6].name)
+    (resume_dir / "corrupt.pdf").write_bytes(b"not a pdf")
+    delta = update_scores("Python developer", resume_dir, store, score=_stub_score(calls))
+
+    assert (delta["new"], delta["changed"], delta["deleted"]) == (2, 1, 1), f"Wrong delta: {delta}"
+    assert sorted(calls) == sorted([names[1], PDFS[6].name]), "Only the changed and the new resume are scored"
+    calls.clear()
+    update_scores("Python developer", resume_dir, store, score=_stub_score(calls))
+    assert calls == [], "Unreadable files are not retried until they change"
+
+    update_scores("Data engineer", resume_dir, store, score=_stub_score(calls))
+    assert len(calls) == 4, "A new JD scores every readable resume once"
+
+def test_watch_scores_new_files(tmp_path):
+    resume_dir = _resume_dir(tmp_path, n=1)
+    csv_path = tmp_path / "results.csv"
+    stop = threading.Event()
+    calls = []
+    thread = threading.Thread(target=watch, args=("Python developer", resume_dir, csv_path, 0.30),
+                              kwargs={"store": ResultsStore(tmp_path / "results.sqlite"), "interval": 0.05,
+                                      "stop": stop, "score": _stub_score(calls)})
+    thread.start()
+    try:
+        shutil.copy(PDFS[1], resume_dir / PDFS[1].name)
+        deadline = time.monotonic() + 20
+        while len(calls) < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        stop.set()
+        thread.join(timeout=10)
+
+    assert sorted(calls) == sorted(pdf.name for pdf in PDFS[:2]), "Both resumes should be scored once"
+    assert len(pd.read_csv(csv_path)) == 2, "CSV should be re-exported after new files"
+
+    print("\ntest_results_store passed.")
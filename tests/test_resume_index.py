@@ -0,0 +1,48 @@
+# tests/test_resume_index.py
+
+import numpy as np
+from app.resume_index import ResumeIndex
+
+def _random_index(count=500, dim=16, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(count, dim)).astype(np.float32)
+    index = ResumeIndex()
+    index.add([f"resume_{i}.pdf" for i in range(count)], vectors)
+    return index, vectors
+
+def test_exact_search_matches_brute_force():
+    index, vectors = _random_index()
+    query = vectors[7] + 0.1
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+    results = index.search(query, k=5)
+
+    assert [resume_id for resume_id, _ in results] == [f"resume_{i}.pdf" for i in expected], "Top-k order mismatch"
+    assert results[0][1] >= results[-1][1], "Scores should be sorted descending"
+
+def test_incremental_add_and_remove():
+    index, vectors = _random_index(count=10)
+    index.remove(["resume_3.pdf", "missing.pdf"])
+    index.add(["resume_new.pdf"], vectors[3:4])
+
+    assert len(index) == 10, "One removed, one added"
+    assert "resume_3.pdf" not in index, "Removed resume still indexed"
+    assert index.search(vectors[3], k=1)[0][0] == "resume_new.pdf", "Re-added vector should be found"
+
+def test_add_nothing():
+    index = ResumeIndex()
+    index.add([], np.empty((0, 384), dtype=np.float32))  # e.g. no PDF in the folder could be read
+
+    assert len(index) == 0 and index.search(np.ones(384), k=5) == [], "Empty adds leave an empty, searchable index"
+
+def test_ivf_search_and_persistence(tmp_path):
+    index, vectors = _random_index()
+    index.build_ivf(n_lists=8)
+    index.save(tmp_path / "index.npz")
+    loaded = ResumeIndex.load(tmp_path / "index.npz")
+
+    # Probing every cluster must give the exact answer
+    assert loaded.search(vectors[42], k=3, n_probe=8) == index.search(vectors[42], k=3), "IVF full probe should be exact"
+    assert loaded.search(vectors[42], k=1, n_probe=2)[0][0] == "resume_42.pdf", "Query vector's own resume should rank first"
+
+    print("\ntest_resume_index passed.")
@@ -8,6 +8,7 @@ from pathlib import Path
 from app.screen_resumes import screen_resumes
 
 OUTPUT_CSV = Path("output/real_resume_screening_results.csv")
+SHORTLIST_CSV = Path("output/real_resume_shortlist.csv")
 
 def test_screen_resumes_creates_csv():
     # Remove output file if exists (fresh test)
@@ -27,6 +28,10 @@ def test_screen_resumes_creates_csv():
     assert "score" in df.columns, "'score' column missing."
     assert "shortlisted" in df.columns, "'shortlisted' column missing."
 
+    # Shortlist is the top-N, sorted best first
+    shortlist = pd.read_csv(SHORTLIST_CSV)
+    assert list(shortlist["score"]) == sorted(shortlist["score"], reverse=True), "Shortlist not sorted."
+
     print("✅ test_screen_resumes_creates_csv passed.")
 
 if __name__ == "__main__":
@@ -0,0 +1,111 @@
+# tests/test_service.py
+
+import hashlib
+import http.client
+import json
+import threading
+import urllib.error
+import urllib.request
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from app.service import MicroBatcher, QueueFull, make_server
+
+def _fake_encode(calls):
+    # Deterministic bag-of-words vectors, so texts sharing words score higher
+    def encode(texts):
+        calls.append(len(texts))
+        vectors = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1
+        return vectors
+    return encode
+
+def _post(server, path, payload):
+    url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+    request = urllib.request.Request(url, json.dumps(payload).encode(), {"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    calls = []
+    batcher = MicroBatcher(_fake_encode(calls), max_batch_size=64, max_wait_ms=50)
+    with ThreadPoolExecutor(16) as pool:
+        results = list(pool.map(lambda i: batcher.embed([f"resume {i}", "python"]), range(16)))
+    batcher.close()
+
+    assert all(result.shape == (2, 64) for result in results), "Each caller gets its own slice"
+    assert sum(calls) == 32 and len(calls) < 16, f"Requests should share encode calls: {calls}"
+    assert np.array_equal(results[3][1], results[7][1]), "Same text, same vector"
+
+def test_micro_batcher_backpressure():
+    release = threading.Event()
+
+    def slow_encode(texts):
+        release.wait(10)
+        return np.zeros((len(texts), 4), dtype=np.float32)
+
+    batcher = MicroBatcher(slow_encode, max_batch_size=1, max_wait_ms=0, max_queue=2)
+    first = batcher.submit(["a"])  # taken by the worker, blocks in encode
+    while batcher.pending:
+        pass
+    batcher.submit(["b"])
+    batcher.submit(["c"])
+    try:
+        batcher.submit(["d"])
+        assert False, "A full queue must reject new work"
+    except QueueFull:
+        pass
+    release.set()
+    assert first.result(timeout=10).shape == (1, 4)
+    batcher.close()
+
+def test_http_endpoints():
+    batcher = MicroBatcher(_fake_encode([]), max_wait_ms=1)
+    server = make_server("127.0.0.1", 0, batcher)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        status, body = _post(server, "/embed", {"texts": ["python developer", "chef"]})
+        assert status == 200 and len(body["embeddings"]) == 2 and body["dim"] == 64, body
+
+        status, body = _post(server, "/score", {"jd": "python developer", "resumes": ["python developer", "pastry chef"]})
+        assert status == 200 and body["scores"][0] > body["scores"][1], body
+
+        resumes = {"a.pdf": "pastry chef", "b.pdf": "senior python developer", "c.pdf": "python"}
+        status, body = _post(server, "/rank", {"jd": "python developer", "resumes": resumes, "k": 2})
+        assert status == 200 and [m["id"] for m in body["matches"]] == ["b.pdf", "c.pdf"], body
+
+        status, body = _post(server, "/rank", {"jd": "python developer", "resumes": []})
+        assert status == 200 and body["matches"] == [], "No resumes means no matches, not an error"
+
+        status, body = _post(server, "/rank", {"jd": "python developer"})
+        assert status == 400 and "index" in body["error"], "No index loaded should be a client error"
+        status, body = _post(server, "/score", {"jd": "python"})
+        assert status == 400, "Missing field is a client error"
+        assert _post(server, "/nope", {})[0] == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+        batcher.close()
+
+def test_bad_content_length_is_a_client_error():
+    batcher = MicroBatcher(_fake_encode([]), max_wait_ms=1)
+    server = make_server("127.0.0.1", 0, batcher)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        for length in ("-5", "abc"):
+            connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+            connection.putrequest("POST", "/embed")
+            connection.putheader("Content-Length", length)
+            connection.endheaders()
+            response = connection.getresponse()
+            body = json.loads(response.read())
+            connection.close()
+            assert response.status == 400 and "Content-Length" in body["error"], f"Content-Length {length!r}: {body}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        batcher.close()
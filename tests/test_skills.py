@@ -0,0 +1,68 @@
+# tests/test_skills.py
+
+import numpy as np
+from app.skills import SkillMatcher, get_skill_matcher, skill_overlap, blend_scores, parse_skill_list, load_taxonomy
+
+TAXONOMY = {
+    "ambiguous": ["Go"],
+    "categories": {
+        "Languages": {"Java": [], "JavaScript": ["js"], "Go": ["golang"], "C++": ["cpp"]},
+        "ML": {"Machine Learning": ["ml"], "Deep Learning": [], "NLP": ["natural language processing"]},
+        "Cloud": {"Kubernetes": ["k8s"], "AWS": ["amazon web services"]},
+    },
+}
+
+def test_matches_aliases_on_word_boundaries():
+    matcher = SkillMatcher(TAXONOMY)
+    text = "Built JavaScript apps, C++ services on K8s. Deep-learning and machine learning for Natural Language Processing. Go team!"
+
+    assert matcher.find(text) == ["JavaScript", "C++", "Kubernetes", "Deep Learning", "Machine Learning", "NLP"], \
+        "Skills should be canonical, in order of first appearance, without 'Java' or the ambiguous 'Go'"
+    assert matcher.find("golang and go") == ["Go"], "Ambiguous skills should still match through aliases"
+    assert matcher.normalize("amazon  Web Services") == "AWS" and matcher.normalize("Go") == "Go", "Aliases should normalize"
+    assert matcher.normalize("Cobol") is None, "Unknown names should not normalize"
+
+def test_parse_skill_list():
+    matcher = SkillMatcher(TAXONOMY)
+    reply = "1. Golang\n2. k8s, Amazon Web Services\n- Terraform.\n* cpp, golang"
+    assert parse_skill_list(reply, matcher) == ["Go", "Kubernetes", "AWS", "Terraform", "C++"], \
+        "Chat replies should become a list of canonical skills, unknown ones kept, duplicates dropped"
+
+def test_ambiguous_skills_are_reachable():
+    taxonomy = load_taxonomy()
+    matcher = SkillMatcher(taxonomy)
+    for skill in taxonomy["ambiguous"]:
+        category = next(entries for entries in taxonomy["categories"].values() if skill in entries)
+        assert category[skill], f"Ambiguous '{skill}' needs an alias, or it can never match"
+        assert matcher.find(category[skill][0]) == [skill], f"'{skill}' should match through its aliases"
+
+def test_overlapping_patterns():
+    # "learning" alone fires on any "... learning"; the automaton must report both
+    matcher = SkillMatcher({"categories": {"ML": {"Machine Learning": [], "Learning": [], "Learning Machine Design": []}}})
+    assert matcher.find("deep machine learning design") == ["Machine Learning", "Learning"], \
+        "Matches ending at the same token should all be reported"
+    assert matcher.find("learning machine design") == ["Learning", "Learning Machine Design"], "Longer pattern should match"
+
+def test_vectorized_overlap_and_blend():
+    matcher = SkillMatcher(TAXONOMY)
+    jds = matcher.skill_matrix([["Java", "k8s", "ML"], [], ["NLP"]])
+    resumes = matcher.text_matrix(["Java and Kubernetes", "machine learning, NLP", ""])
+    overlap = skill_overlap(jds, resumes)
+
+    assert np.allclose(overlap[0], [2 / 3, 1 / 3, 0]), "Overlap is the share of the JD's skills in each resume"
+    assert np.isnan(overlap[1]).all(), "JDs without skills get NaN"
+
+    similarity = np.full((3, 3), 0.5, dtype=np.float32)
+    blended = blend_scores(similarity, overlap, weight=0.2)
+    assert np.allclose(blended[0], 0.8 * 0.5 + 0.2 * overlap[0]), "Blend is a weighted sum"
+    assert np.allclose(blended[1], 0.5), "JDs without skills keep their cosine score"
+    assert blend_scores(similarity, overlap, weight=0) is not None and np.allclose(blend_scores(similarity, overlap, 0), 0.5), \
+        "Weight 0 leaves scores unchanged"
+
+def test_shipped_taxonomy():
+    jd_text = open("data/job_descriptions/sample_jd.txt", encoding="utf-8").read()
+    skills = get_skill_matcher().find(jd_text)
+    for skill in ["Python", "Machine Learning", "NLP", "AWS", "GCP", "PyTorch", "TensorFlow", "Flask", "FastAPI"]:
+        assert skill in skills, f"{skill} missing from the sample JD's skills"
+
+    print("\ntest_skills passed.")
@@ -0,0 +1,40 @@
+# tests/test_text_cache.py
+
+import os
+from app.text_cache import TextCache
+
+def _cache_text(cache, file_path, text):
+    fingerprint, cached = cache.lookup(file_path)
+    assert cached is None, "File should not be cached yet"
+    cache.store(fingerprint, text)
+
+def test_unchanged_file_hits_cache(tmp_path):
+    resume = tmp_path / "resume.pdf"
+    resume.write_bytes(b"%PDF fake resume")
+    cache = TextCache(tmp_path / "text.sqlite")
+    _cache_text(cache, resume, "Name: Alice Smith")
+
+    reopened = TextCache(tmp_path / "text.sqlite")
+    assert reopened.lookup(resume)[1] == "Name: Alice Smith", "Unchanged file should be served from cache"
+
+def test_replaced_file_is_invalidated(tmp_path):
+    resume = tmp_path / "resume.pdf"
+    resume.write_bytes(b"%PDF version one")
+    cache = TextCache(tmp_path / "text.sqlite")
+    _cache_text(cache, resume, "old text")
+
+    resume.write_bytes(b"%PDF version two, longer")
+    assert cache.lookup(resume)[1] is None, "Changed size/mtime must invalidate the entry"
+
+def test_content_hash_catches_same_size_and_mtime(tmp_path):
+    resume = tmp_path / "resume.pdf"
+    resume.write_bytes(b"%PDF aaaa")
+    stat = os.stat(resume)
+    cache = TextCache(tmp_path / "text.sqlite", hash_content=True)
+    _cache_text(cache, resume, "old text")
+
+    resume.write_bytes(b"%PDF bbbb")
+    os.utime(resume, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert cache.lookup(resume)[1] is None, "Content hash must detect an in-place replacement"
+
+    print("\ntest_text_cache passed.")